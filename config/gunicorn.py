@@ -0,0 +1,17 @@
+"""
+Gunicorn settings, used with ``gunicorn -c config/gunicorn.py config.wsgi``.
+
+For metrics to be summed across workers, point prometheus_multiproc_dir at
+an empty directory (emptied on every deploy) before gunicorn starts. It has
+to be the lower case name: the pinned prometheus_client only switches to
+multiprocess mode for that one.
+"""
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    from fantasy_gambling_league.core.metrics import multiprocess_dir
+
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(worker.pid)
@@ -72,7 +72,9 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     'fantasy_gambling_league.users.apps.UsersAppConfig',
     # Your stuff: custom apps go here
+    'fantasy_gambling_league.core.apps.CoreConfig',
     'fantasy_gambling_league.structure.apps.StructureConfig',
+    'fantasy_gambling_league.betting.apps.BettingConfig',
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -129,6 +131,9 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    'fantasy_gambling_league.core.metrics.MetricsMiddleware',
+    'fantasy_gambling_league.core.log.RequestIDMiddleware',
+    'fantasy_gambling_league.core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -194,7 +199,22 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        # Opt-in engine for the hottest structure pages, see STRUCTURE_TEMPLATE_ENGINE.
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [
+            str(APPS_DIR.path('jinja2')),
+        ],
+        'OPTIONS': {
+            'environment': 'fantasy_gambling_league.core.jinja2.environment',
+            'context_processors': [
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
 ]
+# Engine for the season and gameweek pages: 'django' or 'jinja2'.
+STRUCTURE_TEMPLATE_ENGINE = env('DJANGO_STRUCTURE_TEMPLATE_ENGINE', default='django')
 # http://django-crispy-forms.readthedocs.io/en/latest/install.html#template-packs
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
@@ -250,3 +270,22 @@ SOCIALACCOUNT_ADAPTER = 'fantasy_gambling_league.users.adapters.SocialAccountAda
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Rate limiting, see fantasy_gambling_league.core.ratelimit
+RATELIMIT_ENABLE = env.bool('DJANGO_RATELIMIT_ENABLE', True)
+RATELIMIT_BACKEND = 'fantasy_gambling_league.core.ratelimit.LocalTokenBucket'
+# How many proxies in front of the app append to X-Forwarded-For. The client
+# address is the one the outermost of them appended; 0 uses REMOTE_ADDR.
+RATELIMIT_TRUSTED_PROXIES = env.int('DJANGO_RATELIMIT_TRUSTED_PROXIES', default=0)
+# Bearer token Prometheus must send to scrape /metrics; empty allows anyone, so
+# production requires it.
+METRICS_TOKEN = env('DJANGO_METRICS_TOKEN', default='')
+# Queries taking at least this many seconds are logged and added to the
+# slow_query_report, see fantasy_gambling_league.core.slowqueries. None turns it off.
+SLOW_QUERY_THRESHOLD = env.float('DJANGO_SLOW_QUERY_THRESHOLD', default=None)
+# Also EXPLAIN each new slow SELECT, which runs it a second time.
+SLOW_QUERY_EXPLAIN = env.bool('DJANGO_SLOW_QUERY_EXPLAIN', default=False)
+SLOW_QUERY_REPORT_TIMEOUT = 60 * 60 * 24
+# How long a token from the profile_token command lets requests be profiled.
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+# Where files only staff should read, such as request profiles, are stored.
+PRIVATE_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
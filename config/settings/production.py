@@ -18,13 +18,21 @@ DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)  # no
 # ------------------------------------------------------------------------------
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        # A per-process L1 in front of Redis, with a circuit breaker in place of
+        # IGNORE_EXCEPTIONS so an outage does not cost a socket timeout per call.
+        'BACKEND': 'fantasy_gambling_league.core.cache_backends.TwoTierCache',
         'LOCATION': env('REDIS_URL'),
         'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-            # Mimicing memcache behavior.
-            # http://niwinz.github.io/django-redis/latest/#_memcached_exceptions_behavior
-            'IGNORE_EXCEPTIONS': True,
+            'L2_BACKEND': 'django_redis.cache.RedisCache',
+            'L2_OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'SOCKET_CONNECT_TIMEOUT': env.float('REDIS_CONNECT_TIMEOUT', default=1),
+                'SOCKET_TIMEOUT': env.float('REDIS_TIMEOUT', default=1),
+            },
+            'L1_MAX_ENTRIES': env.int('CACHE_L1_MAX_ENTRIES', default=1000),
+            'L1_TIMEOUT': env.int('CACHE_L1_TIMEOUT', default=2),
+            'FAILURE_THRESHOLD': 3,
+            'RETRY_AFTER': 10,
         }
     }
 }
@@ -72,29 +80,18 @@ AWS_S3_OBJECT_PARAMETERS = {
 # STATIC
 # ------------------------
 
-STATICFILES_STORAGE = 'config.settings.production.StaticRootS3Boto3Storage'
+# Loaded on first use, see fantasy_gambling_league.core.storages.
+STATICFILES_STORAGE = 'fantasy_gambling_league.core.storages.StaticRootS3Boto3Storage'
 STATIC_URL = f'https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/static/'
 
 # MEDIA
 # ------------------------------------------------------------------------------
 
-# region http://stackoverflow.com/questions/10390244/
-# Full-fledge class: https://stackoverflow.com/a/18046120/104731
-from storages.backends.s3boto3 import S3Boto3Storage  # noqa E402
-
-
-class StaticRootS3Boto3Storage(S3Boto3Storage):
-    location = 'static'
-
-
-class MediaRootS3Boto3Storage(S3Boto3Storage):
-    location = 'media'
-    file_overwrite = False
-
-
-# endregion
-DEFAULT_FILE_STORAGE = 'config.settings.production.MediaRootS3Boto3Storage'
+# Imported on first use of default_storage, so boto3 is not loaded at startup.
+DEFAULT_FILE_STORAGE = 'fantasy_gambling_league.core.storages.MediaRootS3Boto3Storage'
 MEDIA_URL = f'https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/media/'
+# Not public-read like the rest of the bucket.
+PRIVATE_FILE_STORAGE = 'fantasy_gambling_league.core.storages.PrivateMediaS3Boto3Storage'
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -151,9 +148,10 @@ AWS_PRELOAD_METADATA = True
 # LOGGING
 # ------------------------------------------------------------------------------
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#logging
-# A sample logging configuration. The only tangible logging
-# performed by this configuration is to send an email to
-# the site admins on every HTTP 500 error when DEBUG=False.
+# Loggers hand records to the 'queue' handler, which only puts them on an
+# in-memory queue. A background thread in each worker writes them to stdout
+# as JSON lines tagged with the request ID, and emails the site admins about
+# errors from Django when DEBUG=False, so neither holds up a request.
 # See https://docs.djangoproject.com/en/dev/topics/logging for
 # more details on how to customize your logging configuration.
 LOGGING = {
@@ -162,36 +160,52 @@ LOGGING = {
     'filters': {
         'require_debug_false': {
             '()': 'django.utils.log.RequireDebugFalse'
-        }
+        },
+        'django_only': {
+            '()': 'logging.Filter',
+            'name': 'django',
+        },
+        'request_id': {
+            '()': 'fantasy_gambling_league.core.log.RequestIDFilter'
+        },
     },
     'formatters': {
-        'verbose': {
-            'format': '%(levelname)s %(asctime)s %(module)s '
-                      '%(process)d %(thread)d %(message)s'
+        'json': {
+            '()': 'fantasy_gambling_league.core.log.JSONFormatter'
         },
     },
     'handlers': {
         'mail_admins': {
             'level': 'ERROR',
-            'filters': ['require_debug_false'],
+            'filters': ['require_debug_false', 'django_only'],
             'class': 'django.utils.log.AdminEmailHandler'
         },
         'console': {
             'level': 'DEBUG',
             'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            'formatter': 'json',
         },
+        'queue': {
+            '()': 'fantasy_gambling_league.core.log.QueueLogHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.mail_admins'],
+            'filters': ['request_id'],
+        },
+    },
+    'root': {
+        'level': 'INFO',
+        'handlers': ['queue'],
     },
     'loggers': {
-        'django.request': {
-            'handlers': ['mail_admins'],
-            'level': 'ERROR',
-            'propagate': True
+        # Replaces Django's default handlers, which email admins synchronously.
+        'django': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False
         },
         'django.security.DisallowedHost': {
             'level': 'ERROR',
-            'handlers': ['console', 'mail_admins'],
-            'propagate': True
+            'handlers': ['queue'],
+            'propagate': False
         }
     }
 }
@@ -199,3 +213,10 @@ LOGGING = {
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+RATELIMIT_BACKEND = 'fantasy_gambling_league.core.ratelimit.RedisTokenBucket'
+RATELIMIT_REDIS_URL = env('REDIS_URL')
+# Behind the load balancer every request comes from the proxy.
+RATELIMIT_TRUSTED_PROXIES = env.int('DJANGO_RATELIMIT_TRUSTED_PROXIES', default=1)
+# Required, so /metrics is never left open to anyone.
+METRICS_TOKEN = env('DJANGO_METRICS_TOKEN')
+SLOW_QUERY_THRESHOLD = env.float('DJANGO_SLOW_QUERY_THRESHOLD', default=0.5)
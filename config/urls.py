@@ -4,6 +4,10 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.views.generic import TemplateView
 from django.views import defaults as default_views
+from allauth.account import views as account_views
+
+from fantasy_gambling_league.core.ratelimit import ratelimit
+from fantasy_gambling_league.core.views import metrics
 
 urlpatterns = [
     path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
@@ -19,9 +23,14 @@ urlpatterns = [
         "users/",
         include("fantasy_gambling_league.users.urls", namespace="users"),
     ),
+    # Rate limited ahead of allauth's own patterns for the same paths.
+    path("accounts/login/", ratelimit("10/m", key="ip", scope="login")(account_views.login)),
+    path("accounts/signup/", ratelimit("5/h", key="ip", scope="signup")(account_views.signup)),
     path("accounts/", include("allauth.urls")),
+    path("metrics", metrics, name="metrics"),
     # Your stuff: custom urls includes go here
     path("", include("fantasy_gambling_league.structure.urls", namespace="structure")),
+    path("", include("fantasy_gambling_league.betting.urls", namespace="betting")),
 ] + static(
     settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
 )
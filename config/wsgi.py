@@ -35,6 +35,13 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 # setting points here.
 application = get_wsgi_application()
 
+# With gunicorn --preload this runs once in the master before it forks, so
+# every worker starts with resolved URLs and compiled templates.
+if os.environ.get("DJANGO_WARMUP"):
+    from fantasy_gambling_league.core.warmup import warm
+
+    warm()
+
 # Apply WSGI middleware here.
 # from helloworld.wsgi import HelloWorldApplication
 # application = HelloWorldApplication(application)
@@ -0,0 +1,53 @@
+from django.contrib import admin
+from django.contrib.admin.actions import delete_selected as delete_selected_action
+
+from .models import Market, Selection
+from .prices import prices_changed
+
+
+class PricesAdmin(admin.ModelAdmin):
+    """Rebuilds the price tables of the gameweeks each change touches, see ``prices_changed``."""
+    gameweek_lookup = None
+
+    def gameweek_ids(self, queryset):
+        return set(queryset.values_list(self.gameweek_lookup, flat=True))
+
+    def save_model(self, request, obj, form, change):
+        # Both gameweeks, if the change moves the object from one to another.
+        gameweek_ids = self.gameweek_ids(self.model.objects.filter(pk=obj.pk)) if change else set()
+        super(PricesAdmin, self).save_model(request, obj, form, change)
+        for gameweek_id in gameweek_ids | self.gameweek_ids(self.model.objects.filter(pk=obj.pk)):
+            prices_changed(gameweek_id)
+
+    def delete_model(self, request, obj):
+        gameweek_ids = self.gameweek_ids(self.model.objects.filter(pk=obj.pk))
+        super(PricesAdmin, self).delete_model(request, obj)
+        for gameweek_id in gameweek_ids:
+            prices_changed(gameweek_id)
+
+    def get_actions(self, request):
+        actions = super(PricesAdmin, self).get_actions(request)
+        # Swapped in here rather than listed in actions, so the action keeps
+        # its name, which its confirmation page posts back.
+        if 'delete_selected' in actions:
+            actions['delete_selected'] = (PricesAdmin.delete_selected,) + actions['delete_selected'][1:]
+        return actions
+
+    def delete_selected(self, request, queryset):
+        gameweek_ids = self.gameweek_ids(queryset)
+        # None once the deletion is confirmed and done.
+        response = delete_selected_action(self, request, queryset)
+        if response is None:
+            for gameweek_id in gameweek_ids:
+                prices_changed(gameweek_id)
+        return response
+
+
+@admin.register(Market)
+class MarketAdmin(PricesAdmin):
+    gameweek_lookup = 'gameweek'
+
+
+@admin.register(Selection)
+class SelectionAdmin(PricesAdmin):
+    gameweek_lookup = 'market__gameweek'
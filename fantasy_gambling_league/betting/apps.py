@@ -0,0 +1,5 @@
+from django.apps import AppConfig
+
+
+class BettingConfig(AppConfig):
+    name = 'fantasy_gambling_league.betting'
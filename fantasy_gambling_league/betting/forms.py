@@ -0,0 +1,14 @@
+from django.forms import DecimalField, Form, ModelChoiceField
+
+from .models import Selection
+
+
+class BetForm(Form):
+    selection = ModelChoiceField(queryset=Selection.objects.none())
+    stake = DecimalField(min_value=0.01, decimal_places=2)
+
+    def __init__(self, *args, gameweek, **kwargs):
+        super(BetForm, self).__init__(*args, **kwargs)
+        self.fields['selection'].queryset = Selection.objects.filter(
+            market__gameweek=gameweek,
+        ).select_related('market')
@@ -0,0 +1,75 @@
+import struct
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+# One tick: microseconds since the epoch and the decimal price as float32.
+TICK = struct.Struct('<qf')
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Ticks stored per PriceHistoryChunk row, about 3 KB.
+CHUNK_TICKS = 256
+
+
+def to_micros(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros):
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def pack_tick(moment, price):
+    return TICK.pack(to_micros(moment), float(price))
+
+
+class PriceHistory:
+    """
+    Read-only view over a packed, time-ordered series of price ticks, as
+    stored in ``PriceHistoryChunk`` rows.
+
+    Lookups bisect on the timestamps in place and only unpack the ticks
+    they return, so reading a window costs O(log n) plus the window size.
+    """
+
+    def __init__(self, data):
+        self._data = memoryview(bytes(data or b''))
+
+    def __len__(self):
+        return len(self._data) // TICK.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        micros, price = TICK.unpack_from(self._data, index * TICK.size)
+        return from_micros(micros), price
+
+    def _micros_at(self, index):
+        return TICK.unpack_from(self._data, index * TICK.size)[0]
+
+    def _bisect(self, micros):
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._micros_at(middle) < micros:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def between(self, start=None, end=None):
+        """Return the ``(datetime, price)`` ticks with ``start <= time < end``."""
+        first = 0 if start is None else self._bisect(to_micros(start))
+        last = len(self) if end is None else self._bisect(to_micros(end))
+
+        return [
+            (from_micros(micros), price)
+            for micros, price in TICK.iter_unpack(self._data[first * TICK.size:max(first, last) * TICK.size])
+        ]
+
+    def latest(self):
+        return self[len(self) - 1] if len(self) else None
+
+    @staticmethod
+    def append(data, moment, price):
+        """Return ``data`` with a tick added; ``moment`` must not go back in time."""
+        return bytes(data or b'') + pack_tick(moment, price)
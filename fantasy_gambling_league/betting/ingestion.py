@@ -0,0 +1,186 @@
+import csv
+import json
+import os
+from collections import namedtuple
+
+from django.db.models import Case, CharField, DecimalField, Value, When
+from django.utils import timezone
+
+from .models import Market, PriceHistoryChunk, Selection
+from .odds import parse_price
+from .prices import prices_changed
+
+FIELDS = ('market_id', 'market_name', 'selection_id', 'selection_name', 'price')
+
+OddsRow = namedtuple('OddsRow', FIELDS)
+
+
+class OddsFeedError(ValueError):
+    pass
+
+
+def _parse_csv_line(line, header):
+    values = next(csv.reader([line]))
+    return dict(zip(header, values))
+
+
+def _parse_json_line(line, header):
+    return json.loads(line)
+
+
+def iter_feed(stream, feed_format, offset=0):
+    """
+    Yield ``(row, offset)`` pairs from a binary odds feed, one line at a
+    time, where ``offset`` is the byte position just after the row.
+
+    Passing a previously yielded offset resumes after that row. Rows that
+    cannot be parsed are yielded as ``None`` so the caller can count them.
+    """
+    header = None
+    if feed_format == 'csv':
+        header = next(csv.reader([stream.readline().decode('utf-8-sig')]))
+        missing = set(FIELDS) - set(header)
+        if missing:
+            raise OddsFeedError('Feed is missing columns: {}'.format(', '.join(sorted(missing))))
+        parse = _parse_csv_line
+    elif feed_format == 'jsonl':
+        parse = _parse_json_line
+    else:
+        raise OddsFeedError('Unknown feed format {!r}'.format(feed_format))
+
+    if offset > stream.tell():
+        stream.seek(offset)
+
+    for line in iter(stream.readline, b''):
+        offset = stream.tell()
+        line = line.decode('utf-8').strip()
+        if not line:
+            continue
+
+        try:
+            record = parse(line, header)
+            row = OddsRow(
+                market_id=str(record['market_id']),
+                market_name=str(record['market_name']),
+                selection_id=str(record['selection_id']),
+                selection_name=str(record['selection_name']),
+                price=parse_price(record['price']),
+            )
+        except (ValueError, KeyError, TypeError):
+            row = None
+        yield row, offset
+
+
+def _case(values, output_field):
+    return Case(
+        *[When(pk=pk, then=Value(value, output_field=output_field)) for pk, value in values.items()],
+        output_field=output_field
+    )
+
+
+def _selections_by_key(queryset, market_ids, keys):
+    """
+    The selections of ``queryset`` with a ``(market external ID, external
+    ID)`` key in ``keys``, by that key, given ``market_ids`` mapping market
+    external IDs to pks.
+    """
+    market_external_ids = {pk: external_id for external_id, pk in market_ids.items()}
+    selections = queryset.filter(
+        market_id__in=list(market_ids.values()),
+        external_id__in={selection_id for _, selection_id in keys},
+    )
+    # The filter also matches IDs the batch has only under other markets.
+    by_key = {(market_external_ids[selection.market_id], selection.external_id): selection for selection in selections}
+    return {key: selection for key, selection in by_key.items() if key in keys}
+
+
+def upsert_batch(gameweek, rows):
+    """
+    Create or update the markets and selections in ``rows``, keyed on the
+    market's external ID within ``gameweek`` and the selection's within its
+    market, with a fixed number of queries per batch.
+
+    Every new price is appended to the selection's price history chunks.
+    """
+    selections = {(row.market_id, row.selection_id): row for row in rows}
+    markets = {row.market_id: row.market_name for row in selections.values()}
+
+    existing_markets = {
+        market.external_id: market
+        for market in Market.objects.filter(gameweek=gameweek, external_id__in=list(markets))
+    }
+    Market.objects.bulk_create([
+        Market(gameweek=gameweek, external_id=external_id, name=name)
+        for external_id, name in markets.items()
+        if external_id not in existing_markets
+    ])
+    renamed = {
+        market.pk: markets[external_id]
+        for external_id, market in existing_markets.items()
+        if market.name != markets[external_id]
+    }
+    if renamed:
+        Market.objects.filter(pk__in=renamed).update(name=_case(renamed, CharField()))
+
+    market_ids = dict(
+        Market.objects.filter(gameweek=gameweek, external_id__in=list(markets)).values_list('external_id', 'pk')
+    )
+    existing_selections = _selections_by_key(Selection.objects.all(), market_ids, selections)
+    now = timezone.now()
+
+    created = [row for key, row in selections.items() if key not in existing_selections]
+    Selection.objects.bulk_create([
+        Selection(
+            market_id=market_ids[row.market_id],
+            external_id=row.selection_id,
+            name=row.selection_name,
+            price=row.price,
+            updated=now,
+        )
+        for row in created
+    ])
+    names = {}
+    prices = {}
+    ticks = {}
+    for key, selection in existing_selections.items():
+        row = selections[key]
+        if (selection.name, selection.price) != (row.selection_name, row.price):
+            names[selection.pk] = row.selection_name
+            prices[selection.pk] = row.price
+            if selection.price != row.price:
+                ticks[selection.pk] = row.price
+    if names:
+        Selection.objects.filter(pk__in=names).update(
+            name=_case(names, CharField()),
+            price=_case(prices, DecimalField(decimal_places=3, max_digits=10)),
+            updated=now,
+        )
+
+    if created:
+        created_keys = {(row.market_id, row.selection_id) for row in created}
+        ticks.update(
+            (selection.pk, selection.price)
+            for selection in _selections_by_key(
+                Selection.objects.only('market_id', 'external_id', 'price'), market_ids, created_keys,
+            ).values()
+        )
+    PriceHistoryChunk.append(ticks, now)
+    if created or names:
+        prices_changed(gameweek.pk)
+
+    return len(selections)
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as checkpoint:
+            return int(checkpoint.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, offset):
+    partial = path + '.partial'
+    with open(partial, 'w') as checkpoint:
+        checkpoint.write(str(offset))
+    os.replace(partial, path)
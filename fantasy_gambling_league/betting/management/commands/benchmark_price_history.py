@@ -0,0 +1,149 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from ...history import CHUNK_TICKS, PriceHistory, from_micros, pack_tick, to_micros
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare price history chunks with a row per price tick for size, read and append latency, '
+        'both stored in scratch tables in the default database and rolled back afterwards'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--selections', type=int, default=200)
+        parser.add_argument('--ticks', type=int, default=5000, help='Ticks per selection')
+        parser.add_argument('--reads', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.create_tables(cursor)
+            self.run(cursor, options)
+            transaction.set_rollback(True)
+
+    def create_tables(self, cursor):
+        # Both tables have the index their time-range query needs.
+        cursor.execute('CREATE TABLE benchmark_tick (selection_id integer, moment bigint, price real)')
+        cursor.execute('CREATE INDEX benchmark_tick_idx ON benchmark_tick (selection_id, moment)')
+        cursor.execute(
+            'CREATE TABLE benchmark_chunk (selection_id integer, first bigint, last bigint, ticks integer, '
+            'data {})'.format(connection.data_types['BinaryField'])
+        )
+        cursor.execute('CREATE INDEX benchmark_chunk_idx ON benchmark_chunk (selection_id, first)')
+
+    def run(self, cursor, options):
+        rng = random.Random(options['seed'])
+        start = timezone.now() - timedelta(days=7)
+        moments = [start + timedelta(seconds=30 * tick) for tick in range(options['ticks'])]
+
+        for selection in range(options['selections']):
+            ticks = [(to_micros(moment), round(rng.uniform(1.01, 50), 2)) for moment in moments]
+            cursor.executemany(
+                'INSERT INTO benchmark_tick VALUES (%s, %s, %s)',
+                [(selection, micros, price) for micros, price in ticks],
+            )
+            chunks = [ticks[first:first + CHUNK_TICKS] for first in range(0, len(ticks), CHUNK_TICKS)]
+            cursor.executemany('INSERT INTO benchmark_chunk VALUES (%s, %s, %s, %s, %s)', [
+                (
+                    selection, chunk[0][0], chunk[-1][0], len(chunk),
+                    b''.join(pack_tick(from_micros(micros), price) for micros, price in chunk),
+                )
+                for chunk in chunks
+            ])
+
+        windows = []
+        for _ in range(options['reads']):
+            selection = rng.randrange(options['selections'])
+            first = rng.randrange(len(moments))
+            windows.append((selection, moments[first], moments[min(first + 120, len(moments) - 1)]))
+
+        def read_rows(selection, window_start, window_end):
+            cursor.execute(
+                'SELECT moment, price FROM benchmark_tick '
+                'WHERE selection_id = %s AND moment >= %s AND moment < %s ORDER BY moment',
+                [selection, to_micros(window_start), to_micros(window_end)],
+            )
+            return [(from_micros(micros), price) for micros, price in cursor.fetchall()]
+
+        def read_chunks(selection, window_start, window_end):
+            cursor.execute(
+                'SELECT data FROM benchmark_chunk '
+                'WHERE selection_id = %s AND last >= %s AND first < %s ORDER BY first',
+                [selection, to_micros(window_start), to_micros(window_end)],
+            )
+            data = b''.join(bytes(data) for data, in cursor.fetchall())
+            return PriceHistory(data).between(window_start, window_end)
+
+        def append_row(selection, moment, price):
+            cursor.execute(
+                'INSERT INTO benchmark_tick VALUES (%s, %s, %s)', [selection, to_micros(moment), price],
+            )
+
+        def append_chunk(selection, moment, price):
+            # The same statements as PriceHistoryChunk.append for one selection.
+            cursor.execute(
+                'SELECT first, data FROM benchmark_chunk WHERE selection_id = %s AND ticks < %s',
+                [selection, CHUNK_TICKS],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute(
+                    'INSERT INTO benchmark_chunk VALUES (%s, %s, %s, 1, %s)',
+                    [selection, to_micros(moment), to_micros(moment), pack_tick(moment, price)],
+                )
+            else:
+                cursor.execute(
+                    'UPDATE benchmark_chunk SET data = %s, ticks = ticks + 1, last = %s '
+                    'WHERE selection_id = %s AND first = %s',
+                    [bytes(row[1]) + pack_tick(moment, price), to_micros(moment), selection, row[0]],
+                )
+
+        appends = [
+            (selection, moments[-1] + timedelta(seconds=30 * (tick + 1)), round(rng.uniform(1.01, 50), 2))
+            for tick in range(max(1, options['reads'] // options['selections']))
+            for selection in range(options['selections'])
+        ]
+
+        ticks = options['selections'] * options['ticks']
+        self.stdout.write('{} ticks over {} selections on {}'.format(ticks, options['selections'], connection.vendor))
+        for label, table, read, append in [
+            ('Row per tick:', 'benchmark_tick', read_rows, append_row),
+            ('Chunks:', 'benchmark_chunk', read_chunks, append_chunk),
+        ]:
+            size = self.table_size(cursor, table)
+            self.stdout.write('{:<14}{:>14} bytes {:>8} bytes/tick {:>8.1f} us/read {:>8.1f} us/append'.format(
+                label,
+                'n/a' if size is None else '{:,}'.format(size),
+                'n/a' if size is None else '{:.1f}'.format(size / ticks),
+                self.time_each(read, windows) * 1e6,
+                self.time_each(append, appends) * 1e6,
+            ))
+
+    def time_each(self, func, calls):
+        began = time.perf_counter()
+        for arguments in calls:
+            func(*arguments)
+        return (time.perf_counter() - began) / len(calls)
+
+    def table_size(self, cursor, table):
+        """The table's size on disk with its indexes, or ``None`` if the database can't say."""
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+        elif connection.vendor == 'sqlite':
+            try:
+                with transaction.atomic():
+                    cursor.execute(
+                        'SELECT SUM(pgsize) FROM dbstat WHERE name IN (%s, %s)', [table, '{}_idx'.format(table)],
+                    )
+            except DatabaseError:
+                # SQLite built without the dbstat virtual table.
+                return None
+        else:
+            return None
+        return cursor.fetchone()[0]
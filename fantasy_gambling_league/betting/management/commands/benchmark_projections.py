@@ -0,0 +1,42 @@
+import os
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from ...projections import simulate
+
+
+class Command(BaseCommand):
+    help = 'Time season projections on synthetic players for an increasing number of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=1000)
+        parser.add_argument('--remaining', type=int, default=10, help='Gameweeks left to simulate')
+        parser.add_argument('--simulations', type=int, default=200000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        random = np.random.RandomState(0)
+        totals = random.normal(0, 50, options['players'])
+        means = random.normal(0, 5, options['players'])
+        deviations = random.uniform(10, 40, options['players'])
+
+        workers = 1
+        baseline = None
+        while workers <= options['max_workers']:
+            started = time.perf_counter()
+            simulate(
+                totals, means, deviations, options['remaining'],
+                simulations=options['simulations'],
+                workers=workers,
+                batch_size=options['batch_size'],
+            )
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+
+            self.stdout.write('{:>3} workers {:>8.2f}s {:>6.2f}x speedup'.format(
+                workers, elapsed, baseline / elapsed,
+            ))
+            workers *= 2
@@ -0,0 +1,97 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from fantasy_gambling_league.structure.models import Gameweek
+from ...ingestion import (
+    OddsFeedError,
+    iter_feed,
+    read_checkpoint,
+    upsert_batch,
+    write_checkpoint,
+)
+
+
+class Command(BaseCommand):
+    help = 'Load the markets and selections for a gameweek from a CSV or JSON lines odds feed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('season_slug')
+        parser.add_argument('number', type=int)
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], dest='feed_format')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording the byte offset of the last committed batch, defaults to PATH.checkpoint',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore any checkpoint and read the feed from the start',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            gameweek = Gameweek.objects.get(
+                season__slug=options['season_slug'],
+                number=options['number'],
+            )
+        except Gameweek.DoesNotExist:
+            raise CommandError('Gameweek {} of {} does not exist'.format(
+                options['number'],
+                options['season_slug'],
+            ))
+
+        path = options['path']
+        feed_format = options['feed_format'] or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        checkpoint = options['checkpoint'] or path + '.checkpoint'
+        offset = 0 if options['restart'] else read_checkpoint(checkpoint)
+        if offset:
+            self.stdout.write('Resuming from byte {}'.format(offset))
+
+        ingested = skipped = 0
+        started = time.monotonic()
+        batch = []
+
+        def flush(offset):
+            with transaction.atomic():
+                upsert_batch(gameweek, batch)
+            write_checkpoint(checkpoint, offset)
+            batch.clear()
+
+        try:
+            with open(path, 'rb') as stream:
+                for row, offset in iter_feed(stream, feed_format, offset):
+                    if row is None:
+                        skipped += 1
+                        continue
+
+                    batch.append(row)
+                    ingested += 1
+                    if len(batch) >= options['batch_size']:
+                        flush(offset)
+                        if options['verbosity'] > 1:
+                            self.stdout.write('{} rows, {:.0f} rows/s'.format(
+                                ingested,
+                                ingested / (time.monotonic() - started),
+                            ))
+                if batch:
+                    flush(offset)
+        except OddsFeedError as error:
+            raise CommandError(str(error))
+
+        # A complete run leaves nothing to resume.
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.monotonic() - started
+
+        if skipped:
+            self.stderr.write('Skipped {} unparseable rows'.format(skipped))
+        self.stdout.write(self.style.SUCCESS('Ingested {} rows in {:.1f}s ({:.0f} rows/s)'.format(
+            ingested,
+            elapsed,
+            ingested / elapsed if elapsed else 0,
+        )))
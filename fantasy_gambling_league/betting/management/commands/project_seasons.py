@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from fantasy_gambling_league.structure.models import Season
+from ...projections import SIMULATIONS, project_season
+
+
+class Command(BaseCommand):
+    help = 'Simulate the rest of each season and cache every player\'s chance of winning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slugs', nargs='*', help='Seasons to project, defaults to all of them')
+        parser.add_argument('--simulations', type=int, default=SIMULATIONS)
+        parser.add_argument('--workers', type=int, help='Processes to simulate with, defaults to one per core')
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.all()
+        if options['slugs']:
+            seasons = seasons.filter(slug__in=options['slugs'])
+
+        for season in seasons:
+            projection = project_season(
+                season,
+                simulations=options['simulations'],
+                workers=options['workers'],
+            )
+            self.stdout.write('Projected {} for {} players'.format(season.slug, len(projection)))
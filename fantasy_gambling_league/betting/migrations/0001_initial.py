@@ -0,0 +1,59 @@
+# Generated by Django 2.0.10 on 2026-10-19 02:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('structure', '0004_seasonmembership'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Market',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('external_id', models.CharField(max_length=255)),
+                ('name', models.CharField(max_length=255)),
+                ('gameweek', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='structure.Gameweek')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Selection',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('external_id', models.CharField(max_length=255)),
+                ('name', models.CharField(max_length=255)),
+                ('price', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('updated', models.DateTimeField(default=django.utils.timezone.now)),
+                ('market', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='betting.Market')),
+            ],
+            options={
+                'unique_together': {('market', 'external_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceHistoryChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first', models.DateTimeField()),
+                ('last', models.DateTimeField()),
+                ('ticks', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('selection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_chunks', to='betting.Selection')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pricehistorychunk',
+            index=models.Index(fields=['selection', 'first'], name='price_chunk_selection_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='market',
+            unique_together={('gameweek', 'external_id')},
+        ),
+    ]
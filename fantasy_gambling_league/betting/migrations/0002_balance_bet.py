@@ -0,0 +1,43 @@
+# Generated by Django 2.0.10 on 2026-10-19 02:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('structure', '0004_seasonmembership'),
+        ('betting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Bet',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stake', models.DecimalField(decimal_places=2, max_digits=99)),
+                ('price', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('placed', models.DateTimeField(default=django.utils.timezone.now)),
+                ('returns', models.DecimalField(blank=True, decimal_places=2, max_digits=99, null=True)),
+                ('gameweek', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='structure.Gameweek')),
+                ('selection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='betting.Selection')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Balance',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('remaining', models.DecimalField(decimal_places=2, max_digits=99)),
+                ('gameweek', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='structure.Gameweek')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'gameweek')},
+            },
+        ),
+    ]
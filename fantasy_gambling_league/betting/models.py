@@ -0,0 +1,165 @@
+from django.db import models, transaction
+from django.db.models import BinaryField, Case, Value, When
+from django.utils import timezone
+
+from fantasy_gambling_league.structure.models import Gameweek
+from fantasy_gambling_league.users.models import User
+from .history import CHUNK_TICKS, PriceHistory, pack_tick
+
+
+class Market(models.Model):
+    gameweek = models.ForeignKey(
+        Gameweek,
+        on_delete=models.CASCADE,
+    )
+    # The feed's ID, which only identifies a market within its gameweek.
+    external_id = models.CharField(max_length=255)
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = ('gameweek', 'external_id')
+
+
+class Selection(models.Model):
+    market = models.ForeignKey(
+        Market,
+        on_delete=models.CASCADE,
+    )
+    external_id = models.CharField(max_length=255)
+    name = models.CharField(max_length=255)
+    # Decimal odds, whatever format the feed used.
+    price = models.DecimalField(
+        decimal_places=3,
+        max_digits=10,
+    )
+    updated = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('market', 'external_id')
+
+    @property
+    def history(self):
+        return self.history_between()
+
+    def history_between(self, start=None, end=None):
+        """A ``PriceHistory`` covering at least ``start <= time < end``, from only the chunks it needs."""
+        chunks = self.price_chunks.order_by('first')
+        if start is not None:
+            chunks = chunks.filter(last__gte=start)
+        if end is not None:
+            chunks = chunks.filter(first__lt=end)
+        return PriceHistory(b''.join(bytes(data) for data in chunks.values_list('data', flat=True)))
+
+
+class PriceHistoryChunk(models.Model):
+    """
+    Up to ``CHUNK_TICKS`` packed ticks of a selection's price history, see
+    ``PriceHistory``. New ticks go into the selection's one open chunk, so
+    a tick rewrites at most one chunk's bytes however long the history is.
+    """
+    selection = models.ForeignKey(
+        Selection,
+        on_delete=models.CASCADE,
+        related_name='price_chunks',
+    )
+    first = models.DateTimeField()
+    last = models.DateTimeField()
+    ticks = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['selection', 'first'], name='price_chunk_selection_idx'),
+        ]
+
+    @classmethod
+    def append(cls, prices, moment):
+        """
+        Add a tick at ``moment`` for each ``selection_id: price`` in ``prices``
+        with a fixed number of queries, however many selections there are.
+
+        The selections are locked first, in pk order, so that concurrent
+        appends to a selection wait for one another rather than lose ticks or
+        open two chunks.
+        """
+        if not prices:
+            return
+        tick_data = {selection_id: pack_tick(moment, price) for selection_id, price in prices.items()}
+
+        with transaction.atomic():
+            list(Selection.objects.select_for_update().filter(pk__in=list(prices)).order_by('pk').values_list('pk'))
+            open_chunks = {
+                chunk.selection_id: chunk
+                for chunk in cls.objects.filter(selection_id__in=list(prices), ticks__lt=CHUNK_TICKS)
+            }
+
+            cls.objects.bulk_create([
+                cls(selection_id=selection_id, first=moment, last=moment, ticks=1, data=data)
+                for selection_id, data in tick_data.items()
+                if selection_id not in open_chunks
+            ])
+            if open_chunks:
+                cls.objects.filter(pk__in=[chunk.pk for chunk in open_chunks.values()]).update(
+                    data=Case(
+                        *[
+                            When(
+                                pk=chunk.pk,
+                                then=Value(bytes(chunk.data) + tick_data[selection_id], output_field=BinaryField()),
+                            )
+                            for selection_id, chunk in open_chunks.items()
+                        ],
+                        output_field=BinaryField(),
+                    ),
+                    ticks=models.F('ticks') + 1,
+                    last=moment,
+                )
+
+
+class Balance(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+    gameweek = models.ForeignKey(
+        Gameweek,
+        on_delete=models.CASCADE,
+    )
+    remaining = models.DecimalField(
+        decimal_places=2,
+        max_digits=99,
+    )
+
+    class Meta:
+        unique_together = ('user', 'gameweek')
+
+
+class Bet(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+    gameweek = models.ForeignKey(
+        Gameweek,
+        on_delete=models.CASCADE,
+    )
+    selection = models.ForeignKey(
+        Selection,
+        on_delete=models.CASCADE,
+    )
+    stake = models.DecimalField(
+        decimal_places=2,
+        max_digits=99,
+    )
+    # The price when the bet was placed, not the selection's latest one.
+    price = models.DecimalField(
+        decimal_places=3,
+        max_digits=10,
+    )
+    placed = models.DateTimeField(default=timezone.now)
+    # Set when the bet is settled.
+    returns = models.DecimalField(
+        null=True,
+        blank=True,
+        decimal_places=2,
+        max_digits=99,
+    )
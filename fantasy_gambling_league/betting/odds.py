@@ -0,0 +1,119 @@
+from decimal import Decimal, DecimalException
+
+import numpy as np
+
+PRICE_PLACES = Decimal('0.001')
+# Selection.price has seven digits before the point.
+MAX_PRICE = Decimal('9999999.999')
+PENCE = Decimal('0.01')
+EVENS = ('evens', 'evs', 'even')
+# The denominators bookmakers quote fractional odds with.
+FRACTIONAL_DENOMINATORS = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 20, 25, 30, 40, 50, 100])
+
+
+def parse_price(raw):
+    """
+    Normalise a decimal ("2.5"), fractional ("3/2") or American ("+150",
+    "-200") price to decimal odds.
+    """
+    raw = str(raw).strip().lower()
+
+    try:
+        if raw in EVENS:
+            price = Decimal(2)
+        elif '/' in raw:
+            numerator, denominator = raw.split('/')
+            price = 1 + Decimal(numerator) / Decimal(denominator)
+        elif raw.startswith(('+', '-')):
+            american = Decimal(raw)
+            if american > 0:
+                price = 1 + american / 100
+            else:
+                price = 1 + 100 / -american
+        else:
+            price = Decimal(raw)
+    except (DecimalException, ValueError, ZeroDivisionError):
+        raise ValueError('Unrecognised price {!r}'.format(raw))
+
+    if not price.is_finite() or price <= 1:
+        raise ValueError('Price {!r} does not pay out'.format(raw))
+    if price > MAX_PRICE:
+        raise ValueError('Price {!r} is too long'.format(raw))
+    return price.quantize(PRICE_PLACES)
+
+
+def to_fractional(prices):
+    """
+    Convert an array of decimal prices to ``(numerators, denominators)``,
+    picking the closest fraction over the usual denominators.
+    """
+    profit = np.asarray(prices, dtype=np.float64)[:, np.newaxis] - 1
+    numerators = np.rint(profit * FRACTIONAL_DENOMINATORS)
+    error = np.abs(numerators / FRACTIONAL_DENOMINATORS - profit)
+    # argmin takes the first minimum, so ties go to the smaller denominator.
+    best = np.argmin(error, axis=1)
+
+    numerators = numerators[np.arange(len(best)), best].astype(np.int64)
+    denominators = FRACTIONAL_DENOMINATORS[best]
+    divisors = np.maximum(np.gcd(numerators, denominators), 1)
+    return numerators // divisors, denominators // divisors
+
+
+def to_american(prices):
+    """Convert an array of decimal prices to signed American odds."""
+    profit = np.asarray(prices, dtype=np.float64) - 1
+    with np.errstate(divide='ignore'):
+        return np.rint(np.where(profit >= 1, profit * 100, -100 / profit)).astype(np.int64)
+
+
+def _legs(slips, fill, dtype):
+    """
+    Pad ``slips``, sequences of prices, into one array with legs priced
+    ``fill``, so that all of them are multiplied out in one product.
+    """
+    legs = np.full((len(slips), max((len(slip) for slip in slips), default=0)), fill, dtype=dtype)
+    for row, slip in enumerate(slips):
+        legs[row, :len(slip)] = slip
+    return legs
+
+
+def combined_prices(slips):
+    """Return the accumulator price of each slip, a sequence of decimal prices, as one array."""
+    return _legs(slips, 1.0, np.float64).prod(axis=1)
+
+
+def _scaled(values, places):
+    # Through str, so a float such as 1.333 isn't read as 1.33299999...
+    return [int(Decimal(str(value)) / places) for value in values]
+
+
+def potential_returns(stakes, slips):
+    """
+    Return what each stake pays on its slip as a ``Decimal``, rounded down
+    to the penny. Every slip is worked out in one product over integer
+    pence and thousandths of a price, since float64 cannot hold prices such
+    as 1.1 exactly; in int64 unless that could overflow.
+    """
+    pence = _scaled(stakes, PENCE)
+    thousandths = [_scaled(slip, PRICE_PLACES) for slip in slips]
+
+    # Padding legs are 1000, so every product is over the same 1000 ** width.
+    estimate = _legs(thousandths, 1000, np.float64)
+    width = estimate.shape[1]
+    bits = np.log2(np.maximum(np.asarray(pence, dtype=np.float64), 1)) + np.log2(estimate).sum(axis=1)
+    # Otherwise Python integers, which cannot overflow, in the same arrays.
+    dtype = np.int64 if bits.max(initial=0) < 62 and width <= 6 else object
+
+    numerators = np.asarray(pence, dtype=dtype) * _legs(thousandths, 1000, dtype).prod(axis=1)
+    returns = numerators // 1000 ** width
+    return [Decimal(int(value)) * PENCE for value in returns]
+
+
+def format_fractional(numerator, denominator):
+    if numerator == denominator:
+        return 'Evens'
+    return '{}/{}'.format(numerator, denominator)
+
+
+def format_american(american):
+    return '{:+d}'.format(american)
@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Balance, Bet
+
+
+class BetPlacementError(Exception):
+    pass
+
+
+def _debit(user, gameweek, stake):
+    """
+    Take ``stake`` off the player's balance for the gameweek, if it covers it.
+
+    The check and the write are a single conditional ``UPDATE``, so the
+    database serialises concurrent bets on the row lock alone and a balance
+    can never be oversubscribed. The balance row is created, at the season's
+    weekly allowance, the first time it is missing.
+    """
+    balances = Balance.objects.filter(user=user, gameweek=gameweek, remaining__gte=stake)
+    if balances.update(remaining=F('remaining') - stake):
+        return
+
+    Balance.objects.get_or_create(
+        user=user,
+        gameweek=gameweek,
+        defaults={'remaining': gameweek.season.weekly_allowance},
+    )
+    if not balances.update(remaining=F('remaining') - stake):
+        raise BetPlacementError('Stake is more than the remaining allowance')
+
+
+def check_bet(user, gameweek, stake, now=None):
+    if stake <= 0:
+        raise BetPlacementError('Stake must be positive')
+    if gameweek.deadline <= (now or timezone.now()):
+        raise BetPlacementError('The deadline for this gameweek has passed')
+    if not gameweek.season.has_player(user):
+        raise BetPlacementError('Only players in the season can bet')
+
+
+def place_bet(user, selection, stake, now=None):
+    """
+    Place a bet on ``selection`` against the player's allowance for the
+    selection's gameweek.
+
+    Keep this out of ``ATOMIC_REQUESTS``: the transaction here spans the
+    debit and the insert and nothing else.
+    """
+    gameweek = selection.market.gameweek
+    check_bet(user, gameweek, stake, now)
+
+    with transaction.atomic():
+        _debit(user, gameweek, stake)
+        return Bet.objects.create(
+            user=user,
+            gameweek=gameweek,
+            selection=selection,
+            stake=stake,
+            price=selection.price,
+        )
+
+
+def place_slip(user, gameweek, bets, now=None):
+    """
+    Place a slip of ``(selection, stake)`` pairs on one gameweek as a unit.
+
+    The whole slip is debited with one conditional update and inserted with
+    one ``bulk_create``, so either every bet is placed or none is.
+    """
+    total = sum(stake for _, stake in bets)
+    check_bet(user, gameweek, total, now)
+
+    with transaction.atomic():
+        _debit(user, gameweek, total)
+        return Bet.objects.bulk_create([
+            Bet(
+                user=user,
+                gameweek=gameweek,
+                selection=selection,
+                stake=stake,
+                price=selection.price,
+            )
+            for selection, stake in bets
+        ])
@@ -0,0 +1,90 @@
+import uuid
+from itertools import groupby
+
+from django.core.cache import cache
+from django.db import transaction
+
+from fantasy_gambling_league.core.cache import get_or_compute
+from .models import Bet, Selection
+from .odds import format_american, format_fractional, potential_returns, to_american, to_fractional
+
+PRICE_TABLE_TIMEOUT = 60 * 60
+VERSION_KEY = 'betting:prices-version:{}'
+
+
+def price_snapshot(gameweek):
+    """
+    Identify the current prices of a gameweek by a version token that every
+    price write replaces, see ``prices_changed``.
+    """
+    key = VERSION_KEY.format(gameweek.pk)
+    version = cache.get(key)
+    if version is None:
+        # Evicted or never set: start a new version rather than reuse one
+        # that tables may still be cached under.
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(gameweek_id):
+    cache.set(VERSION_KEY.format(gameweek_id), uuid.uuid4().hex, None)
+
+
+def prices_changed(gameweek_id):
+    """
+    Call once after writing any of a gameweek's markets or selections, so
+    that its price table is rebuilt. There is no signal receiver for it, as
+    that would cost a query per row and stop bulk deletes being fast.
+    """
+    # Bump straight away so other workers stop trusting their tables, and
+    # again on commit in case one re-read the old prices before it committed.
+    bump_version(gameweek_id)
+    transaction.on_commit(lambda: bump_version(gameweek_id))
+
+
+def build_price_table(gameweek):
+    selections = list(
+        Selection.objects.filter(market__gameweek=gameweek).order_by(
+            'market__name', 'market_id', 'name',
+        ).values_list('market_id', 'market__name', 'name', 'price')
+    )
+    prices = [price for _, _, _, price in selections]
+    numerators, denominators = to_fractional(prices)
+    american = to_american(prices)
+
+    rows = [
+        {
+            'market_id': market_id,
+            'market': market,
+            'name': name,
+            'decimal': price,
+            'fractional': format_fractional(numerator, denominator),
+            'american': format_american(odds),
+        }
+        for (market_id, market, name, price), numerator, denominator, odds
+        in zip(selections, numerators.tolist(), denominators.tolist(), american.tolist())
+    ]
+    return [
+        {'name': market_rows[0]['market'], 'selections': market_rows}
+        for market_rows in (list(group) for _, group in groupby(rows, key=lambda row: row['market_id']))
+    ]
+
+
+def gameweek_price_table(gameweek):
+    """
+    Return a gameweek's markets with every price in decimal, fractional and
+    American formats, computed once per price snapshot.
+    """
+    key = 'betting:prices:{}:{}'.format(gameweek.pk, price_snapshot(gameweek))
+
+    return get_or_compute(key, lambda: build_price_table(gameweek), PRICE_TABLE_TIMEOUT)
+
+
+def bets_with_returns(user, gameweek):
+    bets = list(Bet.objects.filter(user=user, gameweek=gameweek).select_related('selection'))
+    returns = potential_returns([bet.stake for bet in bets], [[bet.price] for bet in bets])
+
+    for bet, potential in zip(bets, returns):
+        bet.potential_returns = potential
+    return bets
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from fantasy_gambling_league.core.cache import get_fresh, get_or_compute
+from fantasy_gambling_league.structure.models import Season, SeasonMembership
+from .models import Bet
+
+PROJECTION_TIMEOUT = 60 * 60 * 24
+SIMULATIONS = 20000
+BATCH_SIZE = 2500
+
+
+def simulate_batch(totals, means, deviations, remaining, simulations, seed):
+    """
+    Count how often each player finishes top over ``simulations`` seasons.
+
+    A player's weekly profit is modelled as normal, so their profit over the
+    remaining gameweeks is drawn directly as one normal per simulation
+    rather than summing a draw per gameweek.
+    """
+    random = np.random.RandomState(seed)
+    finals = totals + random.normal(
+        loc=means * remaining,
+        scale=deviations * np.sqrt(remaining),
+        size=(simulations, len(totals)),
+    )
+    return np.bincount(finals.argmax(axis=1), minlength=len(totals))
+
+
+def simulate(totals, means, deviations, remaining, simulations=SIMULATIONS,
+             workers=None, batch_size=BATCH_SIZE, seed=0):
+    """
+    Return each player's probability of winning, splitting the simulations
+    into batches run across a process pool when ``workers`` is above one.
+    """
+    totals, means, deviations = (np.asarray(values, dtype=np.float64) for values in (totals, means, deviations))
+    if not len(totals):
+        return np.zeros(0)
+    if not remaining:
+        wins = np.zeros(len(totals))
+        wins[totals.argmax()] = 1
+        return wins
+
+    batches = [
+        (totals, means, deviations, remaining, min(batch_size, simulations - start), seed + number)
+        for number, start in enumerate(range(0, simulations, batch_size))
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(simulate_batch, *zip(*batches)))
+    else:
+        counts = [simulate_batch(*batch) for batch in batches]
+
+    return np.sum(counts, axis=0) / simulations
+
+
+def season_version(season, now=None):
+    """
+    Change whenever ``Season.version`` is bumped, as every write to the
+    season's players, gameweeks or settled bets must do, or a gameweek
+    deadline passes.
+    """
+    version, elapsed = Season.objects.filter(pk=season.pk).annotate(
+        elapsed=Count('gameweek', filter=Q(gameweek__deadline__lte=now or timezone.now())),
+    ).values_list('version', 'elapsed').get()
+    return '{}-{}'.format(version, elapsed)
+
+
+def projection_key(season, version):
+    return 'betting:projection:{}:{}'.format(season.pk, version)
+
+
+def season_inputs(season, now=None):
+    """
+    Return the player IDs, their season profit so far and the mean and
+    standard deviation of their weekly profit, plus the gameweeks remaining.
+    """
+    now = now or timezone.now()
+    players = list(
+        SeasonMembership.objects.filter(season=season, role=SeasonMembership.PLAYER)
+        .order_by('user_id').values_list('user_id', flat=True)
+    )
+    index = {player: position for position, player in enumerate(players)}
+    finished = list(
+        season.gameweek_set.filter(deadline__lte=now).order_by('number').values_list('pk', flat=True)
+    )
+    weeks = {gameweek: position for position, gameweek in enumerate(finished)}
+    remaining = season.gameweek_set.filter(deadline__gt=now).count()
+
+    weekly = np.zeros((len(players), len(finished)))
+    profits = (
+        Bet.objects.filter(gameweek__in=finished, user__in=players, returns__isnull=False)
+        .values('user_id', 'gameweek_id')
+        .annotate(profit=Sum(F('returns') - F('stake')))
+    )
+    for row in profits:
+        weekly[index[row['user_id']], weeks[row['gameweek_id']]] = row['profit']
+
+    # Players with too little history borrow the league's spread.
+    league_deviation = weekly.std() if weekly.size else 0.0
+    deviations = weekly.std(axis=1) if len(finished) > 1 else np.full(len(players), league_deviation)
+    deviations = np.where(deviations > 0, deviations, max(league_deviation, 1.0))
+    means = weekly.mean(axis=1) if len(finished) else np.zeros(len(players))
+
+    return players, weekly.sum(axis=1), means, deviations, remaining
+
+
+def project_season(season, simulations=SIMULATIONS, workers=None, now=None):
+    """
+    Return ``{user_id: probability of winning}`` for the season's players,
+    cached until the season's version changes.
+    """
+    def compute():
+        players, totals, means, deviations, remaining = season_inputs(season, now)
+        probabilities = simulate(totals, means, deviations, remaining, simulations, workers)
+        return dict(zip(players, probabilities.tolist()))
+
+    return get_or_compute(projection_key(season, season_version(season, now)), compute, PROJECTION_TIMEOUT)
+
+
+def cached_projection(season, now=None):
+    return get_fresh(projection_key(season, season_version(season, now)))
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from .models import Selection
+
+MAX_SLIP_SIZE = 50
+
+
+class SlipBetSerializer(serializers.Serializer):
+    selection = serializers.IntegerField()
+    stake = serializers.DecimalField(max_digits=99, decimal_places=2, min_value=Decimal('0.01'))
+
+
+class BetSlipSerializer(serializers.Serializer):
+    bets = SlipBetSerializer(many=True, allow_empty=False)
+
+    def validate_bets(self, bets):
+        if len(bets) > MAX_SLIP_SIZE:
+            raise serializers.ValidationError('A slip can have at most {} bets'.format(MAX_SLIP_SIZE))
+
+        # One query for the whole slip rather than one per selection.
+        selections = Selection.objects.filter(
+            market__gameweek=self.context['gameweek'],
+        ).in_bulk([bet['selection'] for bet in bets])
+
+        errors = [
+            {} if bet['selection'] in selections else {'selection': ['Not a selection in this gameweek']}
+            for bet in bets
+        ]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return [(selections[bet['selection']], bet['stake']) for bet in bets]
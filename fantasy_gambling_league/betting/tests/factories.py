@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+from factory import DjangoModelFactory, Faker, SelfAttribute, Sequence, SubFactory
+
+from fantasy_gambling_league.structure.tests.factories import GameweekFactory, SeasonFactory
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from ..models import Bet, Market, Selection
+
+
+class MarketFactory(DjangoModelFactory):
+    gameweek = SubFactory(GameweekFactory, season=SubFactory(SeasonFactory), number=1)
+    external_id = Sequence(lambda n: 'market-{}'.format(n))
+    name = Faker('sentence', nb_words=3)
+
+    class Meta:
+        model = Market
+
+
+class SelectionFactory(DjangoModelFactory):
+    market = SubFactory(MarketFactory)
+    external_id = Sequence(lambda n: 'selection-{}'.format(n))
+    name = Faker('name')
+    price = Decimal('2.000')
+
+    class Meta:
+        model = Selection
+
+
+class BetFactory(DjangoModelFactory):
+    user = SubFactory(UserFactory)
+    selection = SubFactory(SelectionFactory)
+    gameweek = SelfAttribute('selection.market.gameweek')
+    stake = Decimal('10.00')
+    price = SelfAttribute('selection.price')
+
+    class Meta:
+        model = Bet
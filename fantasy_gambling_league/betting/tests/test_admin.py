@@ -0,0 +1,26 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import MarketFactory, SelectionFactory
+from ..models import Selection
+from ..prices import gameweek_price_table
+
+
+class TestPricesAdmin(TestCase):
+    def setUp(self):
+        self.market = MarketFactory()
+        self.selection = SelectionFactory(market=self.market, price=Decimal('2.000'))
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+
+    def test_bulk_delete_invalidates_price_table(self):
+        gameweek_price_table(self.market.gameweek)
+
+        self.client.post(reverse('admin:betting_selection_changelist'), {
+            'action': 'delete_selected', '_selected_action': [self.selection.pk], 'post': 'yes',
+        })
+
+        assert not Selection.objects.exists()
+        assert gameweek_price_table(self.market.gameweek) == []
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pytz import utc
+
+from ..history import PriceHistory, TICK
+
+START = datetime(2019, 2, 1, 15, 0, tzinfo=utc)
+
+
+@pytest.fixture
+def history():
+    data = b''
+    for minute, price in enumerate([2.5, 2.75, 3.0, 2.0, 1.5]):
+        data = PriceHistory.append(data, START + timedelta(minutes=minute), price)
+    return PriceHistory(data)
+
+
+def test_packed_size(history):
+    assert len(history) == 5
+    assert len(history._data) == 5 * TICK.size
+
+
+def test_indexing(history):
+    assert history[0] == (START, 2.5)
+    assert history.latest() == (START + timedelta(minutes=4), 1.5)
+
+    with pytest.raises(IndexError):
+        history[5]
+
+
+def test_between(history):
+    window = history.between(START + timedelta(minutes=1), START + timedelta(minutes=3))
+
+    assert window == [
+        (START + timedelta(minutes=1), 2.75),
+        (START + timedelta(minutes=2), 3.0),
+    ]
+    assert history.between(end=START + timedelta(seconds=30)) == [(START, 2.5)]
+    assert len(history.between(start=START + timedelta(minutes=3))) == 2
+    assert history.between(START + timedelta(hours=1), START) == []
+
+
+def test_empty():
+    history = PriceHistory(b'')
+
+    assert len(history) == 0
+    assert history.latest() is None
+    assert history.between() == []
@@ -0,0 +1,185 @@
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from fantasy_gambling_league.structure.tests.factories import GameweekFactory, SeasonFactory
+from .factories import MarketFactory, SelectionFactory
+from ..history import CHUNK_TICKS
+from ..ingestion import OddsRow, iter_feed, upsert_batch, write_checkpoint
+from ..models import Market, PriceHistoryChunk, Selection
+
+CSV_FEED = (
+    'market_id,market_name,selection_id,selection_name,price\n'
+    'm1,Match Result,s1,Home,2/1\n'
+    'm1,Match Result,s2,Away,+150\n'
+    'broken row\n'
+    'm2,Top Scorer,s3,Striker,4.5\n'
+)
+
+
+class TestIterFeed(TestCase):
+    def test_csv_rows_and_offsets(self):
+        stream = io.BytesIO(CSV_FEED.encode('utf-8'))
+        rows = list(iter_feed(stream, 'csv'))
+
+        assert [row.selection_id if row else None for row, _ in rows] == ['s1', 's2', None, 's3']
+        assert rows[0][0].price == Decimal('3.000')
+        assert rows[-1][1] == len(CSV_FEED)
+
+    def test_resume_from_offset(self):
+        stream = io.BytesIO(CSV_FEED.encode('utf-8'))
+        offset = list(iter_feed(stream, 'csv'))[1][1]
+
+        stream.seek(0)
+        resumed = [row.selection_id for row, _ in iter_feed(stream, 'csv', offset) if row]
+
+        assert resumed == ['s3']
+
+    def test_json_lines(self):
+        lines = [
+            {
+                'market_id': 'm1', 'market_name': 'Result',
+                'selection_id': 's1', 'selection_name': 'Draw', 'price': '9/4',
+            },
+            ['not', 'an', 'object'],
+        ]
+        stream = io.BytesIO('\n'.join(json.dumps(line) for line in lines).encode('utf-8'))
+        rows = [row for row, _ in iter_feed(stream, 'jsonl')]
+
+        assert rows[0].price == Decimal('3.250')
+        assert rows[1] is None
+
+
+class TestUpsertBatch(TestCase):
+    def setUp(self):
+        self.gameweek = GameweekFactory(season=SeasonFactory(), number=1)
+
+    def test_creates_and_updates(self):
+        market = MarketFactory(gameweek=self.gameweek, external_id='m1', name='Old name')
+        selection = SelectionFactory(market=market, external_id='s1', price=Decimal('2.000'))
+        unchanged = SelectionFactory(market=market, external_id='s2', name='Away', price=Decimal('3.000'))
+        unchanged_updated = unchanged.updated
+
+        upsert_batch(self.gameweek, [
+            OddsRow('m1', 'Match Result', 's1', selection.name, Decimal('2.500')),
+            OddsRow('m1', 'Match Result', 's2', 'Away', Decimal('3.000')),
+            OddsRow('m2', 'Top Scorer', 's3', 'Striker', Decimal('5.000')),
+        ])
+
+        market.refresh_from_db()
+        selection.refresh_from_db()
+        unchanged.refresh_from_db()
+
+        assert market.name == 'Match Result'
+        assert selection.price == Decimal('2.500')
+        assert selection.history.latest()[1] == 2.5
+        assert unchanged.updated == unchanged_updated
+        created = Selection.objects.get(external_id='s3')
+        assert created.market == Market.objects.get(external_id='m2')
+        assert len(created.history) == 1
+
+    def test_ids_scoped_to_gameweek(self):
+        other_market = MarketFactory(
+            gameweek=GameweekFactory(season=self.gameweek.season, number=2), external_id='m1', name='Other',
+        )
+        other_selection = SelectionFactory(market=other_market, external_id='s1', price=Decimal('2.000'))
+
+        upsert_batch(self.gameweek, [OddsRow('m1', 'Match Result', 's1', 'Home', Decimal('4.000'))])
+
+        other_market.refresh_from_db()
+        other_selection.refresh_from_db()
+        assert other_market.name == 'Other'
+        assert other_selection.price == Decimal('2.000')
+        assert Selection.objects.get(market__gameweek=self.gameweek, external_id='s1').market.name == 'Match Result'
+
+    def test_selection_ids_scoped_to_market(self):
+        result = MarketFactory(gameweek=self.gameweek, external_id='m1', name='Result')
+        home = SelectionFactory(market=result, external_id='1', name='Home', price=Decimal('2.000'))
+
+        upsert_batch(self.gameweek, [
+            OddsRow('m1', 'Result', '1', 'Home', Decimal('2.500')),
+            OddsRow('m1', 'Result', 'X', 'Draw', Decimal('3.000')),
+            OddsRow('m2', 'Half time', '1', 'Home', Decimal('3.500')),
+            OddsRow('m2', 'Half time', 'X', 'Draw', Decimal('2.200')),
+        ])
+
+        home.refresh_from_db()
+        assert (home.market, home.price) == (result, Decimal('2.500'))
+        assert len(home.history) == 1
+        half_time = Selection.objects.filter(market__external_id='m2').order_by('external_id')
+        assert [(selection.external_id, selection.price) for selection in half_time] == [
+            ('1', Decimal('3.500')), ('X', Decimal('2.200')),
+        ]
+        assert [len(selection.history) for selection in half_time] == [1, 1]
+
+    def test_query_count_independent_of_batch_size(self):
+        rows = [OddsRow('m1', 'Result', 's{}'.format(n), 'Name', Decimal('2.000')) for n in range(50)]
+
+        # The market read, insert and re-read, the selection read, insert and
+        # re-read, then the append's selection lock, open chunk read and chunk
+        # insert inside a savepoint pair.
+        with self.assertNumQueries(11):
+            upsert_batch(self.gameweek, rows)
+
+    def test_history_appended_in_chunks(self):
+        selection = SelectionFactory(market=MarketFactory(gameweek=self.gameweek, external_id='m1'), external_id='s1')
+        start = timezone.now()
+        for tick in range(CHUNK_TICKS + 2):
+            PriceHistoryChunk.append({selection.pk: Decimal(2 + tick)}, start + timedelta(minutes=tick))
+
+        assert list(selection.price_chunks.order_by('first').values_list('ticks', flat=True)) == [CHUNK_TICKS, 2]
+        assert len(selection.history) == CHUNK_TICKS + 2
+        assert selection.history.latest()[1] == CHUNK_TICKS + 3
+
+        second_chunk = start + timedelta(minutes=CHUNK_TICKS)
+        window = selection.history_between(second_chunk, second_chunk + timedelta(minutes=1))
+        assert len(window) == 2
+        assert window.between(second_chunk)[0] == (second_chunk, CHUNK_TICKS + 2)
+
+
+class TestIngestOddsCommand(TestCase):
+    def setUp(self):
+        self.gameweek = GameweekFactory(season=SeasonFactory(), number=1)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'odds.csv')
+        with open(self.path, 'w') as feed:
+            feed.write(CSV_FEED)
+
+    def call(self, path, *args):
+        stdout = io.StringIO()
+        call_command(
+            'ingest_odds', self.gameweek.season.slug, '1', path, *args,
+            stdout=stdout, stderr=io.StringIO()
+        )
+        return stdout.getvalue()
+
+    def test_ingest(self):
+        output = self.call(self.path, '--batch-size', '2')
+
+        assert 'Ingested 3 rows' in output
+        assert 'rows/s' in output
+        assert Selection.objects.filter(market__gameweek=self.gameweek).count() == 3
+        assert not os.path.exists(self.path + '.checkpoint')
+
+    def test_resumes_from_checkpoint(self):
+        header_and_two_rows = len(CSV_FEED) - len('m2,Top Scorer,s3,Striker,4.5\n')
+        write_checkpoint(self.path + '.checkpoint', header_and_two_rows)
+
+        output = self.call(self.path)
+
+        assert 'Resuming from byte' in output
+        assert list(Selection.objects.values_list('external_id', flat=True)) == ['s3']
+
+    def test_unknown_gameweek(self):
+        with self.assertRaises(CommandError):
+            call_command('ingest_odds', 'no-such-season', '1', 'odds.csv')
@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+import pytest
+
+from ..odds import (
+    combined_prices,
+    format_american,
+    format_fractional,
+    parse_price,
+    potential_returns,
+    to_american,
+    to_fractional,
+)
+
+
+@pytest.mark.parametrize('raw,expected', [
+    ('2.5', Decimal('2.500')),
+    ('3/2', Decimal('2.500')),
+    ('1/3', Decimal('1.333')),
+    ('+150', Decimal('2.500')),
+    ('-200', Decimal('1.500')),
+    ('Evens', Decimal('2.000')),
+    (' 11/10 ', Decimal('2.100')),
+])
+def test_parse_price(raw, expected):
+    assert parse_price(raw) == expected
+
+
+@pytest.mark.parametrize('raw', [
+    '', 'abc', '1/0', '0.5', '1', '+0', 'nan', '-nan', 'inf', '1/2/3', '1e30', '10000000', '9e999999/1e-999999',
+])
+def test_parse_price_rejects_nonsense(raw):
+    with pytest.raises(ValueError):
+        parse_price(raw)
+
+
+def test_to_fractional():
+    numerators, denominators = to_fractional([Decimal('3.5'), 2.0, 1.5, 1.333, 11.0, 1.909])
+
+    assert numerators.tolist() == [5, 1, 1, 1, 10, 10]
+    assert denominators.tolist() == [2, 1, 2, 3, 1, 11]
+
+
+def test_to_american():
+    assert to_american([2.5, 2.0, 1.5, 1.25]).tolist() == [150, 100, -200, -400]
+
+
+def test_combined_prices_and_returns():
+    slips = [[2.0, 3.0], [1.5], [2.0, 2.0, 2.0], []]
+
+    assert combined_prices(slips).tolist() == [6.0, 1.5, 8.0, 1.0]
+    assert potential_returns([10, 10, 5, 1], slips) == [Decimal('60'), Decimal('15'), Decimal('40'), Decimal('1')]
+
+
+def test_returns_exact_and_rounded_down():
+    # 3 * 1.1 is 3.3000000000000003 in float64.
+    assert potential_returns([Decimal('3.00')], [[Decimal('1.100')]]) == [Decimal('3.30')]
+    assert potential_returns([Decimal('0.10')], [[Decimal('1.333'), Decimal('1.333')]]) == [Decimal('0.17')]
+    # Decimal(1.333) would be 1.33299999..., and 1.332 pays 133.20.
+    assert potential_returns([100.0], [[1.333]]) == [Decimal('133.30')]
+
+
+def test_returns_too_big_for_int64():
+    assert potential_returns([Decimal('1000'), 2], [[Decimal('50.000')] * 7, [2]]) == [
+        Decimal(1000 * 50 ** 7), Decimal('4'),
+    ]
+
+
+def test_formatting():
+    assert format_fractional(1, 1) == 'Evens'
+    assert format_fractional(5, 2) == '5/2'
+    assert format_american(-200) == '-200'
+    assert format_american(150) == '+150'
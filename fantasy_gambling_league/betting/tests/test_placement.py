@@ -0,0 +1,117 @@
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from unittest import skipIf
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from pytz import utc
+
+from fantasy_gambling_league.structure.tests.factories import (
+    GameweekFactory,
+    SeasonFactory,
+    SeasonMembershipFactory,
+)
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import MarketFactory, SelectionFactory
+from ..models import Balance, Bet
+from ..placement import BetPlacementError, place_bet
+
+
+class PlacementSetupMixin:
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory(weekly_allowance=Decimal('100.00'))
+        SeasonMembershipFactory(season=self.season, user=self.user)
+        self.gameweek = GameweekFactory(
+            season=self.season,
+            number=1,
+            deadline=datetime.now(utc) + timedelta(days=1),
+        )
+        self.selection = SelectionFactory(
+            market=MarketFactory(gameweek=self.gameweek),
+            price=Decimal('2.500'),
+        )
+
+
+class TestPlaceBet(PlacementSetupMixin, TestCase):
+    def test_first_bet_opens_balance_at_weekly_allowance(self):
+        bet = place_bet(self.user, self.selection, Decimal('30.00'))
+
+        assert bet.price == Decimal('2.500')
+        assert bet.gameweek == self.gameweek
+        assert Balance.objects.get(user=self.user, gameweek=self.gameweek).remaining == Decimal('70.00')
+
+    def test_later_bets_debit_with_one_update(self):
+        place_bet(self.user, self.selection, Decimal('30.00'))
+
+        # Membership check, then the savepoint around the debit and insert.
+        with self.assertNumQueries(5):
+            place_bet(self.user, self.selection, Decimal('70.00'))
+
+        assert Balance.objects.get(user=self.user, gameweek=self.gameweek).remaining == Decimal('0.00')
+
+    def test_stake_over_allowance_rejected(self):
+        place_bet(self.user, self.selection, Decimal('60.00'))
+
+        with self.assertRaises(BetPlacementError):
+            place_bet(self.user, self.selection, Decimal('40.01'))
+
+        assert Bet.objects.count() == 1
+        assert Balance.objects.get().remaining == Decimal('40.00')
+
+    def test_deadline_passed(self):
+        with self.assertRaises(BetPlacementError):
+            place_bet(self.user, self.selection, Decimal('1.00'), now=self.gameweek.deadline)
+
+    def test_non_player_rejected(self):
+        with self.assertRaises(BetPlacementError):
+            place_bet(UserFactory(), self.selection, Decimal('1.00'))
+
+    def test_non_positive_stake_rejected(self):
+        with self.assertRaises(BetPlacementError):
+            place_bet(self.user, self.selection, Decimal('0'))
+
+
+@skipIf(
+    connection.vendor == 'sqlite',
+    'SQLite locks whole tables for writes, so concurrent writers fail rather than queue',
+)
+class TestConcurrentPlaceBet(PlacementSetupMixin, TransactionTestCase):
+    threads = 16
+    bets_per_thread = 5
+    stake = Decimal('3.00')
+
+    def test_balance_never_oversubscribed(self):
+        placed = []
+        errors = []
+        start = threading.Barrier(self.threads)
+
+        def hammer():
+            try:
+                start.wait()
+                for _ in range(self.bets_per_thread):
+                    try:
+                        place_bet(self.user, self.selection, self.stake)
+                        placed.append(self.stake)
+                    except BetPlacementError:
+                        pass
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=hammer) for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        balance = Balance.objects.get(user=self.user, gameweek=self.gameweek)
+
+        assert errors == []
+        # 80 attempts at 3.00 against 100.00: exactly 33 fit.
+        assert len(placed) == 33
+        assert Bet.objects.count() == 33
+        assert balance.remaining == Decimal('1.00')
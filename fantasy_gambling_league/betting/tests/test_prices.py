@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from django.contrib import admin
+from django.test import TestCase
+
+from fantasy_gambling_league.structure.tests.factories import GameweekFactory, SeasonFactory
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import BetFactory, MarketFactory, SelectionFactory
+from ..ingestion import OddsRow, upsert_batch
+from ..models import Selection
+from ..prices import bets_with_returns, gameweek_price_table
+
+
+class TestGameweekPriceTable(TestCase):
+    def setUp(self):
+        self.gameweek = GameweekFactory(season=SeasonFactory(), number=1)
+        market = MarketFactory(gameweek=self.gameweek, external_id='m1', name='Match Result')
+        SelectionFactory(market=market, external_id='s1', name='Away', price=Decimal('3.500'))
+        SelectionFactory(market=market, external_id='s2', name='Home', price=Decimal('1.500'))
+
+    def test_formats(self):
+        table = gameweek_price_table(self.gameweek)
+
+        assert [market['name'] for market in table] == ['Match Result']
+        away, home = table[0]['selections']
+        assert (away['name'], away['fractional'], away['american']) == ('Away', '5/2', '+250')
+        assert (home['name'], home['fractional'], home['american']) == ('Home', '1/2', '-200')
+
+    def test_memoized_until_prices_change(self):
+        gameweek_price_table(self.gameweek)
+
+        with self.assertNumQueries(0):
+            gameweek_price_table(self.gameweek)
+
+        upsert_batch(self.gameweek, [OddsRow('m1', 'Match Result', 's1', 'Away', Decimal('4.000'))])
+
+        assert gameweek_price_table(self.gameweek)[0]['selections'][0]['fractional'] == '3/1'
+
+    def test_refreshed_when_price_saved_without_updated(self):
+        gameweek_price_table(self.gameweek)
+
+        # A new price but the same ``updated``.
+        selection = Selection.objects.get(external_id='s2')
+        selection.price = Decimal('2.000')
+        admin.site._registry[Selection].save_model(None, selection, None, change=True)
+
+        assert gameweek_price_table(self.gameweek)[0]['selections'][1]['fractional'] == 'Evens'
+
+
+class TestBetsWithReturns(TestCase):
+    def test_potential_returns(self):
+        user = UserFactory()
+        bet = BetFactory(user=user, stake=Decimal('10.00'), price=Decimal('2.500'))
+        BetFactory(stake=Decimal('5.00'))
+
+        bets = bets_with_returns(user, bet.gameweek)
+
+        assert [(b.pk, b.potential_returns) for b in bets] == [(bet.pk, Decimal('25.00'))]
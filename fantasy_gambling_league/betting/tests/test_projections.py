@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.test import TestCase
+from pytz import utc
+
+from fantasy_gambling_league.structure.enrolment import enrol_players
+from fantasy_gambling_league.structure.models import Season
+from fantasy_gambling_league.structure.tests.factories import (
+    GameweekFactory,
+    SeasonFactory,
+    SeasonMembershipFactory,
+)
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import BetFactory, MarketFactory, SelectionFactory
+from ..projections import cached_projection, project_season, simulate
+
+
+class TestSimulate(TestCase):
+    def test_clear_leader_wins(self):
+        probabilities = simulate([1000, 0, 0], [0, 0, 0], [10, 10, 10], remaining=2, simulations=2000)
+
+        assert probabilities.tolist() == [1.0, 0.0, 0.0]
+
+    def test_equal_players_split(self):
+        probabilities = simulate([0, 0], [0, 0], [10, 10], remaining=5, simulations=20000)
+
+        assert abs(probabilities[0] - 0.5) < 0.02
+        assert probabilities.sum() == 1.0
+
+    def test_finished_season_goes_to_leader(self):
+        assert simulate([5, 20, 10], [0] * 3, [1] * 3, remaining=0).tolist() == [0, 1, 0]
+
+    def test_process_pool_matches_inline(self):
+        args = ([0, 10, 5, 7], [1, 0, 2, 1], [10, 20, 15, 5], 4)
+
+        inline = simulate(*args, simulations=4000, workers=1, batch_size=1000)
+        pooled = simulate(*args, simulations=4000, workers=2, batch_size=1000)
+
+        assert np.array_equal(inline, pooled)
+
+
+class TestProjectSeason(TestCase):
+    def setUp(self):
+        self.season = SeasonFactory()
+        self.now = datetime.now(utc)
+        finished = [
+            GameweekFactory(season=self.season, number=number, deadline=self.now - timedelta(days=8 - number))
+            for number in (1, 2)
+        ]
+        GameweekFactory(season=self.season, number=3, deadline=self.now + timedelta(days=1))
+
+        self.leader, self.trailer = (
+            SeasonMembershipFactory(season=self.season).user for _ in range(2)
+        )
+        for gameweek in finished:
+            selection = SelectionFactory(market=MarketFactory(gameweek=gameweek))
+            BetFactory(user=self.leader, selection=selection, stake=Decimal('10'), returns=Decimal('500'))
+            BetFactory(user=self.trailer, selection=selection, stake=Decimal('10'), returns=Decimal('0'))
+
+    def test_projection_cached_per_version(self):
+        assert cached_projection(self.season, self.now) is None
+
+        projection = project_season(self.season, simulations=1000, workers=1, now=self.now)
+
+        assert set(projection) == {self.leader.pk, self.trailer.pk}
+        assert projection[self.leader.pk] > 0.99
+        assert cached_projection(self.season, self.now) == projection
+
+        Season.bump_version(pk=self.season.pk)
+
+        assert cached_projection(self.season, self.now) is None
+
+    def test_version_changes_with_players_and_deadlines(self):
+        project_season(self.season, simulations=1000, workers=1, now=self.now)
+
+        newcomer = UserFactory()
+        enrol_players(self.season, [newcomer.username])
+        assert cached_projection(self.season, self.now) is None
+
+        assert newcomer.pk in project_season(self.season, simulations=1000, workers=1, now=self.now)
+        assert cached_projection(self.season, self.now + timedelta(days=8)) is None
+
+    def test_version_survives_stale_save(self):
+        stale = Season.objects.get(pk=self.season.pk)
+        Season.bump_version(pk=self.season.pk)
+        version = Season.objects.get(pk=self.season.pk).version
+
+        stale.name = 'Renamed'
+        stale.save()
+
+        assert Season.objects.get(pk=self.season.pk).version == version
+
+    def test_version_is_one_query(self):
+        with self.assertNumQueries(1):
+            cached_projection(self.season, self.now)
@@ -0,0 +1,163 @@
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from pytz import utc
+
+from fantasy_gambling_league.structure.tests.factories import (
+    GameweekFactory,
+    SeasonFactory,
+    SeasonMembershipFactory,
+)
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import MarketFactory, SelectionFactory
+from ..models import Balance, Bet
+
+
+class TestCreateBetView(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory(weekly_allowance=Decimal('100.00'))
+        SeasonMembershipFactory(season=self.season, user=self.user)
+        self.gameweek = GameweekFactory(
+            season=self.season,
+            number=1,
+            deadline=datetime.now(utc) + timedelta(days=1),
+        )
+        self.selection = SelectionFactory(market=MarketFactory(gameweek=self.gameweek))
+
+    def get_url(self):
+        return reverse(
+            'betting:create-bet',
+            kwargs={'season_slug': self.season.slug, 'number': self.gameweek.number},
+        )
+
+    def test_anonymous_user_redirected_on_post(self):
+        response = self.client.post(self.get_url(), data={
+            'selection': self.selection.pk,
+            'stake': '10.00',
+        })
+
+        assert response.status_code == 302
+        assert 'login' in response.url
+        assert Bet.objects.count() == 0
+
+    def test_successful_bet(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.get_url(), data={
+            'selection': self.selection.pk,
+            'stake': '10.00',
+        })
+
+        assert response.status_code == 302
+        bet = Bet.objects.get()
+
+        assert bet.user == self.user
+        assert bet.stake == Decimal('10.00')
+
+    def test_stake_over_allowance_shown_as_form_error(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.get_url(), data={
+            'selection': self.selection.pk,
+            'stake': '100.01',
+        })
+
+        assert response.status_code == 200
+        assert 'Stake is more than the remaining allowance' in response.context['form'].non_field_errors()
+        assert Bet.objects.count() == 0
+
+    def test_selection_from_other_gameweek_rejected(self):
+        other = SelectionFactory()
+
+        self.client.force_login(self.user)
+        response = self.client.post(self.get_url(), data={
+            'selection': other.pk,
+            'stake': '10.00',
+        })
+
+        assert response.status_code == 200
+        assert 'selection' in response.context['form'].errors
+
+
+# DRF marks any open atomic block for rollback when it handles an error,
+# which would be the test's own transaction inside a TestCase.
+class TestBetSlipView(TransactionTestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory(weekly_allowance=Decimal('100.00'))
+        SeasonMembershipFactory(season=self.season, user=self.user)
+        self.gameweek = GameweekFactory(
+            season=self.season,
+            number=1,
+            deadline=datetime.now(utc) + timedelta(days=1),
+        )
+        market = MarketFactory(gameweek=self.gameweek)
+        self.selections = SelectionFactory.create_batch(3, market=market)
+
+    def get_url(self):
+        return reverse(
+            'betting:submit-slip',
+            kwargs={'season_slug': self.season.slug, 'number': self.gameweek.number},
+        )
+
+    def post(self, bets):
+        return self.client.post(
+            self.get_url(),
+            data=json.dumps({'bets': bets}),
+            content_type='application/json',
+        )
+
+    def test_anonymous_user_forbidden(self):
+        response = self.post([{'selection': self.selections[0].pk, 'stake': '10.00'}])
+
+        assert response.status_code == 403
+        assert Bet.objects.count() == 0
+
+    def test_successful_slip(self):
+        self.client.force_login(self.user)
+        response = self.post([
+            {'selection': selection.pk, 'stake': '20.00'} for selection in self.selections
+        ])
+
+        assert response.status_code == 201
+        assert response.json()['bets'] == 3
+        assert Bet.objects.filter(user=self.user).count() == 3
+        assert Balance.objects.get().remaining == Decimal('40.00')
+
+    def test_per_selection_errors(self):
+        other = SelectionFactory()
+
+        self.client.force_login(self.user)
+        response = self.post([
+            {'selection': self.selections[0].pk, 'stake': '10.00'},
+            {'selection': other.pk, 'stake': '10.00'},
+            {'selection': self.selections[1].pk, 'stake': '-1'},
+        ])
+
+        assert response.status_code == 400
+        errors = response.json()['bets']
+        assert errors[0] == {}
+        assert 'stake' in errors[2]
+        assert Bet.objects.count() == 0
+
+    def test_selection_outside_gameweek(self):
+        self.client.force_login(self.user)
+        response = self.post([
+            {'selection': self.selections[0].pk, 'stake': '10.00'},
+            {'selection': SelectionFactory().pk, 'stake': '10.00'},
+        ])
+
+        assert response.status_code == 400
+        assert response.json()['bets'] == [{}, {'selection': ['Not a selection in this gameweek']}]
+
+    def test_slip_over_allowance_places_nothing(self):
+        self.client.force_login(self.user)
+        response = self.post([
+            {'selection': selection.pk, 'stake': '40.00'} for selection in self.selections
+        ])
+
+        assert response.status_code == 400
+        assert 'non_field_errors' in response.json()
+        assert Bet.objects.count() == 0
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'betting'
+urlpatterns = [
+    path(
+        'season/<slug:season_slug>/bet/<int:number>/',
+        views.BetCreateView.as_view(),
+        name='create-bet',
+    ),
+    path(
+        'season/<slug:season_slug>/bet/<int:number>/slip/',
+        views.BetSlipView.as_view(),
+        name='submit-slip',
+    ),
+]
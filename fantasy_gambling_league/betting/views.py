@@ -0,0 +1,95 @@
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.shortcuts import get_object_or_404, reverse
+from django.utils.decorators import method_decorator
+from django.views.generic.edit import FormView
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from fantasy_gambling_league.core.ratelimit import ratelimit
+from fantasy_gambling_league.structure.models import Gameweek
+from .forms import BetForm
+from .placement import BetPlacementError, place_bet, place_slip
+from .serializers import BetSlipSerializer
+
+
+class GameweekMixin:
+    def get_gameweek(self):
+        if not hasattr(self, 'gameweek'):
+            self.gameweek = get_object_or_404(
+                Gameweek.objects.select_related('season'),
+                season__slug=self.kwargs['season_slug'],
+                number=self.kwargs['number'],
+            )
+        return self.gameweek
+
+    def get_success_url(self):
+        gameweek = self.get_gameweek()
+
+        return reverse(
+            'structure:detail-gameweek',
+            kwargs={'season_slug': gameweek.season.slug, 'number': gameweek.number},
+        )
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+@method_decorator(ratelimit('30/m', key='user', scope='bets'), name='dispatch')
+class BetCreateView(LoginRequiredMixin, GameweekMixin, FormView):
+    login_url = '/accounts/login'
+    form_class = BetForm
+    template_name = 'betting/bet_form.html'
+
+    def get_form_kwargs(self):
+        form_kwargs = super(BetCreateView, self).get_form_kwargs()
+        form_kwargs.update({'gameweek': self.get_gameweek()})
+
+        return form_kwargs
+
+    def get_context_data(self, **kwargs):
+        context_data = super(BetCreateView, self).get_context_data(**kwargs)
+        context_data.update({'gameweek': self.get_gameweek()})
+
+        return context_data
+
+    def form_valid(self, form):
+        selection = form.cleaned_data['selection']
+        selection.market.gameweek = self.get_gameweek()
+
+        try:
+            place_bet(self.request.user, selection, form.cleaned_data['stake'])
+        except BetPlacementError as error:
+            form.add_error(None, str(error))
+            return self.form_invalid(form)
+
+        messages.success(self.request, 'Bet placed')
+        return super(BetCreateView, self).form_valid(form)
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+@method_decorator(ratelimit('30/m', key='user', scope='bets'), name='dispatch')
+class BetSlipView(GameweekMixin, APIView):
+    permission_classes = (permissions.IsAuthenticated, )
+
+    def post(self, request, *args, **kwargs):
+        gameweek = self.get_gameweek()
+        serializer = BetSlipSerializer(data=request.data, context={'gameweek': gameweek})
+        serializer.is_valid(raise_exception=True)
+        bets = serializer.validated_data['bets']
+
+        try:
+            placed = place_slip(request.user, gameweek, bets)
+        except BetPlacementError as error:
+            return Response(
+                {'non_field_errors': [str(error)]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                'bets': len(placed),
+                'total_stake': sum(bet.stake for bet in placed),
+            },
+            status=status.HTTP_201_CREATED,
+        )
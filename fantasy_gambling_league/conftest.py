@@ -1,7 +1,12 @@
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from django.test import RequestFactory
 
+from fantasy_gambling_league.core.ratelimit import get_backend
+from fantasy_gambling_league.core.search import ModelSearch
+from fantasy_gambling_league.structure.archive import season_archives
+from fantasy_gambling_league.structure.slugs import season_slugs
 from fantasy_gambling_league.users.tests.factories import UserFactory
 
 
@@ -10,6 +15,37 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def search_indexes():
+    yield
+    for model_search in ModelSearch.registry:
+        model_search.reset()
+
+
+@pytest.fixture(autouse=True)
+def season_slug_cache():
+    yield
+    season_slugs.clear()
+
+
+@pytest.fixture(autouse=True)
+def season_archive_cache():
+    yield
+    season_archives.clear()
+
+
+@pytest.fixture(autouse=True)
+def rate_limits():
+    yield
+    get_backend().reset()
+
+
 @pytest.fixture
 def user() -> settings.AUTH_USER_MODEL:
     return UserFactory()
@@ -0,0 +1,33 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import ProfileCapture, Task
+
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    list_display = ['created', 'method', 'path', 'view_name', 'status_code', 'duration', 'user']
+    list_filter = ['view_name', 'status_code']
+    search_fields = ['path', 'view_name']
+    readonly_fields = [field.name for field in ProfileCapture._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'run_at', 'attempts', 'locked_by', 'finished']
+    list_filter = ['status', 'name']
+    readonly_fields = [field.name for field in Task._meta.fields]
+    actions = ['requeue']
+
+    def has_add_permission(self, request):
+        return False
+
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.QUEUED, run_at=timezone.now(), attempts=0, finished=None,
+        )
+        self.message_user(request, 'Requeued {} tasks.'.format(count))
+    requeue.short_description = 'Run selected tasks again'
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    name = 'fantasy_gambling_league.core'
+
+    def ready(self):
+        from .slowqueries import install
+
+        connection_created.connect(install, dispatch_uid='core.slowqueries.install')
@@ -0,0 +1,88 @@
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache as default_cache
+
+from .cache_backends import compare_and_delete
+from .metrics import record_cache_lookup
+
+# How long past its expiry a value may still be served while one worker
+# recomputes it.
+STALE_TIMEOUT = 60 * 5
+# How long a worker may hold the recompute lock before others give up on it.
+LOCK_TIMEOUT = 30
+# How long a request waits on a cold miss for another worker's value before
+# computing it itself, well under the request timeout.
+LOCK_WAIT = 2
+POLL_INTERVAL = 0.05
+
+
+def _should_recompute(expires, delta, beta, now):
+    """
+    XFetch: recompute early with a probability that rises as expiry nears
+    and with how long the value took to compute, so the refresh for a hot
+    key usually happens before it expires rather than all at once after.
+    """
+    return now - delta * beta * math.log(1 - random.random()) >= expires
+
+
+def _store(cache, key, compute, timeout, stale_timeout):
+    started = time.time()
+    value = compute()
+    finished = time.time()
+
+    cache.set(key, (value, finished + timeout, finished - started), timeout + stale_timeout)
+    return value
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=STALE_TIMEOUT, beta=1.0,
+                   lock_timeout=LOCK_TIMEOUT, lock_wait=LOCK_WAIT, cache=default_cache):
+    """
+    Return the cached value for ``key``, calling ``compute`` to fill it when
+    it has expired, so that concurrent misses recompute it only once.
+
+    Values are stored for ``timeout`` plus ``stale_timeout`` seconds. Once
+    fresh or XFetch says to refresh, one worker takes a lock and recomputes
+    while the others keep serving the stale value; on a cold miss they wait
+    up to ``lock_wait`` for it rather than all hitting the database, then
+    compute it themselves.
+    """
+    entry = cache.get(key)
+    # Grouped by key prefix, such as 'betting:prices', to keep labels few.
+    record_cache_lookup(':'.join(key.split(':')[:2]), entry is not None)
+    if entry is not None:
+        value, expires, delta = entry
+        if not _should_recompute(expires, delta, beta, time.time()):
+            return value
+
+    lock_key = '{}:lock'.format(key)
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, lock_timeout):
+        try:
+            return _store(cache, key, compute, timeout, stale_timeout)
+        finally:
+            # Not a plain delete: if compute outlived the lock, another worker may hold it now.
+            compare_and_delete(cache, lock_key, token)
+
+    if entry is not None:
+        return entry[0]
+
+    deadline = time.time() + min(lock_wait, lock_timeout)
+    while time.time() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if cache.get(lock_key) is None:
+            break
+
+    # The lock holder failed or is slow: compute without waiting any longer.
+    return _store(cache, key, compute, timeout, stale_timeout)
+
+
+def get_fresh(key, cache=default_cache):
+    """Return the value stored by ``get_or_compute`` without computing it, or ``None``."""
+    entry = cache.get(key)
+    return None if entry is None else entry[0]
@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import partial
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+from .metrics import record_cache_lookup
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# KEYS[1]: the key. ARGV[1]: the encoded value it must still hold to be deleted.
+COMPARE_AND_DELETE_SCRIPT = '''
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+'''
+
+
+def compare_and_delete(cache, key, value, version=None):
+    """
+    Delete ``key`` only if it still holds ``value``, such as a lock token,
+    and return whether it did. Atomic on ``django_redis`` through a Lua
+    script; other backends get and then delete, which is only safe for
+    caches no other process shares.
+    """
+    if hasattr(cache, 'compare_and_delete'):
+        return cache.compare_and_delete(key, value, version=version)
+
+    client = getattr(cache, 'client', None)
+    if hasattr(client, 'get_client'):
+        script = client.get_client(write=True).register_script(COMPARE_AND_DELETE_SCRIPT)
+        return bool(script(keys=[cache.make_key(key, version=version)], args=[client.encode(value)]))
+
+    if cache.get(key, version=version) != value:
+        return False
+    cache.delete(key, version=version)
+    return True
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing service after ``threshold`` consecutive failures,
+    then let a single probe through every ``retry_after`` seconds until one
+    succeeds.
+    """
+
+    def __init__(self, threshold, retry_after):
+        self.threshold = threshold
+        self.retry_after = retry_after
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            # A probe that never reported back is retried after the same wait.
+            if time.monotonic() - self.opened_at >= self.retry_after:
+                self.state = HALF_OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def succeeded(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def failed(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class LocalLRU:
+    """A bounded dict of values that each expire after their own TTL."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoTierCache(BaseCache):
+    """
+    A short-lived, per-process L1 in front of a shared L2 cache backend,
+    normally ``django_redis``.
+
+    Reads are served from L1 for up to ``L1_TIMEOUT`` seconds, so a value
+    another worker deletes or replaces can be seen for that long. ``add``,
+    ``incr`` and ``decr`` always go to L2, which keeps locks and counters
+    atomic. Every L2 call goes through a circuit breaker: once L2 is down,
+    calls fall through to L1 straight away instead of waiting on a socket
+    timeout each time.
+
+    L2 must raise its errors for the breaker to see them, so leave
+    ``IGNORE_EXCEPTIONS`` off in its options.
+    """
+
+    def __init__(self, location, params):
+        options = params.get('OPTIONS', {})
+        super(TwoTierCache, self).__init__(params)
+
+        l2_params = dict(params, OPTIONS=options.get('L2_OPTIONS', {}))
+        self.l2 = import_string(options['L2_BACKEND'])(location, l2_params)
+        self.l1 = LocalLRU(options.get('L1_MAX_ENTRIES', 1000))
+        self.l1_timeout = options.get('L1_TIMEOUT', 5)
+        self.breaker = CircuitBreaker(
+            options.get('FAILURE_THRESHOLD', 3),
+            options.get('RETRY_AFTER', 10),
+        )
+        self.counters = Counter()
+
+    def stats(self):
+        return dict(self.counters, breaker=self.breaker.state)
+
+    def _call_l2(self, method, *args, **kwargs):
+        """Return ``(True, result)`` from L2, or ``(False, None)`` if it failed or was skipped."""
+        if not self.breaker.allow():
+            self.counters['l2_skipped'] += 1
+            return False, None
+        try:
+            result = (method if callable(method) else getattr(self.l2, method))(*args, **kwargs)
+        except Exception:
+            self.counters['l2_errors'] += 1
+            self.breaker.failed()
+            return False, None
+        self.breaker.succeeded()
+        return True, result
+
+    def _l1_ttl(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return self.l1_timeout if timeout is None else min(self.l1_timeout, max(timeout - time.time(), 0))
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_key(key, version)
+        entry = self.l1.get(l1_key)
+        record_cache_lookup('l1', entry is not None)
+        if entry is not None:
+            self.counters['l1_hits'] += 1
+            return entry[0]
+
+        sentinel = object()
+        ok, value = self._call_l2('get', key, sentinel, version=version)
+        if not ok or value is sentinel:
+            self.counters['misses'] += 1
+            record_cache_lookup('l2', False)
+            return default
+
+        self.counters['l2_hits'] += 1
+        record_cache_lookup('l2', True)
+        self.l1.set(l1_key, value, self.l1_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._call_l2('set', key, value, timeout, version=version)
+        self.l1.set(self.make_key(key, version), value, self._l1_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        ok, added = self._call_l2('add', key, value, timeout, version=version)
+        if ok:
+            if added:
+                self.l1.delete(self.make_key(key, version))
+            return added
+        # Without L2 there is nothing shared to lock on; let the caller go ahead.
+        return True
+
+    def delete(self, key, version=None):
+        self.l1.delete(self.make_key(key, version))
+        self._call_l2('delete', key, version=version)
+
+    def compare_and_delete(self, key, value, version=None):
+        self.l1.delete(self.make_key(key, version))
+        ok, deleted = self._call_l2(partial(compare_and_delete, self.l2), key, value, version=version)
+        return ok and deleted
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(self.make_key(key, version))
+        ok, value = self._call_l2('incr', key, delta, version=version)
+        if not ok:
+            raise ValueError("Key '%s' not found" % key)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def has_key(self, key, version=None):
+        sentinel = object()
+        return self.get(key, sentinel, version=version) is not sentinel
+
+    def clear(self):
+        self.l1.clear()
+        self._call_l2('clear')
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
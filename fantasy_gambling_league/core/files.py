@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.files.storage import get_storage_class
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class PrivateStorage:
+    """
+    The ``PRIVATE_FILE_STORAGE`` backend, for files only staff should read.
+
+    The backend is created on first use, like ``default_storage``, so that
+    importing models does not import boto3, and migrations record this
+    class rather than whichever backend is configured.
+    """
+    _storage = None
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if self._storage is None:
+            self._storage = get_storage_class(settings.PRIVATE_FILE_STORAGE)()
+        return getattr(self._storage, name)
+
+
+private_storage = PrivateStorage()
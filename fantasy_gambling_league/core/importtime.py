@@ -0,0 +1,45 @@
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+# What a worker does before it can serve its first request.
+STARTUP = (
+    'import django; django.setup(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns'
+)
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+ImportTiming = namedtuple('ImportTiming', ['module', 'self_us', 'cumulative_us', 'depth'])
+
+
+def parse_importtime(lines):
+    """Parse the ``python -X importtime`` report into ``ImportTiming`` rows."""
+    timings = []
+    for line in lines:
+        match = IMPORT_LINE.match(line.rstrip('\n'))
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def profile_startup(settings_module, code=STARTUP, environ=None):
+    """
+    Start a fresh interpreter with ``settings_module``, run ``code`` under
+    ``-X importtime`` and return its import timings.
+
+    Raises ``subprocess.CalledProcessError`` if the interpreter fails, for
+    example when the settings need environment variables that are not set.
+    """
+    env = dict(os.environ if environ is None else environ, DJANGO_SETTINGS_MODULE=settings_module)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return parse_importtime(process.stderr.splitlines())
@@ -0,0 +1,104 @@
+import re
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
+from django.utils import formats, timezone
+from django.utils.translation import gettext, ngettext
+from jinja2 import Environment
+
+# Values that every built-in path converter except ``int`` accepts as they
+# are and that ``reverse`` would not quote.
+URL_SAFE = re.compile(r'[-a-zA-Z0-9_]+\Z')
+INT_PLACEHOLDER = 987654321000
+
+_patterns = {}
+
+
+def _placeholder(position, value):
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return str(INT_PLACEHOLDER + position)
+    if isinstance(value, str) and URL_SAFE.match(value):
+        return 'urlplaceholder{}x'.format(position)
+    return None
+
+
+def _pattern(viewname, args, kwargs, placeholders):
+    names = sorted(kwargs)
+    try:
+        url = reverse(
+            viewname,
+            args=placeholders[:len(args)],
+            kwargs=dict(zip(names, placeholders[len(args):])),
+        )
+    except NoReverseMatch:
+        return None
+
+    pattern = url.replace('{', '{{').replace('}', '}}')
+    for position, placeholder in enumerate(placeholders):
+        if pattern.count(placeholder) != 1:
+            return None
+        pattern = pattern.replace(placeholder, '{%d}' % position)
+    return pattern
+
+
+def url(viewname, *args, **kwargs):
+    """
+    Reverse a URL like ``{% url %}``, but resolve each URL pattern only once.
+
+    The first call for a view and set of argument names reverses it with
+    placeholders and keeps the result as a format string; later calls just
+    format their values into it, trusting them to suit their converters as
+    slugs and IDs from the database do. Values that would need quoting go
+    through ``reverse`` every time.
+    """
+    values = list(args) + [kwargs[name] for name in sorted(kwargs)]
+    placeholders = [_placeholder(position, value) for position, value in enumerate(values)]
+    if None in placeholders:
+        return reverse(viewname, args=args, kwargs=kwargs)
+
+    key = (
+        get_urlconf(),
+        get_script_prefix(),
+        viewname,
+        len(args),
+        tuple(sorted(kwargs)),
+        tuple(type(value) for value in values),
+    )
+    if key not in _patterns:
+        _patterns[key] = _pattern(viewname, args, kwargs, placeholders)
+
+    pattern = _patterns[key]
+    if pattern is None:
+        return reverse(viewname, args=args, kwargs=kwargs)
+    return pattern.format(*values)
+
+
+@receiver(setting_changed)
+def clear_url_patterns(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _patterns.clear()
+
+
+def format_datetime(value, format_name='DATETIME_FORMAT'):
+    """Format like the Django engine would print a datetime, in the current time zone."""
+    if value is None:
+        return ''
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return formats.date_format(value, format_name)
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update({
+        'static': static,
+        'url': url,
+        '_': gettext,
+        'ngettext': ngettext,
+    })
+    env.filters.update({
+        'datetime': format_datetime,
+    })
+    return env
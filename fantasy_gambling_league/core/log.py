@@ -0,0 +1,145 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+REQUEST_ID_HEADER = 'HTTP_X_REQUEST_ID'
+# Accept an upstream proxy's request ID only if it is short and plain.
+VALID_REQUEST_ID = re.compile(r'[-\w]{1,64}\Z')
+
+_local = threading.local()
+
+
+def get_request_id():
+    return getattr(_local, 'request_id', None)
+
+
+class RequestIDMiddleware:
+    """
+    Tag the request, its log records and its response with a correlation
+    ID, reusing the ``X-Request-ID`` a proxy sent if there is one.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.META.get(REQUEST_ID_HEADER, '')
+        if not VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        request.request_id = _local.request_id = request_id
+        try:
+            response = self.get_response(request)
+        finally:
+            _local.request_id = None
+
+        response['X-Request-ID'] = request_id
+        return response
+
+
+class RequestIDFilter(logging.Filter):
+    """Stamp records with the current request's ID, in the thread that logged them."""
+
+    def filter(self, record):
+        record.request_id = get_request_id()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, for the log shipper to parse."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if getattr(record, 'status_code', None):
+            entry['status_code'] = record.status_code
+        request = getattr(record, 'request', None)
+        if request is not None and hasattr(request, 'path'):
+            entry.update({'method': request.method, 'path': request.path})
+        if record.exc_info:
+            entry['exception'] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Put records on an in-memory queue for a background ``QueueListener`` to
+    pass on to ``handlers``, so writing logs and mailing admins never holds
+    up the thread that logged.
+
+    In ``LOGGING`` name the target handlers as ``'cfg://handlers.<name>'``;
+    they are looked up when the first record is logged, once configuration
+    has finished. A process forked from one that already logged starts its
+    own listener. Records that arrive while the queue is full are dropped
+    and counted rather than blocking.
+    """
+
+    def __init__(self, handlers, queue_size=10000):
+        super(QueueLogHandler, self).__init__(queue.Queue(queue_size))
+        self.targets = handlers
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Index rather than iterate, so dictConfig's list resolves each 'cfg://'.
+            handlers = [self.targets[i] for i in range(len(self.targets))]
+            if not all(isinstance(handler, logging.Handler) for handler in handlers):
+                raise ValueError('QueueLogHandler targets must be configured handlers')
+
+            # A forked child inherits the parent's queue but not its thread.
+            self.queue = queue.Queue(self.queue.maxsize)
+            self._listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.stop)
+
+    def stop(self):
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def prepare(self, record):
+        """
+        Unlike ``QueueHandler.prepare``, keep ``exc_info`` and any attached
+        request, which the JSON formatter and ``AdminEmailHandler`` need, and
+        only fix the message so later changes to its arguments do not show.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self.start()
+        super(QueueLogHandler, self).emit(record)
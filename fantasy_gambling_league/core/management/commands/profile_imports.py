@@ -0,0 +1,47 @@
+import os
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...importtime import profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        'Report the import time of each module when starting Django with the given settings modules '
+        '(needs Python 3.7 or later for -X importtime)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'settings_modules',
+            nargs='*',
+            help='Settings modules to profile, such as config.settings.production; defaults to the current one',
+        )
+        parser.add_argument('--top', type=int, default=25, help='How many of the slowest imports to list')
+
+    def handle(self, *args, **options):
+        settings_modules = options['settings_modules'] or [os.environ['DJANGO_SETTINGS_MODULE']]
+
+        for settings_module in settings_modules:
+            try:
+                timings = profile_startup(settings_module)
+            except subprocess.CalledProcessError as error:
+                output = [line for line in error.stderr.splitlines() if not line.startswith('import time:')]
+                raise CommandError('Could not start with {}:\n{}'.format(settings_module, '\n'.join(output[-20:])))
+
+            top_level = [timing for timing in timings if timing.depth == 0]
+            total = sum(timing.cumulative_us for timing in top_level)
+
+            self.stdout.write('{}: {} modules imported in {:.0f} ms'.format(
+                settings_module, len(timings), total / 1000,
+            ))
+            self.stdout.write('{:>10} {:>10}  {}'.format('self ms', 'total ms', 'module'))
+            for timing in sorted(timings, key=lambda timing: -timing.cumulative_us)[:options['top']]:
+                self.stdout.write('{:>10.1f} {:>10.1f}  {}{}'.format(
+                    timing.self_us / 1000,
+                    timing.cumulative_us / 1000,
+                    '  ' * timing.depth,
+                    timing.module,
+                ))
+            self.stdout.write('')
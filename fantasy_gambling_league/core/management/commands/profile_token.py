@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from fantasy_gambling_league.users.models import User
+from ...profiling import make_token
+
+
+class Command(BaseCommand):
+    help = 'Print a token that has requests profiled when sent in the X-Profile header'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='The staff user the token is issued to')
+        parser.add_argument('--memory', action='store_true', help='Also trace memory allocations with tracemalloc')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'], is_staff=True)
+        except User.DoesNotExist:
+            raise CommandError('No staff user named {}'.format(options['username']))
+
+        self.stdout.write(make_token(user, memory=options['memory']))
+        self.stderr.write('Valid for {} minutes while {} stays staff.'.format(
+            settings.PROFILE_TOKEN_MAX_AGE // 60, user.username,
+        ))
@@ -0,0 +1,91 @@
+import logging
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connections
+
+from ...tasks import discover, requeue_stale, run_pending, worker_id
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for tasks left running by workers that died.
+REQUEUE_INTERVAL = 60
+
+
+def work(stop, poll_interval, burst):
+    """
+    Run due tasks one at a time, then wait until more may be due, until
+    ``stop`` is set, which is checked before each task. Every
+    ``REQUEUE_INTERVAL`` seconds, tasks left running by workers that died
+    are queued again.
+    """
+    worker = worker_id()
+    requeued_at = None
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            if requeued_at is None or time.monotonic() - requeued_at >= REQUEUE_INTERVAL:
+                requeued = requeue_stale()
+                requeued_at = time.monotonic()
+                if requeued:
+                    logger.warning('Requeued %d tasks left running by stopped workers', requeued)
+            if run_pending(worker, limit=1):
+                continue
+            if burst:
+                break
+        except DatabaseError:
+            # Such as a lost connection, or SQLite refusing a concurrent write.
+            logger.warning('Worker %s could not claim a task', worker, exc_info=True)
+            connections.close_all()
+        stop.wait(poll_interval)
+    connections.close_all()
+
+
+def work_in_child(stop, poll_interval, burst):
+    # Signals sent to the whole process group are left to the parent, which
+    # sets stop so no task is cut off half way.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    work(stop, poll_interval, burst)
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks in one or more worker processes until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Worker processes to run')
+        parser.add_argument('--poll-interval', type=float, default=1, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--burst', action='store_true', help='Exit once no tasks are due')
+
+    def handle(self, *args, **options):
+        discover()
+        stop = multiprocessing.Event()
+
+        def shutdown(signum, frame):
+            self.stderr.write('Stopping once the running tasks finish')
+            stop.set()
+
+        worker_args = (stop, options['poll_interval'], options['burst'])
+        if options['processes'] == 1:
+            previous = signal.signal(signal.SIGTERM, shutdown)
+            try:
+                work(*worker_args)
+            finally:
+                signal.signal(signal.SIGTERM, previous)
+            return
+
+        # Children must open their own database connections.
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=work_in_child, args=worker_args)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        for process in processes:
+            process.join()
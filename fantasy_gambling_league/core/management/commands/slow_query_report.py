@@ -0,0 +1,41 @@
+from django.core.mail import mail_admins
+from django.core.management.base import BaseCommand
+
+from ...slowqueries import report, reset
+
+
+class Command(BaseCommand):
+    help = 'Report the slow queries recorded since the last reset, grouped by normalized SQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='How many query shapes to list')
+        parser.add_argument('--mail', action='store_true', help='Email the report to the site admins')
+        parser.add_argument('--reset', action='store_true', help='Start a new report once this one is done')
+
+    def format_entry(self, entry):
+        lines = [
+            '{count} x {average:.0f} ms average, {max:.0f} ms max, {total:.1f} s total [{fingerprint}]'.format(
+                count=entry['count'],
+                average=entry['total'] / entry['count'] * 1000,
+                max=entry['max'] * 1000,
+                total=entry['total'],
+                fingerprint=entry['fingerprint'],
+            ),
+            '    ' + entry['sql'],
+        ]
+        lines.extend('    from ' + site for site in entry['call_sites'])
+        lines.extend('    plan: ' + line for line in entry['plan'] or ())
+        return '\n'.join(lines)
+
+    def handle(self, *args, **options):
+        entries = report()
+        if entries:
+            text = '\n\n'.join(self.format_entry(entry) for entry in entries[:options['top']])
+        else:
+            text = 'No slow queries recorded.'
+        self.stdout.write(text)
+
+        if options['mail'] and entries:
+            mail_admins('{} slow queries'.format(len(entries)), text)
+        if options['reset']:
+            reset()
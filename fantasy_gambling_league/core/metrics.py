@@ -0,0 +1,102 @@
+import os
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Label for requests that did not resolve to a view, such as 404s.
+UNRESOLVED = '<unresolved>'
+
+REQUEST_LATENCY = Histogram(
+    'fgl_request_duration_seconds',
+    'Time taken to respond to a request, by resolved view name.',
+    ['view', 'method', 'status'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'fgl_request_db_queries',
+    'Database queries made while handling a request.',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUEST_QUERY_TIME = Histogram(
+    'fgl_request_db_seconds',
+    'Time spent in database queries while handling a request.',
+    ['view'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+# Hit ratio: rate of result="hit" over the rate of all results, per cache.
+CACHE_LOOKUPS = Counter(
+    'fgl_cache_lookups_total',
+    'Cache lookups, by cache and whether they found a value.',
+    ['cache', 'result'],
+)
+
+
+def multiprocess_dir():
+    # The pinned prometheus_client only reads the lower case name, when it is
+    # imported, so metrics are only written to files when this is set.
+    return os.environ.get('prometheus_multiproc_dir')
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+class QueryRecorder:
+    """An ``execute_wrapper`` counting and timing every query it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """Observe each request's latency and database use under its view name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNRESOLVED
+        REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(duration)
+        REQUEST_QUERIES.labels(view).observe(queries.count)
+        REQUEST_QUERY_TIME.labels(view).observe(queries.duration)
+        return response
+
+
+def registry():
+    """
+    The registry to expose: with a multiprocess directory, one that sums the
+    files every gunicorn worker writes there, otherwise this process's own.
+    """
+    path = multiprocess_dir()
+    if not path:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry, path=path)
+    return collector_registry
+
+
+def render():
+    """Return the metrics in the Prometheus text format, with its content type."""
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
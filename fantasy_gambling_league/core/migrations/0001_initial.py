@@ -0,0 +1,37 @@
+# Generated by Django 2.0.10 on 2026-10-19 02:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import fantasy_gambling_league.core.files
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileCapture',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=2000)),
+                ('view_name', models.CharField(blank=True, max_length=255)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration', models.FloatField()),
+                ('profile', models.FileField(storage=fantasy_gambling_league.core.files.PrivateStorage(), upload_to='profiles/')),
+                ('allocations', models.FileField(blank=True, storage=fantasy_gambling_league.core.files.PrivateStorage(), upload_to='profiles/')),
+                ('summary', models.TextField()),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+    ]
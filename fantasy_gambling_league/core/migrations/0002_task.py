@@ -0,0 +1,37 @@
+# Generated by Django 2.0.10 on 2026-10-19 02:43
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('arguments', models.TextField(default='{}')),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3)),
+                ('last_error', models.TextField(blank=True)),
+                ('locked_by', models.CharField(blank=True, max_length=255)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', '-priority', 'run_at'], name='task_claim_idx'),
+        ),
+    ]
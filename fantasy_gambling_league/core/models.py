@@ -0,0 +1,70 @@
+from django.db import models
+from django.utils import timezone
+
+from fantasy_gambling_league.users.models import User
+from .files import private_storage
+
+
+class ProfileCapture(models.Model):
+    """A single request profiled on demand by ``ProfilingMiddleware``."""
+    created = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        User,
+        null=True,
+        on_delete=models.SET_NULL,
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2000)
+    view_name = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration = models.FloatField()
+    # cProfile output, readable with pstats or snakeviz.
+    profile = models.FileField(upload_to='profiles/', storage=private_storage)
+    allocations = models.FileField(upload_to='profiles/', blank=True, storage=private_storage)
+    summary = models.TextField()
+
+    class Meta:
+        ordering = ['-created']
+
+    def __str__(self):
+        return '{} {} ({:.0f} ms)'.format(self.method, self.path, self.duration * 1000)
+
+
+class Task(models.Model):
+    """A call to a function registered with ``core.tasks.task``, run by the ``run_tasks`` worker."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    name = models.CharField(max_length=255)
+    # JSON object with 'args' and 'kwargs'.
+    arguments = models.TextField(default='{}')
+    # Higher runs first.
+    priority = models.SmallIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # When a worker still running the task is assumed to have died.
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Matches the worker's claim query.
+            models.Index(fields=['status', '-priority', 'run_at'], name='task_claim_idx'),
+        ]
+
+    def __str__(self):
+        return '{} ({})'.format(self.name, self.status)
@@ -0,0 +1,155 @@
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from fantasy_gambling_league.users.models import User
+
+logger = logging.getLogger(__name__)
+
+SALT = 'fantasy_gambling_league.core.profiling'
+QUERY_FLAG = 'profile'
+HEADER = 'HTTP_X_PROFILE'
+SUMMARY_LINES = 40
+TOP_ALLOCATIONS = 50
+TRACEMALLOC_FRAMES = 10
+
+# cProfile only sees the thread it runs in, and tracemalloc is process-wide,
+# so profile one request per process at a time.
+_lock = threading.Lock()
+
+
+def make_token(user, memory=False):
+    """A token that lets ``user``, while still staff, have requests profiled."""
+    return signing.dumps({'user': user.pk, 'memory': memory}, salt=SALT)
+
+
+def requested_profile(request):
+    """
+    Return ``(user, memory)`` if the request carries a valid token from a
+    staff user, otherwise ``None``.
+
+    Send the token in the ``X-Profile`` header. The ``profile`` query
+    parameter works too, for quick checks from a browser, but leaves the
+    token in access logs until it expires.
+    """
+    token = request.META.get(HEADER) or request.GET.get(QUERY_FLAG)
+    if not token:
+        return None
+    try:
+        claims = signing.loads(token, salt=SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
+    user = User.objects.filter(pk=claims['user'], is_staff=True, is_active=True).first()
+    if user is None:
+        return None
+    return user, claims['memory']
+
+
+def summarize(profiler):
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(SUMMARY_LINES)
+    return stream.getvalue()
+
+
+def top_allocations(snapshot):
+    statistics = snapshot.statistics('traceback')[:TOP_ALLOCATIONS]
+    lines = []
+    for stat in statistics:
+        lines.append('{:.1f} KiB in {} blocks'.format(stat.size / 1024, stat.count))
+        lines.extend('    ' + line for line in stat.traceback.format())
+    return '\n'.join(lines)
+
+
+def captured_path(request):
+    """The request's path and query, less the ``profile`` token."""
+    query = request.GET.copy()
+    query.pop(QUERY_FLAG, None)
+    return '{}?{}'.format(request.path, query.urlencode()) if query else request.path
+
+
+def save_capture(request, response, user, duration, profiler, snapshot):
+    from .models import ProfileCapture
+
+    profiler.create_stats()
+    # The same format as Profile.dump_stats, so pstats.Stats(path) reads it.
+    # Taken first, as pstats.Stats empties the profiler it reads.
+    stats = marshal.dumps(profiler.stats)
+    name = '{:%Y/%m/%d}/{}'.format(timezone.now(), uuid.uuid4().hex)
+    capture = ProfileCapture(
+        user=user,
+        method=request.method,
+        path=captured_path(request)[:2000],
+        view_name=request.resolver_match.view_name if request.resolver_match else '',
+        status_code=response.status_code,
+        duration=duration,
+        summary=summarize(profiler),
+    )
+    capture.profile.save(name + '.prof', ContentFile(stats), save=False)
+    if snapshot is not None:
+        capture.allocations.save(name + '.txt', ContentFile(top_allocations(snapshot).encode()), save=False)
+    capture.save()
+    return capture
+
+
+class ProfilingMiddleware:
+    """
+    Profile a single request with cProfile, and tracemalloc if asked, when
+    it carries a token from ``make_token`` (see the ``profile_token``
+    command), saving a ``ProfileCapture`` and returning its id in the
+    ``X-Profile-Id`` header.
+
+    Requests without a token only pay for the header and query lookup.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if HEADER not in request.META and QUERY_FLAG not in request.GET:
+            return self.get_response(request)
+
+        requested = requested_profile(request)
+        if requested is None or not _lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            return self.profile(request, *requested)
+        finally:
+            _lock.release()
+
+    def profile(self, request, user, memory):
+        tracing = memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot() if tracing else None
+            if tracing:
+                tracemalloc.stop()
+
+        try:
+            capture = save_capture(request, response, user, duration, profiler, snapshot)
+        except Exception:
+            logger.exception('Could not save profile of %s', request.path)
+        else:
+            response['X-Profile-Id'] = str(capture.pk)
+        return response
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+# KEYS[1]: the bucket. ARGV: refill rate per second, capacity, now, cost.
+# Returns whether the request is allowed and, if not, the seconds to wait.
+TOKEN_BUCKET_SCRIPT = '''
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+'''
+
+
+def parse_rate(rate):
+    """Turn ``'10/m'`` into a capacity of 10 and a refill of 10 tokens per minute."""
+    count, period = rate.split('/')
+    return int(count), int(count) / PERIODS[period]
+
+
+class LocalTokenBucket:
+    """In-process buckets, for tests and single-process development servers."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def take(self, key, capacity, refill, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return True, 0
+            self._buckets[key] = (tokens, now)
+            return False, (cost - tokens) / refill
+
+
+class RedisTokenBucket:
+    """
+    Buckets in Redis, shared by every worker.
+
+    Refill and take happen in one Lua script, so a bucket costs a single
+    round trip per request and concurrent requests cannot both spend the
+    last token. If Redis cannot be reached the request is let through.
+    """
+
+    def __init__(self):
+        import redis
+
+        self.client = redis.StrictRedis.from_url(
+            settings.RATELIMIT_REDIS_URL,
+            socket_timeout=0.1,
+            socket_connect_timeout=0.1,
+        )
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def take(self, key, capacity, refill, cost=1):
+        try:
+            allowed, wait = self.script(keys=[key], args=[refill, capacity, time.time(), cost])
+        except Exception:
+            logger.warning('Rate limiter could not reach Redis, allowing request', exc_info=True)
+            return True, 0
+        return bool(allowed), float(wait)
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.RATELIMIT_BACKEND)()
+
+
+def client_ip(request):
+    """
+    Return the address the outermost of ``RATELIMIT_TRUSTED_PROXIES`` saw
+    the request come from. X-Forwarded-For is read from the right, because
+    the client can put anything at the left.
+    """
+    proxies = settings.RATELIMIT_TRUSTED_PROXIES
+    forwarded = [
+        address.strip() for address in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if address.strip()
+    ]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META['REMOTE_ADDR']
+
+
+def request_key(request, key):
+    if callable(key):
+        return key(request)
+    if key == 'ip':
+        return client_ip(request)
+    if key == 'user':
+        if request.user.is_authenticated:
+            return 'user-{}'.format(request.user.pk)
+        return client_ip(request)
+    if key == 'view':
+        return 'all'
+    raise ValueError('Unknown rate limit key {!r}'.format(key))
+
+
+def too_many_requests(wait):
+    response = HttpResponse('Too many requests, please try again later.', status=429, content_type='text/plain')
+    response['Retry-After'] = str(max(int(wait + 0.999), 1))
+    return response
+
+
+def ratelimit(rate, key='ip', scope=None, methods=('POST', )):
+    """
+    Limit a view to ``rate`` requests, like ``'10/m'``, per ``key``: the
+    client IP, the user (falling back to the IP for anonymous users), the
+    whole view, or a callable taking the request.
+
+    Requests over the limit get a 429 before the view runs. Only requests
+    using one of ``methods`` are counted; pass ``None`` to count them all.
+    """
+    capacity, refill = parse_rate(rate)
+
+    def decorator(view):
+        view_scope = scope or '{}.{}'.format(view.__module__, view.__qualname__)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLE and (methods is None or request.method in methods):
+                bucket = 'ratelimit:{}:{}'.format(view_scope, request_key(request, key))
+                allowed, wait = get_backend().take(bucket, capacity, refill)
+                if not allowed:
+                    return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
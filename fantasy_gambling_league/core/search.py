@@ -0,0 +1,170 @@
+import threading
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+
+# Mirrors pg_trgm: lower-cased, padded with blanks, three character grams.
+NGRAM_SIZE = 3
+
+
+def ngrams(text, padded=True):
+    text = text.lower()
+    if padded:
+        text = '  {} '.format(text)
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def similarity(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+class NgramIndex:
+    """
+    In-memory inverted index from trigrams to keys.
+
+    Substring matches are answered by intersecting the posting lists of the
+    query's trigrams and ranked by trigram similarity, which is what the
+    Postgres ``ILIKE`` plus ``similarity()`` path does with a GIN index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = defaultdict(set)
+        self._documents = {}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, key, texts):
+        texts = [text.lower() for text in texts if text]
+        grams = [ngrams(text) for text in texts]
+
+        with self._lock:
+            self._remove(key)
+            self._documents[key] = (texts, grams)
+            for gram in set().union(*grams):
+                self._postings[gram].add(key)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+
+        for gram in set().union(*document[1]):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def search(self, query, limit=None):
+        query = query.lower()
+        query_grams = ngrams(query)
+
+        with self._lock:
+            if len(query) >= NGRAM_SIZE:
+                postings = sorted(
+                    (self._postings.get(gram, set()) for gram in ngrams(query, padded=False)),
+                    key=len,
+                )
+                candidates = set.intersection(*postings)
+            else:
+                candidates = self._documents.keys()
+
+            ranked = []
+            for key in candidates:
+                texts, grams = self._documents[key]
+                if any(query in text for text in texts):
+                    rank = max(similarity(query_grams, text_grams) for text_grams in grams)
+                    ranked.append((rank, key))
+
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [key for _, key in ranked[:limit]]
+
+
+class ModelSearch:
+    """
+    Ranked substring search over some text fields of a model.
+
+    On Postgres the lookup is an ``ILIKE`` served by the ``gin_trgm_ops``
+    indexes, ranked by ``similarity()``. Other databases fall back to a
+    process-local ``NgramIndex``, built lazily and kept current by signals.
+    """
+
+    registry = []
+
+    def __init__(self, model, fields, limit=50):
+        self.model = model
+        self.fields = fields
+        self.limit = limit
+        self._index = None
+        self._build_lock = threading.Lock()
+
+        uid = 'search-{}'.format(model._meta.label_lower)
+        post_save.connect(self._handle_save, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(self._handle_delete, sender=model, weak=False, dispatch_uid=uid)
+        self.registry.append(self)
+
+    def search(self, query, queryset=None):
+        query = query.strip()
+        if queryset is None:
+            queryset = self.model._default_manager.all()
+        if not query:
+            return queryset.none()
+
+        matches = reduce(or_, (Q(**{field + '__icontains': query}) for field in self.fields))
+        if connection.vendor == 'postgresql':
+            return self._search_postgres(query, queryset.filter(matches))
+        return self._search_index(query, queryset.filter(matches))
+
+    def reset(self):
+        self._index = None
+
+    def _search_postgres(self, query, queryset):
+        similarities = [TrigramSimilarity(field, query) for field in self.fields]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+        return queryset.annotate(search_rank=rank).order_by('-search_rank', 'pk')[:self.limit]
+
+    def _search_index(self, query, queryset):
+        keys = self._get_index().search(query, limit=self.limit)
+        if not keys:
+            return queryset.none()
+
+        # Filtering on the match again drops rows that were indexed and then
+        # rolled back, so a stale index can only ever return fewer rows.
+        rank = Case(
+            *[When(pk=key, then=Value(len(keys) - position)) for position, key in enumerate(keys)],
+            output_field=IntegerField()
+        )
+        return queryset.filter(pk__in=keys).annotate(search_rank=rank).order_by('-search_rank')
+
+    def _get_index(self):
+        if self._index is None:
+            with self._build_lock:
+                if self._index is None:
+                    index = NgramIndex()
+                    rows = self.model._default_manager.values_list('pk', *self.fields)
+                    for row in rows.iterator():
+                        index.add(row[0], row[1:])
+                    self._index = index
+        return self._index
+
+    def _handle_save(self, sender, instance, **kwargs):
+        if self._index is not None:
+            self._index.add(instance.pk, [getattr(instance, field) for field in self.fields])
+
+    def _handle_delete(self, sender, instance, **kwargs):
+        if self._index is not None:
+            self._index.remove(instance.pk)
@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames in these files are execute wrappers, never the caller.
+WRAPPER_FILES = {os.path.join(PACKAGE_DIR, 'core', name) for name in ('slowqueries.py', 'metrics.py')}
+
+KEY_PREFIX = 'slowquery'
+# How many slots have been handed out, each holding the key of one entry.
+SLOTS_KEY = '{}:slots'.format(KEY_PREFIX)
+SLOT_KEY = '{}:slot:{{}}'.format(KEY_PREFIX)
+MAX_CALL_SITES = 5
+EXPLAIN_PREFIXES = {'sqlite': 'EXPLAIN QUERY PLAN', 'postgresql': 'EXPLAIN', 'mysql': 'EXPLAIN'}
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%s|\?')
+IN_LIST = re.compile(r'\bIN \((?:\?(?:, )?)+\)', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+_local = threading.local()
+
+
+def normalize(sql):
+    """Reduce ``sql`` to its shape, so queries differing only in values compare equal."""
+    sql = STRING.sub('?', sql)
+    sql = NUMBER.sub('?', sql)
+    sql = PLACEHOLDER.sub('?', sql)
+    sql = WHITESPACE.sub(' ', sql).strip()
+    return IN_LIST.sub('IN (...)', sql)
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize(sql).encode()).hexdigest()[:16]
+
+
+def call_site():
+    """The innermost frame in our own code below the database call, as ``file:line in function``."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(PACKAGE_DIR + os.sep) and filename not in WRAPPER_FILES:
+            return '{}:{} in {}'.format(os.path.relpath(filename, PACKAGE_DIR), frame.lineno, frame.name)
+    return None
+
+
+def explain(connection, sql, params):
+    """Return the plan for a SELECT as lines of text, or ``None`` if it cannot be explained."""
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+
+    _local.explaining = True
+    try:
+        # A savepoint keeps a failed EXPLAIN from breaking the caller's transaction.
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute('{} {}'.format(prefix, sql), params)
+            return [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+    except DatabaseError:
+        logger.debug('Could not explain slow query', exc_info=True)
+        return None
+    finally:
+        _local.explaining = False
+
+
+def _register(key):
+    """
+    Give a new entry a slot of its own for ``report`` to find it by. Slots
+    come from an atomic ``incr``, so entries seen by different workers at
+    once don't overwrite each other the way a shared list would.
+    """
+    # The count never expires, so a slot isn't handed out again while it
+    # may still hold an entry.
+    cache.add(SLOTS_KEY, 0, None)
+    return cache.incr(SLOTS_KEY)
+
+
+def record(connection, sql, params, duration, explainable=True):
+    """
+    Add a slow query to the report under its fingerprint, logging it and,
+    if ``SLOW_QUERY_EXPLAIN`` is set, its plan the first time it is seen.
+
+    Each shape is only added once, by whichever worker's ``cache.add`` wins.
+    Its count and timings are then updated read-modify-write, so concurrent
+    workers can lose each other's counts; they are a guide, not a tally.
+    """
+    shape = fingerprint(sql)
+    key = '{}:{}'.format(KEY_PREFIX, shape)
+    timeout = settings.SLOW_QUERY_REPORT_TIMEOUT
+    site = call_site()
+    now = timezone.now()
+    entry = cache.get(key)
+
+    if entry is None:
+        plan = explain(connection, sql, params) if explainable and settings.SLOW_QUERY_EXPLAIN else None
+        new = {
+            'fingerprint': shape,
+            'sql': normalize(sql),
+            'example': sql,
+            'count': 0,
+            'total': 0.0,
+            'max': 0.0,
+            'call_sites': [],
+            'plan': plan,
+            'first_seen': now,
+        }
+        if cache.add(key, new, timeout):
+            new['slot'] = _register(key)
+            logger.warning(
+                'Slow query (%.0f ms) from %s: %s%s',
+                duration * 1000, site or 'unknown caller', sql,
+                ''.join('\n    ' + line for line in plan or ()),
+            )
+            entry = new
+        else:
+            # Another worker added it first.
+            entry = cache.get(key, new)
+
+    entry['count'] += 1
+    entry['total'] += duration
+    entry['max'] = max(entry['max'], duration)
+    entry['last_seen'] = now
+    if site and site not in entry['call_sites'] and len(entry['call_sites']) < MAX_CALL_SITES:
+        entry['call_sites'].append(site)
+    cache.set(key, entry, timeout)
+    # Renewed with the entry, so the slot lasts as long as it does.
+    if 'slot' in entry:
+        cache.set(SLOT_KEY.format(entry['slot']), key, timeout)
+
+
+def _slot_keys():
+    return [SLOT_KEY.format(slot) for slot in range(1, (cache.get(SLOTS_KEY) or 0) + 1)]
+
+
+def report():
+    """Slow query entries recorded since the last reset, the most total time first."""
+    keys = set(cache.get_many(_slot_keys()).values())
+    return sorted(cache.get_many(list(keys)).values(), key=lambda entry: -entry['total'])
+
+
+def reset():
+    slot_keys = _slot_keys()
+    cache.delete_many(list(cache.get_many(slot_keys).values()) + slot_keys + [SLOTS_KEY])
+
+
+class SlowQueryWrapper:
+    """An ``execute_wrapper`` recording queries slower than ``SLOW_QUERY_THRESHOLD`` seconds."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+
+        threshold = settings.SLOW_QUERY_THRESHOLD
+        if threshold is not None and duration >= threshold and not getattr(_local, 'explaining', False):
+            try:
+                record(self.connection, sql, params, duration, explainable=not many)
+            except Exception:
+                logger.exception('Could not record slow query')
+        return result
+
+
+def install(sender, connection, **kwargs):
+    """``connection_created`` receiver adding the wrapper once to each new connection."""
+    if settings.SLOW_QUERY_THRESHOLD is None:
+        return
+    if not any(isinstance(wrapper, SlowQueryWrapper) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(SlowQueryWrapper(connection))
@@ -0,0 +1,22 @@
+# Only imported through the *_FILE_STORAGE and STATICFILES_STORAGE settings, so
+# boto3 is loaded the first time a file is stored rather than at startup.
+# http://stackoverflow.com/questions/10390244/
+# Full-fledge class: https://stackoverflow.com/a/18046120/104731
+from storages.backends.s3boto3 import S3Boto3Storage
+
+
+class StaticRootS3Boto3Storage(S3Boto3Storage):
+    location = 'static'
+
+
+class MediaRootS3Boto3Storage(S3Boto3Storage):
+    location = 'media'
+    file_overwrite = False
+
+
+class PrivateMediaS3Boto3Storage(S3Boto3Storage):
+    """Files only staff should read, such as profiles, served through expiring signed URLs."""
+    location = 'private'
+    default_acl = 'private'
+    querystring_auth = True
+    file_overwrite = False
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Retries wait RETRY_DELAY, then twice that and so on, up to MAX_RETRY_DELAY.
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+# A task running longer than its stale_after, this by default, is assumed
+# to belong to a worker that died.
+STALE_AFTER = timedelta(hours=1)
+
+registry = {}
+
+
+def task(name=None, priority=0, max_attempts=3, atomic=True, stale_after=STALE_AFTER):
+    """
+    Register a function to be run by the ``run_tasks`` worker, under
+    ``name`` or its dotted path, and give it an ``enqueue`` method taking
+    its arguments. Arguments must be JSON serializable, so pass ids rather
+    than model instances.
+
+    The function runs in a transaction unless ``atomic`` is false, for tasks
+    whose work must be committed as it goes. A run lasting longer than
+    ``stale_after`` is taken to have died and is queued again, so set it
+    well above the longest the task can take.
+
+    Workers import the ``tasks`` module of every installed app, so register
+    tasks there.
+    """
+    def decorator(func):
+        func.task_name = name or '{}.{}'.format(func.__module__, func.__qualname__)
+        func.task_priority = priority
+        func.task_max_attempts = max_attempts
+        func.task_atomic = atomic
+        func.task_stale_after = stale_after
+        func.enqueue = lambda *args, **kwargs: enqueue(func, args, kwargs)
+        registry[func.task_name] = func
+        return func
+    return decorator
+
+
+def enqueue(func, args=(), kwargs=None, priority=None, run_at=None):
+    """
+    Queue ``func`` to run with ``args`` and ``kwargs`` at ``run_at``, or as
+    soon as a worker is free. Inside a transaction the task is only visible
+    to workers once it commits, and is dropped if it rolls back.
+    """
+    return Task.objects.create(
+        name=func.task_name,
+        arguments=json.dumps({'args': list(args), 'kwargs': kwargs or {}}, cls=DjangoJSONEncoder),
+        priority=func.task_priority if priority is None else priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=func.task_max_attempts,
+    )
+
+
+def worker_id():
+    return '{}:{}'.format(socket.gethostname(), os.getpid())
+
+
+def claim(worker, now=None):
+    """
+    Mark the most urgent due task as running by ``worker`` and return it,
+    or ``None`` if none is due. ``SKIP LOCKED`` lets concurrent workers
+    each take a different task without waiting on one another.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        task = (
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.QUEUED, run_at__lte=now)
+            .order_by('-priority', 'run_at', 'pk')
+            .first()
+        )
+        if task is None:
+            return None
+        task.status = Task.RUNNING
+        task.attempts += 1
+        task.locked_by = worker
+        task.locked_at = now
+        func = registry.get(task.name)
+        task.locked_until = now + (func.task_stale_after if func else STALE_AFTER)
+        task.save(update_fields=['status', 'attempts', 'locked_by', 'locked_at', 'locked_until'])
+    return task
+
+
+def retry_delay(attempts):
+    delay = min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    # Jitter keeps tasks that failed together from retrying together.
+    return delay * random.uniform(0.75, 1.25)
+
+
+def run(task):
+    """
+    Call a claimed task's function, in a transaction if it is atomic. A
+    failure is retried with exponential backoff until ``max_attempts`` is
+    reached.
+    """
+    func = registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError('No task registered as {!r}'.format(task.name))
+        arguments = json.loads(task.arguments)
+        if func.task_atomic:
+            with transaction.atomic():
+                func(*arguments['args'], **arguments['kwargs'])
+        else:
+            func(*arguments['args'], **arguments['kwargs'])
+    except Exception:
+        task.last_error = traceback.format_exc()
+        if func is not None and task.attempts < task.max_attempts:
+            task.status = Task.QUEUED
+            task.run_at = timezone.now() + retry_delay(task.attempts)
+            logger.warning('Task %s failed, retrying at %s', task.name, task.run_at, exc_info=True)
+        else:
+            task.status = Task.FAILED
+            task.finished = timezone.now()
+            logger.error('Task %s failed after %d attempts', task.name, task.attempts, exc_info=True)
+    else:
+        task.status = Task.DONE
+        task.finished = timezone.now()
+
+    task.locked_by = ''
+    task.locked_at = None
+    task.locked_until = None
+    task.save(update_fields=['status', 'run_at', 'last_error', 'finished', 'locked_by', 'locked_at', 'locked_until'])
+    return task
+
+
+def requeue_stale(now=None):
+    """
+    Put tasks running past their ``stale_after``, left by a worker that
+    died, back in the queue, or fail them if that was their last attempt.
+    Returns the number requeued.
+    """
+    now = now or timezone.now()
+    stale = Task.objects.filter(status=Task.RUNNING, locked_until__lt=now)
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED,
+        last_error='Worker stopped while running the task',
+        finished=now,
+        locked_by='',
+        locked_at=None,
+        locked_until=None,
+    )
+    return stale.update(status=Task.QUEUED, locked_by='', locked_at=None, locked_until=None)
+
+
+def run_pending(worker=None, limit=None):
+    """Run due tasks until none are left, or ``limit`` have run. Returns the number run."""
+    worker = worker or worker_id()
+    count = 0
+    while limit is None or count < limit:
+        task = claim(worker)
+        if task is None:
+            break
+        run(task)
+        count += 1
+    return count
+
+
+def discover():
+    autodiscover_modules('tasks')
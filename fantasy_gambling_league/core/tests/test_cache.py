@@ -0,0 +1,96 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ..cache import get_fresh, get_or_compute
+
+
+class TestGetOrCompute(SimpleTestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_computes_once_then_cached(self):
+        calls = []
+
+        for _ in range(3):
+            assert get_or_compute('key', lambda: calls.append(1) or 'value', 60, beta=0) == 'value'
+
+        assert len(calls) == 1
+        assert get_fresh('key') == 'value'
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        results = []
+        start = threading.Barrier(20)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        def worker():
+            start.wait()
+            results.append(get_or_compute('hot', compute, 60))
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ['value'] * 20
+
+    def test_stale_served_while_recomputing(self):
+        cache.set('stale', ('old', time.time() - 1, 0.1), 60)
+        computing = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def compute():
+            computing.set()
+            release.wait(5)
+            return 'new'
+
+        recompute = threading.Thread(target=lambda: results.append(get_or_compute('stale', compute, 60)))
+        recompute.start()
+        computing.wait(5)
+
+        assert get_or_compute('stale', lambda: 'other', 60) == 'old'
+
+        release.set()
+        recompute.join()
+        assert results == ['new']
+        assert get_fresh('stale') == 'new'
+
+    @mock.patch('fantasy_gambling_league.core.cache.random.random', return_value=0.5)
+    def test_early_recompute(self, random):
+        cache.set('early', ('old', time.time() + 1, 10.0), 60)
+
+        # A slow computation this close to expiry is refreshed early...
+        assert get_or_compute('early', lambda: 'new', 60, beta=100) == 'new'
+
+        cache.set('early', ('old', time.time() + 1, 10.0), 60)
+        # ...unless early recomputation is switched off.
+        assert get_or_compute('early', lambda: 'new', 60, beta=0) == 'old'
+
+    def test_cold_miss_waits_at_most_lock_wait(self):
+        cache.add('held:lock', 'other worker', 60)
+
+        started = time.monotonic()
+        assert get_or_compute('held', lambda: 'value', 60, lock_wait=0.1) == 'value'
+
+        assert time.monotonic() - started < 1
+
+    def test_lock_taken_over_is_not_released(self):
+        def compute():
+            # The lock expired mid-compute and another worker took it.
+            cache.set('slow:lock', 'other worker', 60)
+            return 'value'
+
+        get_or_compute('slow', compute, 60)
+
+        assert cache.get('slow:lock') == 'other worker'
@@ -0,0 +1,132 @@
+import time
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from ..cache_backends import CLOSED, HALF_OPEN, OPEN, TwoTierCache, compare_and_delete
+
+
+class FlakyCache(LocMemCache):
+    """A local cache that raises like an unreachable Redis while ``down`` is set."""
+    down = False
+
+    def _check(self):
+        if FlakyCache.down:
+            raise ConnectionError('Redis is down')
+
+    def get(self, *args, **kwargs):
+        self._check()
+        return super(FlakyCache, self).get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        self._check()
+        return super(FlakyCache, self).set(*args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        self._check()
+        return super(FlakyCache, self).add(*args, **kwargs)
+
+
+class TestTwoTierCache(SimpleTestCase):
+    def setUp(self):
+        FlakyCache.down = False
+        self.l2_location = 'two-tier-{}'.format(self.id())
+        self.cache = self.make_cache()
+
+    def tearDown(self):
+        FlakyCache.down = False
+        self.cache.clear()
+
+    def make_cache(self, **options):
+        return TwoTierCache(self.l2_location, {'OPTIONS': dict({
+            'L2_BACKEND': 'fantasy_gambling_league.core.tests.test_cache_backends.FlakyCache',
+            'L1_MAX_ENTRIES': 2,
+            'L1_TIMEOUT': 60,
+            'FAILURE_THRESHOLD': 2,
+            'RETRY_AFTER': 0.05,
+        }, **options)})
+
+    def test_reads_through_l1(self):
+        self.cache.set('key', 'value')
+        other_worker = self.make_cache()
+
+        assert other_worker.get('key') == 'value'
+        assert other_worker.get('key') == 'value'
+        assert other_worker.stats() == {'l2_hits': 1, 'l1_hits': 1, 'breaker': CLOSED}
+
+    def test_l1_bounded(self):
+        for key in ('one', 'two', 'three'):
+            self.cache.set(key, key)
+        FlakyCache.down = True
+
+        assert self.cache.get('one') is None
+        assert self.cache.get('three') == 'three'
+
+    def test_l1_expires(self):
+        cache = self.make_cache(L1_TIMEOUT=0.01)
+        cache.set('key', 'value')
+        time.sleep(0.02)
+
+        assert cache.get('key') == 'value'
+        assert cache.stats()['l2_hits'] == 1
+
+    def test_add_goes_to_l2(self):
+        assert self.cache.add('lock', 'me')
+        assert not self.make_cache().add('lock', 'you')
+
+    def test_compare_and_delete(self):
+        self.cache.set('lock', 'mine')
+        other_worker = self.make_cache()
+
+        assert not other_worker.compare_and_delete('lock', 'theirs')
+        assert self.cache.get('lock') == 'mine'
+        assert other_worker.compare_and_delete('lock', 'mine')
+        assert self.make_cache().get('lock') is None
+
+    def test_compare_and_delete_on_redis_is_one_script(self):
+        redis_cache = mock.Mock(spec=['client', 'make_key'])
+        redis_cache.make_key.return_value = ':1:lock'
+        redis_cache.client.encode.return_value = b'encoded'
+        script = redis_cache.client.get_client.return_value.register_script.return_value
+        script.return_value = 1
+
+        assert compare_and_delete(redis_cache, 'lock', 'token')
+        script.assert_called_once_with(keys=[':1:lock'], args=[b'encoded'])
+
+    def test_breaker_opens_and_recovers(self):
+        FlakyCache.down = True
+
+        assert self.cache.get('a') is None
+        assert self.cache.get('b') is None
+        assert self.cache.breaker.state == OPEN
+
+        assert self.cache.get('c') is None
+        assert self.cache.counters['l2_errors'] == 2
+        assert self.cache.counters['l2_skipped'] == 1
+
+        FlakyCache.down = False
+        time.sleep(0.06)
+        self.cache.set('d', 'value')
+        assert self.cache.breaker.state == CLOSED
+
+    def test_one_probe_at_a_time(self):
+        FlakyCache.down = True
+        self.cache.get('a')
+        self.cache.get('b')
+        time.sleep(0.06)
+
+        assert self.cache.breaker.allow()
+        assert self.cache.breaker.state == HALF_OPEN
+        assert not self.cache.breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        FlakyCache.down = True
+        self.cache.get('a')
+        self.cache.get('b')
+        time.sleep(0.06)
+
+        self.cache.get('c')
+
+        assert self.cache.breaker.state == OPEN
+        assert self.cache.counters['l2_errors'] == 3
@@ -0,0 +1,56 @@
+import os
+import sys
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+
+from ..importtime import STARTUP, ImportTiming, parse_importtime, profile_startup
+
+# Heavy modules a worker should not need to import to start.
+DEFERRED = {'boto3', 'botocore', 'storages.backends.s3boto3', 'coreapi', 'debug_toolbar'}
+# -X importtime also lists imports that failed, so check what actually loaded.
+CHECK_DEFERRED = '; import sys; loaded = {!r} & set(sys.modules); assert not loaded, loaded'.format(DEFERRED)
+PRODUCTION_ENVIRON = {
+    'DJANGO_SECRET_KEY': 'secret',
+    'DATABASE_URL': 'sqlite:///:memory:',
+    'REDIS_URL': 'redis://localhost:6379/0',
+    'DJANGO_ADMIN_URL': 'admin/',
+    'DJANGO_ALLOWED_HOSTS': 'example.com',
+    'DJANGO_METRICS_TOKEN': 'token',
+    'DJANGO_AWS_ACCESS_KEY_ID': 'key',
+    'DJANGO_AWS_SECRET_ACCESS_KEY': 'secret',
+    'DJANGO_AWS_STORAGE_BUCKET_NAME': 'bucket',
+    'MAILGUN_API_KEY': 'key',
+    'MAILGUN_DOMAIN': 'example.com',
+}
+
+
+class TestImportTime(SimpleTestCase):
+    def test_parse_importtime(self):
+        timings = parse_importtime([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       120 |        120 |   encodings.utf_8',
+            'import time:      2000 |       2120 | django.conf',
+            'some other output',
+        ])
+
+        assert timings == [
+            ImportTiming('encodings.utf_8', 120, 120, 1),
+            ImportTiming('django.conf', 2000, 2120, 0),
+        ]
+
+    @skipIf(sys.version_info < (3, 7), '-X importtime needs Python 3.7')
+    def test_startup_defers_heavy_imports(self):
+        modules = {timing.module for timing in profile_startup('config.settings.test', code=STARTUP + CHECK_DEFERRED)}
+
+        assert 'fantasy_gambling_league.structure.views' in modules
+
+    @skipIf(sys.version_info < (3, 7), '-X importtime needs Python 3.7')
+    def test_production_settings_do_not_import_boto3(self):
+        timings = profile_startup(
+            'config.settings.production',
+            code='import config.settings.production' + CHECK_DEFERRED,
+            environ=dict(os.environ, **PRODUCTION_ENVIRON),
+        )
+
+        assert 'config.settings.production' in {timing.module for timing in timings}
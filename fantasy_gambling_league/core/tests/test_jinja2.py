@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from ..jinja2 import _patterns, url
+
+
+class TestUrl(SimpleTestCase):
+    def setUp(self):
+        _patterns.clear()
+
+    def test_matches_reverse(self):
+        for number in (1, 2, 38):
+            assert url('structure:detail-gameweek', season_slug='premier-league', number=number) == reverse(
+                'structure:detail-gameweek',
+                kwargs={'season_slug': 'premier-league', 'number': number},
+            )
+        assert url('structure:detail-season', 'la-liga') == reverse('structure:detail-season', args=['la-liga'])
+        assert url('home') == reverse('home')
+
+    def test_pattern_reversed_once(self):
+        url('structure:detail-gameweek', season_slug='premier-league', number=1)
+        url('structure:detail-gameweek', season_slug='serie-a', number=2)
+
+        assert len(_patterns) == 1
+
+    def test_values_needing_quoting_use_reverse(self):
+        assert url('users:detail', 'ann@example.com') == reverse('users:detail', args=['ann@example.com'])
+        assert not _patterns
+
+    def test_converter_mismatch_uses_reverse(self):
+        assert url('structure:detail-gameweek', season_slug='premier-league', number='7') == reverse(
+            'structure:detail-gameweek',
+            kwargs={'season_slug': 'premier-league', 'number': '7'},
+        )
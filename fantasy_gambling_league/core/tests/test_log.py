@@ -0,0 +1,144 @@
+import json
+import logging
+import logging.config
+import sys
+import threading
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from ..log import JSONFormatter, QueueLogHandler, RequestIDFilter, RequestIDMiddleware, get_request_id
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super(ListHandler, self).__init__()
+        self.records = []
+        self.threads = []
+        self.handled = threading.Event()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+        self.handled.set()
+
+
+def make_record(msg='hello %s', args=('world', ), exc_info=None, **extra):
+    record = logging.LogRecord('test', logging.ERROR, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestRequestIDMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def run_middleware(self, **headers):
+        seen = {}
+
+        def view(request):
+            seen['request_id'] = get_request_id()
+            return HttpResponse()
+
+        response = RequestIDMiddleware(view)(self.factory.get('/', **headers))
+        return seen['request_id'], response
+
+    def test_generates_id(self):
+        request_id, response = self.run_middleware()
+
+        assert len(request_id) == 32
+        assert response['X-Request-ID'] == request_id
+        assert get_request_id() is None
+
+    def test_reuses_upstream_id(self):
+        request_id, response = self.run_middleware(HTTP_X_REQUEST_ID='abc-123')
+
+        assert request_id == 'abc-123'
+        assert response['X-Request-ID'] == 'abc-123'
+
+    def test_ignores_invalid_upstream_id(self):
+        request_id, _ = self.run_middleware(HTTP_X_REQUEST_ID='bad id\n')
+
+        assert request_id != 'bad id\n'
+
+
+class TestJSONFormatter(SimpleTestCase):
+    def test_formats_record(self):
+        record = make_record(status_code=500, request=RequestFactory().post('/bets/'))
+        RequestIDFilter().filter(record)
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry['message'] == 'hello world'
+        assert entry['level'] == 'ERROR'
+        assert entry['request_id'] is None
+        assert entry['status_code'] == 500
+        assert (entry['method'], entry['path']) == ('POST', '/bets/')
+
+    def test_includes_exception(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert 'ValueError: boom' in entry['exception']
+
+
+class TestQueueLogHandler(SimpleTestCase):
+    def setUp(self):
+        self.target = ListHandler()
+        self.handler = QueueLogHandler([self.target])
+        self.addCleanup(self.handler.stop)
+
+    def test_hands_records_to_listener_thread(self):
+        self.handler.handle(make_record())
+
+        assert self.target.handled.wait(5)
+        assert self.target.records[0].getMessage() == 'hello world'
+        assert self.target.threads[0] is not threading.current_thread()
+
+    def test_keeps_exc_info_and_request(self):
+        request = RequestFactory().get('/')
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.handler.handle(make_record(exc_info=sys.exc_info(), request=request))
+
+        assert self.target.handled.wait(5)
+        record = self.target.records[0]
+        assert record.exc_info[0] is ValueError
+        assert record.request is request
+
+    def test_drops_records_when_full(self):
+        handler = QueueLogHandler([self.target], queue_size=1)
+        # Not started, so nothing drains the queue.
+        handler.enqueue(make_record())
+        handler.enqueue(make_record())
+
+        assert handler.dropped == 1
+
+    def test_configured_by_dict_config(self):
+        logging.config.dictConfig({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'formatters': {'json': {'()': 'fantasy_gambling_league.core.log.JSONFormatter'}},
+            'handlers': {
+                'target': {'()': lambda: self.target, 'formatter': 'json'},
+                'queue': {
+                    '()': 'fantasy_gambling_league.core.log.QueueLogHandler',
+                    'handlers': ['cfg://handlers.target'],
+                },
+            },
+            'loggers': {'fgl.test': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False}},
+        })
+        logger = logging.getLogger('fgl.test')
+        queue_handler = logger.handlers[0]
+        self.addCleanup(queue_handler.stop)
+        self.addCleanup(logger.removeHandler, queue_handler)
+
+        logger.info('configured')
+
+        assert self.target.handled.wait(5)
+        assert json.loads(self.target.format(self.target.records[0]))['message'] == 'configured'
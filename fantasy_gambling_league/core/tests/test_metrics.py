@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from ..cache import get_or_compute
+from ..metrics import UNRESOLVED, registry
+
+# Observe one request in a fresh process writing to a multiprocess directory.
+OBSERVE = (
+    'import django; django.setup(); '
+    'from fantasy_gambling_league.core.metrics import REQUEST_LATENCY; '
+    "REQUEST_LATENCY.labels('structure:list-seasons', 'GET', '200').observe(0.1)"
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsMiddleware(TestCase):
+    def test_observes_latency_and_queries_by_view_name(self):
+        labels = {'view': 'structure:list-seasons'}
+        requests = sample('fgl_request_duration_seconds_count', method='GET', status='200', **labels)
+        queries = sample('fgl_request_db_queries_sum', **labels)
+
+        response = self.client.get(reverse('structure:list-seasons'))
+
+        assert response.status_code == 200
+        assert sample('fgl_request_duration_seconds_count', method='GET', status='200', **labels) == requests + 1
+        assert sample('fgl_request_db_queries_sum', **labels) > queries
+        assert sample('fgl_request_db_seconds_count', **labels) > 0
+
+    def test_unresolved_requests_share_a_label(self):
+        before = sample('fgl_request_duration_seconds_count', view=UNRESOLVED, method='GET', status='404')
+
+        self.client.get('/no/such/page/')
+
+        assert sample('fgl_request_duration_seconds_count', view=UNRESOLVED, method='GET', status='404') == before + 1
+
+
+class TestCacheLookups(SimpleTestCase):
+    def test_counts_hits_and_misses_by_key_prefix(self):
+        hits = sample('fgl_cache_lookups_total', cache='test:metrics', result='hit')
+        misses = sample('fgl_cache_lookups_total', cache='test:metrics', result='miss')
+
+        get_or_compute('test:metrics:1', lambda: 1, 60)
+        get_or_compute('test:metrics:1', lambda: 1, 60)
+
+        assert sample('fgl_cache_lookups_total', cache='test:metrics', result='hit') == hits + 1
+        assert sample('fgl_cache_lookups_total', cache='test:metrics', result='miss') == misses + 1
+
+
+class TestMetricsView(TestCase):
+    def test_prometheus_text_format(self):
+        response = self.client.get(reverse('metrics'))
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert b'# TYPE fgl_request_duration_seconds histogram' in response.content
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_required(self):
+        assert self.client.get(reverse('metrics')).status_code == 403
+        assert self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').status_code == 200
+
+    def test_sums_across_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, prometheus_multiproc_dir=directory)
+            env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+            for _ in range(2):
+                subprocess.run([sys.executable, '-c', OBSERVE], env=env, check=True)
+
+            with mock.patch.dict(os.environ, prometheus_multiproc_dir=directory):
+                count = registry().get_sample_value('fgl_request_duration_seconds_count', {
+                    'view': 'structure:list-seasons', 'method': 'GET', 'status': '200',
+                })
+
+        assert count == 2
@@ -0,0 +1,70 @@
+import pstats
+from io import StringIO
+
+from django.core import signing
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from fantasy_gambling_league.structure.tests.factories import SeasonFactory
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from ..files import private_storage
+from ..models import ProfileCapture
+from ..profiling import make_token
+
+
+class TestProfilingMiddleware(TestCase):
+    def setUp(self):
+        self.staff = UserFactory(is_staff=True)
+        self.season = SeasonFactory(commissioner=self.staff)
+        self.url = reverse('structure:detail-season', kwargs={'slug': self.season.slug})
+
+    def test_unflagged_request_not_profiled(self):
+        response = self.client.get(self.url)
+
+        assert 'X-Profile-Id' not in response
+        assert not ProfileCapture.objects.exists()
+
+    def test_profiles_with_header(self):
+        response = self.client.get(self.url, HTTP_X_PROFILE=make_token(self.staff))
+
+        capture = ProfileCapture.objects.get()
+        assert response['X-Profile-Id'] == str(capture.pk)
+        assert capture.user == self.staff
+        assert capture.view_name == 'structure:detail-season'
+        assert capture.status_code == 200
+        assert 'cumulative' in capture.summary
+        assert not capture.allocations
+        assert pstats.Stats(capture.profile.path).total_calls > 0
+
+    def test_profiles_memory_with_query_flag(self):
+        self.client.get(self.url, {'profile': make_token(self.staff, memory=True), 'page': '2'})
+
+        capture = ProfileCapture.objects.get()
+        assert 'KiB in' in capture.allocations.read().decode()
+        assert capture.path == self.url + '?page=2'
+
+    def test_files_in_private_storage(self):
+        self.client.get(self.url, HTTP_X_PROFILE=make_token(self.staff))
+
+        capture = ProfileCapture.objects.get()
+        assert capture.profile.storage is private_storage
+        assert capture.path == self.url
+
+    def test_ignores_non_staff_and_bad_tokens(self):
+        player = UserFactory()
+        expired = signing.dumps({'user': self.staff.pk, 'memory': False}, salt='another salt')
+
+        self.client.get(self.url, HTTP_X_PROFILE=make_token(player))
+        self.client.get(self.url, HTTP_X_PROFILE=expired)
+        self.client.get(self.url, {'profile': '1'})
+
+        assert not ProfileCapture.objects.exists()
+
+    def test_profile_token_command(self):
+        out = StringIO()
+
+        call_command('profile_token', self.staff.username, stdout=out, stderr=StringIO())
+        self.client.get(self.url, HTTP_X_PROFILE=out.getvalue().strip())
+
+        assert ProfileCapture.objects.count() == 1
@@ -0,0 +1,104 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from ..ratelimit import LocalTokenBucket, client_ip, get_backend, parse_rate, ratelimit
+
+
+@ratelimit('2/m', key='user')
+def view(request):
+    return HttpResponse('ok')
+
+
+class TestLocalTokenBucket(SimpleTestCase):
+    def test_parse_rate(self):
+        assert parse_rate('10/m') == (10, 10 / 60)
+        assert parse_rate('5/h') == (5, 5 / 3600)
+
+    def test_takes_until_empty(self):
+        buckets = LocalTokenBucket()
+
+        assert buckets.take('key', 2, 1) == (True, 0)
+        assert buckets.take('key', 2, 1) == (True, 0)
+        allowed, wait = buckets.take('key', 2, 1)
+        assert not allowed
+        assert 0 < wait <= 1
+
+    def test_refills(self):
+        buckets = LocalTokenBucket()
+        buckets.take('key', 1, 1000)
+        time.sleep(0.01)
+
+        assert buckets.take('key', 1, 1000) == (True, 0)
+
+
+class TestRatelimit(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        get_backend().reset()
+
+    def post(self, user=None, ip='127.0.0.1', **extra):
+        request = self.factory.post('/', REMOTE_ADDR=ip, **extra)
+        request.user = user or AnonymousUser()
+        return view(request)
+
+    def test_over_limit_rejected(self):
+        assert [self.post().status_code for _ in range(3)] == [200, 200, 429]
+        assert int(self.post()['Retry-After']) >= 1
+
+    def test_separate_buckets_per_ip(self):
+        self.post(ip='10.0.0.1')
+        self.post(ip='10.0.0.1')
+
+        assert self.post(ip='10.0.0.2').status_code == 200
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=1)
+    def test_spoofed_forwarded_for_still_limited(self):
+        statuses = [
+            self.post(ip='10.1.1.1', HTTP_X_FORWARDED_FOR='192.0.2.{}, 203.0.113.7'.format(n)).status_code
+            for n in range(3)
+        ]
+
+        assert statuses == [200, 200, 429]
+        assert self.post(ip='10.1.1.1', HTTP_X_FORWARDED_FOR='203.0.113.8').status_code == 200
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=2)
+    def test_short_forwarded_for_uses_remote_addr(self):
+        request = self.factory.post('/', REMOTE_ADDR='10.1.1.1', HTTP_X_FORWARDED_FOR='203.0.113.7')
+
+        assert client_ip(request) == '10.1.1.1'
+        assert client_ip(self.factory.post('/', REMOTE_ADDR='10.1.1.1')) == '10.1.1.1'
+
+    def test_separate_buckets_per_user(self):
+        user = UserFactory.build(pk=1)
+        self.post(user)
+        self.post(user)
+
+        assert self.post(UserFactory.build(pk=2)).status_code == 200
+
+    def test_get_not_counted(self):
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+
+        assert [view(request).status_code for _ in range(3)] == [200, 200, 200]
+
+    @override_settings(RATELIMIT_ENABLE=False)
+    def test_disabled(self):
+        assert [self.post().status_code for _ in range(3)] == [200, 200, 200]
+
+
+class TestLoginRatelimit(TestCase):
+    def test_login_limited_per_ip(self):
+        user = UserFactory()
+        data = {'login': user.username, 'password': 'wrong'}
+
+        statuses = [self.client.post(reverse('account_login'), data).status_code for _ in range(11)]
+
+        assert statuses[:10] == [200] * 10
+        assert statuses[10] == 429
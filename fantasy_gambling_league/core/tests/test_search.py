@@ -0,0 +1,42 @@
+from fantasy_gambling_league.core.search import NgramIndex, ngrams, similarity
+
+
+class TestNgramIndex:
+
+    def setup_method(self):
+        self.index = NgramIndex()
+        self.index.add(1, ['oliver', 'Oliver Lang'])
+        self.index.add(2, ['olive_oil', 'Olive Oyl'])
+        self.index.add(3, ['popeye', ''])
+
+    def test_substring_match(self):
+        assert self.index.search('oliv') == [1, 2]
+        assert self.index.search('LANG') == [1]
+        assert self.index.search('spinach') == []
+
+    def test_short_query_scans_documents(self):
+        assert set(self.index.search('ol')) == {1, 2}
+        assert self.index.search('y') == [2, 3]
+
+    def test_ranked_by_similarity(self):
+        self.index.add(4, ['olive'])
+
+        assert self.index.search('olive')[0] == 4
+
+    def test_limit(self):
+        assert len(self.index.search('o', limit=2)) == 2
+
+    def test_add_replaces_and_remove_forgets(self):
+        self.index.add(3, ['bluto'])
+        assert self.index.search('popeye') == []
+        assert self.index.search('bluto') == [3]
+
+        self.index.remove(3)
+        assert self.index.search('bluto') == []
+        assert len(self.index) == 2
+
+
+def test_similarity_matches_pg_trgm_padding():
+    assert ngrams('ab') == {'  a', ' ab', 'ab '}
+    assert similarity(ngrams('word'), ngrams('word')) == 1.0
+    assert similarity(ngrams('word'), set()) == 0.0
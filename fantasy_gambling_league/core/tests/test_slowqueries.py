@@ -0,0 +1,99 @@
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from fantasy_gambling_league.structure.models import Season
+from ..slowqueries import SLOTS_KEY, SlowQueryWrapper, fingerprint, install, normalize, report
+
+
+class TestFingerprint(SimpleTestCase):
+    def test_normalize(self):
+        assert normalize("SELECT *  FROM t\nWHERE a = 'x''y' AND b IN (1, 2, 3) AND c = %s") == (
+            'SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ?'
+        )
+
+    def test_same_shape_same_fingerprint(self):
+        assert fingerprint('SELECT * FROM t WHERE id IN (1, 2)') == fingerprint('SELECT * FROM t WHERE id IN (3)')
+        assert fingerprint('SELECT * FROM t WHERE id = 1') != fingerprint('SELECT * FROM u WHERE id = 1')
+
+
+@override_settings(SLOW_QUERY_THRESHOLD=0)
+class TestSlowQueryWrapper(TestCase):
+    def query(self, slug):
+        with connection.execute_wrapper(SlowQueryWrapper(connection)):
+            return list(Season.objects.filter(slug=slug))
+
+    def test_records_by_fingerprint_with_call_site(self):
+        self.query('first')
+        self.query('second')
+
+        entries = [entry for entry in report() if 'structure_season' in entry['sql']]
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry['count'] == 2
+        assert entry['plan'] is None
+        assert any(site.startswith('core/tests/test_slowqueries.py:') for site in entry['call_sites'])
+
+    def test_shapes_have_own_slots(self):
+        self.query('first')
+        with connection.execute_wrapper(SlowQueryWrapper(connection)):
+            list(Season.objects.filter(name='first'))
+
+        assert len([entry for entry in report() if 'structure_season' in entry['sql']]) == 2
+        assert cache.get(SLOTS_KEY) == 2
+
+    def test_shape_added_once_by_racing_workers(self):
+        self.query('first')
+        get = cache.get
+        looked = []
+
+        def get_before_other_worker_added(key, default=None):
+            # The first lookup is this worker's, made before the other's add.
+            looked.append(key)
+            return None if len(looked) == 1 else get(key, default)
+
+        with mock.patch.object(cache, 'get', side_effect=get_before_other_worker_added):
+            self.query('second')
+
+        entries = [entry for entry in report() if 'structure_season' in entry['sql']]
+        assert [entry['count'] for entry in entries] == [2]
+        assert cache.get(SLOTS_KEY) == 1
+
+    @override_settings(SLOW_QUERY_EXPLAIN=True)
+    def test_explains_new_queries(self):
+        self.query('first')
+
+        entry = next(entry for entry in report() if 'structure_season' in entry['sql'])
+        assert entry['plan']
+        assert [e for e in report() if e['sql'].startswith('EXPLAIN')] == []
+
+    @override_settings(SLOW_QUERY_THRESHOLD=60)
+    def test_ignores_fast_queries(self):
+        self.query('first')
+
+        assert report() == []
+
+    def test_install_once(self):
+        wrappers = list(connection.execute_wrappers)
+        self.addCleanup(setattr, connection, 'execute_wrappers', wrappers)
+
+        install(None, connection)
+        install(None, connection)
+
+        assert sum(isinstance(wrapper, SlowQueryWrapper) for wrapper in connection.execute_wrappers) == 1
+
+    def test_report_command(self):
+        self.query('first')
+        out = StringIO()
+
+        call_command('slow_query_report', '--mail', '--reset', stdout=out)
+
+        assert '1 x' in out.getvalue()
+        assert 'structure_season' in out.getvalue()
+        assert len(mail.outbox) == 1
+        assert report() == []
@@ -0,0 +1,136 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..management.commands.run_tasks import work
+from ..models import Task
+from ..tasks import claim, enqueue, registry, requeue_stale, run, run_pending, task
+
+calls = []
+stopping = threading.Event()
+
+
+@task(name='tests.record')
+def record(value, suffix=''):
+    calls.append(value + suffix)
+
+
+@task(name='tests.fail', max_attempts=2)
+def fail():
+    raise ValueError('boom')
+
+
+@task(name='tests.stop', priority=5)
+def stop_worker():
+    calls.append('stop')
+    stopping.set()
+
+
+@task(name='tests.slow', stale_after=timedelta(hours=6))
+def slow():
+    pass
+
+
+@task(name='tests.partial', atomic=False, max_attempts=1)
+def partial():
+    Task.objects.create(name='tests.committed')
+    raise ValueError('boom')
+
+
+class TestTasks(TestCase):
+    def setUp(self):
+        calls.clear()
+        stopping.clear()
+
+    def test_enqueue_and_run(self):
+        record.enqueue('a', suffix='!')
+
+        assert run_pending('worker') == 1
+        assert calls == ['a!']
+        assert Task.objects.get().status == Task.DONE
+
+    def test_priority_then_run_at_order(self):
+        now = timezone.now()
+        enqueue(record, ['low'], run_at=now - timedelta(minutes=2))
+        enqueue(record, ['high'], priority=5, run_at=now - timedelta(minutes=1))
+        enqueue(record, ['low later'], run_at=now - timedelta(minutes=1))
+
+        run_pending('worker')
+
+        assert calls == ['high', 'low', 'low later']
+
+    def test_scheduled_task_waits(self):
+        enqueue(record, ['later'], run_at=timezone.now() + timedelta(hours=1))
+
+        assert run_pending('worker') == 0
+        assert claim('worker', now=timezone.now() + timedelta(hours=2)).name == 'tests.record'
+
+    def test_claim_marks_running(self):
+        record.enqueue('a')
+
+        claimed = claim('worker')
+
+        assert (claimed.status, claimed.attempts, claimed.locked_by) == (Task.RUNNING, 1, 'worker')
+        assert claim('other') is None
+
+    def test_failure_retried_with_backoff_then_failed(self):
+        fail.enqueue()
+
+        first = run(claim('worker'))
+        assert first.status == Task.QUEUED
+        assert first.run_at > timezone.now()
+        assert 'ValueError: boom' in first.last_error
+
+        second = run(claim('worker', now=first.run_at))
+        assert (second.status, second.attempts) == (Task.FAILED, 2)
+
+    def test_unknown_task_fails(self):
+        Task.objects.create(name='tests.missing')
+
+        assert run(claim('worker')).status == Task.FAILED
+
+    def test_requeue_stale(self):
+        record.enqueue('a')
+        claim('worker')
+        fail.enqueue()
+        Task.objects.filter(name='tests.fail').update(
+            status=Task.RUNNING, attempts=2, locked_until=timezone.now() + timedelta(hours=1),
+        )
+
+        assert requeue_stale(now=timezone.now() + timedelta(hours=2)) == 1
+        assert Task.objects.get(name='tests.record').status == Task.QUEUED
+        assert Task.objects.get(name='tests.fail').status == Task.FAILED
+
+    def test_stale_after_per_task(self):
+        slow.enqueue()
+        claim('worker')
+
+        assert requeue_stale(now=timezone.now() + timedelta(hours=2)) == 0
+        assert requeue_stale(now=timezone.now() + timedelta(hours=7)) == 1
+
+    def test_non_atomic_task_keeps_work_done_before_failing(self):
+        partial.enqueue()
+
+        assert run(claim('worker')).status == Task.FAILED
+        assert Task.objects.filter(name='tests.committed').exists()
+
+    def test_worker_stops_between_tasks(self):
+        record.enqueue('a')
+        stop_worker.enqueue()
+
+        work(stopping, poll_interval=0, burst=True)
+
+        assert calls == ['stop']
+        assert Task.objects.get(name='tests.record').status == Task.QUEUED
+
+    def test_run_tasks_command(self):
+        record.enqueue('a')
+
+        call_command('run_tasks', '--burst', '--poll-interval', '0', stderr=StringIO())
+
+        assert calls == ['a']
+        assert 'structure.archive_season' in registry
@@ -0,0 +1,35 @@
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from ..warmup import compile_templates, resolve_urls, template_names, warm
+
+
+class TestWarmup(SimpleTestCase):
+    def test_resolve_urls(self):
+        assert resolve_urls() > 20
+
+    def test_template_names(self):
+        names = set(template_names(engines['django'].dirs[0], ['structure', 'users']))
+
+        assert 'structure/season_detail.html' in names
+        assert 'users/user_detail.html' in names
+        assert 'base.html' not in names
+
+    @override_settings(TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': engines['django'].dirs,
+        'OPTIONS': {
+            'loaders': [('django.template.loaders.cached.Loader', ['django.template.loaders.filesystem.Loader'])],
+        },
+    }])
+    def test_fills_cached_loader(self):
+        assert compile_templates() > 0
+
+        loader = engines['django'].engine.template_loaders[0]
+        assert any('structure/season_detail.html' in key for key in loader.get_template_cache)
+
+    def test_warm(self):
+        urls, templates = warm()
+
+        assert urls > 0
+        assert templates > 0
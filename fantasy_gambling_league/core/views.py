@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from .metrics import render
+
+
+def metrics(request):
+    """Prometheus scrape endpoint, behind a bearer token when METRICS_TOKEN is set."""
+    if settings.METRICS_TOKEN:
+        expected = 'Bearer {}'.format(settings.METRICS_TOKEN)
+        if not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), expected):
+            return HttpResponseForbidden()
+    body, content_type = render()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,72 @@
+import logging
+import os
+
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Template directories compiled ahead of the first request.
+WARM_TEMPLATE_DIRS = ('structure', 'users')
+
+
+def resolve_urls(resolver=None):
+    """
+    Build every resolver's reverse and namespace lookups and import every
+    view, returning the number of URL patterns visited.
+    """
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
+
+    count = 0
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            count += resolve_urls(pattern)
+        else:
+            pattern.callback
+            count += 1
+    return count
+
+
+def template_names(directory, subdirectories):
+    for subdirectory in subdirectories:
+        for root, _, files in os.walk(os.path.join(directory, subdirectory)):
+            for name in files:
+                if name.endswith('.html'):
+                    yield os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+
+
+def compile_templates(subdirectories=WARM_TEMPLATE_DIRS):
+    """
+    Load every template under ``subdirectories`` of each engine's template
+    directories, which fills the cached loader in production and Jinja2's
+    template cache everywhere. Returns the number compiled.
+    """
+    count = 0
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for name in template_names(directory, subdirectories):
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception('Could not compile %s with the %s engine', name, engine.name)
+                else:
+                    count += 1
+    return count
+
+
+def warm():
+    """
+    Do the work a worker would otherwise do on its first requests, so that
+    under ``gunicorn --preload`` it is done once in the master and shared
+    copy-on-write with every forked worker.
+    """
+    urls = resolve_urls()
+    templates = compile_templates()
+    # Forked workers must not share database sockets with the master.
+    connections.close_all()
+
+    logger.info('Warmed %d URL patterns and %d templates', urls, templates)
+    return urls, templates
@@ -1,7 +1,37 @@
 from django.contrib import admin
+from django.contrib.admin.actions import delete_selected as delete_selected_action
 
-from .models import Season, Gameweek
+from .models import Season, SeasonMembership, Gameweek
+
+
+class SeasonContentsAdmin(admin.ModelAdmin):
+    """Bumps the season's version after each change, see ``Season.version``."""
+
+    def save_model(self, request, obj, form, change):
+        super(SeasonContentsAdmin, self).save_model(request, obj, form, change)
+        Season.bump_version(pk=obj.season_id)
+
+    def delete_model(self, request, obj):
+        super(SeasonContentsAdmin, self).delete_model(request, obj)
+        Season.bump_version(pk=obj.season_id)
+
+    def get_actions(self, request):
+        actions = super(SeasonContentsAdmin, self).get_actions(request)
+        # Swapped in here rather than listed in actions, so the action keeps
+        # its name, which its confirmation page posts back.
+        if 'delete_selected' in actions:
+            actions['delete_selected'] = (SeasonContentsAdmin.delete_selected,) + actions['delete_selected'][1:]
+        return actions
+
+    def delete_selected(self, request, queryset):
+        season_ids = set(queryset.values_list('season_id', flat=True))
+        # None once the deletion is confirmed and done.
+        response = delete_selected_action(self, request, queryset)
+        if response is None:
+            Season.bump_version(pk__in=season_ids)
+        return response
 
 
 admin.site.register(Season)
-admin.site.register(Gameweek)
+admin.site.register(SeasonMembership, SeasonContentsAdmin)
+admin.site.register(Gameweek, SeasonContentsAdmin)
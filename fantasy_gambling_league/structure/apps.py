@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class StructureConfig(AppConfig):
     name = 'fantasy_gambling_league.structure'
+
+    def ready(self):
+        from . import slugs  # noqa F401
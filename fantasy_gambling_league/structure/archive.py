@@ -0,0 +1,223 @@
+import io
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+import numpy as np
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from fantasy_gambling_league.betting.history import from_micros, to_micros
+from fantasy_gambling_league.betting.models import Balance, Bet, Market, Selection
+from .models import Gameweek, Season, SeasonMembership
+
+# Money is archived as whole pence and prices as thousandths, both int64.
+PENCE = Decimal('0.01')
+THOUSANDTHS = Decimal('0.001')
+ARCHIVE_CACHE_SIZE = 16
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def is_finished(season, now=None):
+    """A season is finished once every deadline has passed and every bet is settled."""
+    gameweeks = season.gameweek_set.all()
+
+    return (
+        gameweeks.exists()
+        and not gameweeks.filter(deadline__gt=now or timezone.now()).exists()
+        and not Bet.objects.filter(gameweek__season=season, returns__isnull=True).exists()
+    )
+
+
+def _integers(values, unit):
+    return np.array([int(value / unit) for value in values], dtype=np.int64)
+
+
+def _strings(values):
+    return np.array(values, dtype=str)
+
+
+def _columns(season):
+    """Return the season's live rows as a dict of named, equal-length column arrays per table."""
+    gameweeks = list(
+        season.gameweek_set.order_by('number').values_list('number', 'deadline', 'spiel')
+    )
+    players = list(
+        SeasonMembership.objects.filter(season=season).order_by('user_id')
+        .values_list('user_id', 'user__username', 'joined', 'role')
+    )
+    bets = list(
+        Bet.objects.filter(gameweek__season=season).order_by('gameweek__number', 'placed', 'pk').values_list(
+            'gameweek__number', 'user_id', 'selection__market__name', 'selection__name',
+            'stake', 'price', 'returns', 'placed',
+        ).iterator()
+    )
+    balances = list(
+        Balance.objects.filter(gameweek__season=season).order_by('gameweek__number', 'user_id')
+        .values_list('gameweek__number', 'user_id', 'remaining')
+    )
+
+    gameweeks, players, bets, balances = (
+        list(zip(*rows)) or [()] * width
+        for rows, width in ((gameweeks, 3), (players, 4), (bets, 8), (balances, 3))
+    )
+    return {
+        'gameweek_number': np.array(gameweeks[0], dtype=np.int32),
+        'gameweek_deadline': np.array([to_micros(deadline) for deadline in gameweeks[1]], dtype=np.int64),
+        'gameweek_spiel': _strings([spiel or '' for spiel in gameweeks[2]]),
+        'player_user': np.array(players[0], dtype=np.int64),
+        'player_username': _strings(players[1]),
+        'player_joined': np.array([to_micros(joined) for joined in players[2]], dtype=np.int64),
+        'player_role': _strings(players[3]),
+        'bet_gameweek': np.array(bets[0], dtype=np.int32),
+        'bet_user': np.array(bets[1], dtype=np.int64),
+        'bet_market': _strings(bets[2]),
+        'bet_selection': _strings(bets[3]),
+        'bet_stake': _integers(bets[4], PENCE),
+        'bet_price': _integers(bets[5], THOUSANDTHS),
+        'bet_returns': _integers(bets[6], PENCE),
+        'bet_placed': np.array([to_micros(placed) for placed in bets[7]], dtype=np.int64),
+        'balance_gameweek': np.array(balances[0], dtype=np.int32),
+        'balance_user': np.array(balances[1], dtype=np.int64),
+        'balance_remaining': _integers(balances[2], PENCE),
+    }
+
+
+def archive_season(season, now=None):
+    """
+    Write a finished season's gameweeks, players, bets and balances to a
+    compressed ``.npz`` on the media storage and delete the live rows.
+
+    The ``Season`` row stays, pointing at its archive, so URLs keep working.
+    """
+    if season.archive:
+        raise ArchiveError('{} is already archived'.format(season.slug))
+    if not is_finished(season, now):
+        raise ArchiveError('{} has open gameweeks or unsettled bets'.format(season.slug))
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **_columns(season))
+    season.archive.save('season-{}.npz'.format(season.slug), ContentFile(buffer.getvalue()), save=False)
+
+    try:
+        with transaction.atomic():
+            # Children first, so each delete is a single statement rather than
+            # a cascade collected in memory.
+            Bet.objects.filter(gameweek__season=season).delete()
+            Balance.objects.filter(gameweek__season=season).delete()
+            Selection.objects.filter(market__gameweek__season=season).delete()
+            Market.objects.filter(gameweek__season=season).delete()
+            Gameweek.objects.filter(season=season).delete()
+            SeasonMembership.objects.filter(season=season).delete()
+            season.save(update_fields=['archive'])
+            Season.bump_version(pk=season.pk)
+    except Exception:
+        season.archive.delete(save=False)
+        raise
+
+    return season.archive.name
+
+
+class ArchiveColumns:
+    """
+    One archive's compressed bytes, decompressing each column only the first
+    time it is asked for.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name not in self._columns:
+                with np.load(io.BytesIO(self._data)) as npz:
+                    self._columns[name] = npz[name]
+            return self._columns[name]
+
+
+class ArchiveCache:
+    """
+    Bounded, process-local LRU of archive file name to its ``ArchiveColumns``,
+    so each worker downloads an archive from media storage once rather than on
+    every request, and only decompresses the columns a page reads. Archives
+    never change once written.
+    """
+
+    def __init__(self, maxsize=ARCHIVE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def columns(self, archive):
+        with self._lock:
+            if archive.name in self._entries:
+                self._entries.move_to_end(archive.name)
+                return self._entries[archive.name]
+
+        with archive.open('rb'):
+            columns = ArchiveColumns(archive.read())
+
+        with self._lock:
+            self._entries[archive.name] = columns
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return columns
+
+
+season_archives = ArchiveCache()
+
+
+class SeasonArchive:
+    """Read-only view over an archived season's columns, see ``ArchiveCache``."""
+
+    def __init__(self, season):
+        self.season = season
+
+    def column(self, name):
+        return season_archives.columns(self.season.archive)[name]
+
+    def gameweeks(self):
+        """Return unsaved ``Gameweek`` instances, so templates treat them like live ones."""
+        return [
+            Gameweek(season=self.season, number=int(number), deadline=from_micros(int(deadline)), spiel=spiel)
+            for number, deadline, spiel in zip(
+                self.column('gameweek_number'),
+                self.column('gameweek_deadline'),
+                self.column('gameweek_spiel'),
+            )
+        ]
+
+    def gameweek(self, number):
+        for gameweek in self.gameweeks():
+            if gameweek.number == number:
+                return gameweek
+        return None
+
+    def bets(self, number, user_id):
+        """
+        Return the player's settled bets on a gameweek as dicts shaped like
+        ``bets_with_returns``, with ``returns`` in place of ``potential_returns``.
+        """
+        mine = np.flatnonzero((self.column('bet_gameweek') == number) & (self.column('bet_user') == user_id))
+
+        return [
+            {
+                'selection': {'name': self.column('bet_selection')[index]},
+                'market': self.column('bet_market')[index],
+                'stake': Decimal(int(self.column('bet_stake')[index])) * PENCE,
+                'price': Decimal(int(self.column('bet_price')[index])) * THOUSANDTHS,
+                'returns': Decimal(int(self.column('bet_returns')[index])) * PENCE,
+                'placed': from_micros(int(self.column('bet_placed')[index])),
+            }
+            for index in mine
+        ]
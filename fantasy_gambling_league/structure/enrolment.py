@@ -0,0 +1,92 @@
+import codecs
+import csv
+from collections import namedtuple
+
+from django.db import IntegrityError, transaction
+
+from fantasy_gambling_league.users.models import User
+from .models import Season, SeasonMembership
+
+ENROLMENT_CHUNK_SIZE = 500
+# How many times to diff again when concurrent enrolments keep racing this one.
+ENROLMENT_ATTEMPTS = 5
+
+EnrolmentResult = namedtuple('EnrolmentResult', ['enrolled', 'already_enrolled', 'unknown'])
+
+
+def read_identifiers(csv_file):
+    """
+    Return the usernames or emails in the first column of an uploaded CSV,
+    de-duplicated and in file order.
+    """
+    identifiers = {}
+
+    for row in csv.reader(codecs.iterdecode(csv_file, 'utf-8-sig')):
+        if row and row[0].strip():
+            identifiers.setdefault(row[0].strip(), None)
+
+    return list(identifiers)
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _resolve_users(identifiers, chunk_size):
+    emails = [identifier for identifier in identifiers if '@' in identifier]
+    usernames = [identifier for identifier in identifiers if '@' not in identifier]
+    resolved = {}
+
+    for chunk in _chunks(usernames, chunk_size):
+        resolved.update(User.objects.filter(username__in=chunk).values_list('username', 'pk'))
+    for chunk in _chunks(emails, chunk_size):
+        resolved.update(User.objects.filter(email__in=chunk).values_list('email', 'pk'))
+
+    return resolved
+
+
+def _insert_memberships(season, user_ids, chunk_size):
+    existing = set(
+        SeasonMembership.objects.filter(season=season).values_list('user_id', flat=True)
+    )
+    new_user_ids = [user_id for user_id in user_ids if user_id not in existing]
+
+    SeasonMembership.objects.bulk_create(
+        [SeasonMembership(season=season, user_id=user_id) for user_id in new_user_ids],
+        batch_size=chunk_size,
+    )
+    # bulk_create sends no post_save, so bump the version signals would have.
+    if new_user_ids:
+        Season.bump_version(pk=season.pk)
+    return new_user_ids
+
+
+def enrol_players(season, identifiers, chunk_size=ENROLMENT_CHUNK_SIZE):
+    """
+    Add the users named by username or email to the season's players.
+
+    Users are resolved with chunked ``IN`` queries and diffed against the
+    current membership in a single query, so the number of queries grows
+    with the number of chunks rather than the number of players.
+    """
+    resolved = _resolve_users(identifiers, chunk_size)
+    unknown = [identifier for identifier in identifiers if identifier not in resolved]
+    user_ids = list(dict.fromkeys(resolved[identifier] for identifier in identifiers if identifier in resolved))
+
+    # ``bulk_create(ignore_conflicts=True)`` needs Django 2.2; until then a
+    # concurrent enrolment racing this one is handled by diffing again.
+    for attempt in range(ENROLMENT_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                enrolled = _insert_memberships(season, user_ids, chunk_size)
+            break
+        except IntegrityError:
+            if attempt == ENROLMENT_ATTEMPTS - 1:
+                raise
+
+    return EnrolmentResult(
+        enrolled=len(enrolled),
+        already_enrolled=len(user_ids) - len(enrolled),
+        unknown=unknown,
+    )
@@ -0,0 +1,86 @@
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from fantasy_gambling_league.betting.models import Bet
+from .models import Gameweek, SeasonMembership
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Table name: (column headers, the season's rows, the lookups for each column).
+EXPORTS = {
+    'gameweeks': (
+        ('number', 'deadline', 'spiel'),
+        lambda season: Gameweek.objects.filter(season=season).order_by('number'),
+        ('number', 'deadline', 'spiel'),
+    ),
+    'players': (
+        ('username', 'name', 'joined', 'role'),
+        lambda season: SeasonMembership.objects.filter(season=season).order_by('user__username'),
+        ('user__username', 'user__name', 'joined', 'role'),
+    ),
+    'bets': (
+        ('gameweek', 'username', 'market', 'selection', 'stake', 'price', 'placed', 'returns'),
+        lambda season: Bet.objects.filter(gameweek__season=season).order_by('gameweek__number', 'pk'),
+        (
+            'gameweek__number', 'user__username', 'selection__market__name', 'selection__name',
+            'stake', 'price', 'placed', 'returns',
+        ),
+    ),
+}
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """A file-like object whose ``write`` hands back what it is given, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(season, table, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the header and then each row of ``table`` for the season,
+    fetching ``chunk_size`` rows at a time rather than the whole table.
+    """
+    header, queryset, lookups = EXPORTS[table]
+    yield header
+    yield from queryset(season).values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def encode_csv(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row).encode('utf-8')
+
+
+def encode_jsonl(rows):
+    header = next(rows)
+    for row in rows:
+        yield (json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n').encode('utf-8')
+
+
+ENCODERS = {
+    'csv': encode_csv,
+    'jsonl': encode_jsonl,
+}
+
+
+def gzip_stream(chunks, level=6):
+    """
+    Compress a stream of byte strings into a gzip stream, yielding output
+    only when zlib has some to give so the response is not full of tiny
+    chunks.
+    """
+    # wbits of 16 + 15 asks zlib for a gzip header and trailer.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
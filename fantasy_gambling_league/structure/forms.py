@@ -1,7 +1,10 @@
+import csv
+
 from django.core.exceptions import ValidationError
-from django.forms import ModelForm
+from django.forms import FileField, Form, ModelForm
 from django.utils.text import slugify
 
+from .enrolment import read_identifiers
 from .models import Season
 
 
@@ -18,3 +21,19 @@ class SeasonForm(ModelForm):
                 'Name must not clash with existing seasons'
             )
         return self.cleaned_data['name']
+
+
+class SeasonEnrolmentForm(Form):
+    players = FileField(
+        help_text='CSV with one username or email per row, in the first column',
+    )
+
+    def clean_players(self):
+        try:
+            identifiers = read_identifiers(self.cleaned_data['players'])
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError('File must be a UTF-8 encoded CSV')
+
+        if not identifiers:
+            raise ValidationError('File does not list any players')
+        return identifiers
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...archive import ArchiveError, archive_season, is_finished
+from ...models import Season
+
+
+class Command(BaseCommand):
+    help = 'Move finished seasons out of the live tables into compressed archives on the media storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slugs', nargs='*', help='Seasons to archive, defaults to every finished one')
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.filter(archive='')
+        if options['slugs']:
+            seasons = Season.objects.filter(slug__in=options['slugs'])
+            missing = set(options['slugs']) - set(seasons.values_list('slug', flat=True))
+            if missing:
+                raise CommandError('Unknown seasons: {}'.format(', '.join(sorted(missing))))
+        else:
+            seasons = [season for season in seasons if is_finished(season)]
+
+        for season in seasons:
+            try:
+                path = archive_season(season)
+            except ArchiveError as error:
+                raise CommandError(str(error))
+            self.stdout.write('Archived {} to {}'.format(season.slug, path))
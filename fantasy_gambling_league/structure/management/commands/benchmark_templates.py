@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import RequestFactory
+from django.utils import timezone
+
+from ...models import Gameweek, Season
+
+TEMPLATE_NAME = 'structure/season_detail.html'
+
+
+class Command(BaseCommand):
+    help = 'Time rendering the season detail page with the Django and Jinja2 engines for growing seasons'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gameweeks', type=int, nargs='+', default=[50, 500, 5000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        now = timezone.now()
+
+        self.stdout.write('{:>10} {:>12} {:>12} {:>8}'.format('gameweeks', 'django ms', 'jinja2 ms', 'speedup'))
+        for count in options['gameweeks']:
+            # Unsaved rows: this times the engines, not the database.
+            season = Season(name='Benchmark', slug='benchmark')
+            context = {
+                'object': season,
+                'season': season,
+                'gameweeks': [
+                    Gameweek(season=season, number=number, deadline=now + timedelta(weeks=number))
+                    for number in range(1, count + 1)
+                ],
+            }
+
+            timings = {}
+            for engine in ('django', 'jinja2'):
+                template = engines[engine].get_template(TEMPLATE_NAME)
+                template.render(context, request)
+
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    template.render(context, request)
+                timings[engine] = (time.perf_counter() - started) * 1000 / options['repeat']
+
+            self.stdout.write('{:>10} {:>12.2f} {:>12.2f} {:>7.1f}x'.format(
+                count, timings['django'], timings['jinja2'], timings['django'] / timings['jinja2'],
+            ))
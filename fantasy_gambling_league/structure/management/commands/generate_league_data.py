@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fantasy_gambling_league.users.models import User
+from ...synthetic import BATCH_SIZE, generate_league
+
+
+class Command(BaseCommand):
+    help = 'Bulk insert a synthetic league of users, seasons, gameweeks and memberships for capacity testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--seasons', type=int, default=100)
+        parser.add_argument('--gameweeks', type=int, default=38, help='Gameweeks per season')
+        parser.add_argument('--season-size', type=int, default=50, help='Mean players per season')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='synthetic', help='Prefix for usernames and season slugs')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith='{}-user-'.format(options['prefix'])).exists():
+            raise CommandError('Users prefixed {!r} already exist, pick another --prefix'.format(options['prefix']))
+
+        started = time.perf_counter()
+        created = generate_league(
+            users=options['users'],
+            seasons=options['seasons'],
+            gameweeks=options['gameweeks'],
+            mean_season_size=options['season_size'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+        )
+
+        for name, count in created.items():
+            self.stdout.write('{:>12} {}'.format(count, name))
+        self.stdout.write('Generated in {:.1f}s'.format(time.perf_counter() - started))
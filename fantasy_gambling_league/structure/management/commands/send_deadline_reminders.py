@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ...reminders import REMINDER_BATCH_SIZE, send_deadline_reminders
+
+
+class Command(BaseCommand):
+    help = 'Email players whose gameweek deadline is coming up; safe to run repeatedly, as from cron'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=24, help='Remind of deadlines within this many hours')
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE, help='Emails sent per connection')
+
+    def handle(self, *args, **options):
+        results = send_deadline_reminders(
+            window=timedelta(hours=options['hours']),
+            batch_size=options['batch_size'],
+        )
+        for gameweek, sent in results:
+            self.stdout.write('{} gameweek {}: sent {} reminders'.format(gameweek.season.slug, gameweek.number, sent))
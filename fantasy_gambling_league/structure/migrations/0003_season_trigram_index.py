@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS structure_season_name_trgm '
+        'ON structure_season USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS structure_season_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('structure', '0002_gameweek'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('structure', '0003_season_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gameweek',
+            name='spiel',
+            field=models.TextField(blank=True, null=True),
+        ),
+        # The auto-created through table already has the id, season_id and
+        # user_id columns and the unique constraint, so only the state moves.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='SeasonMembership',
+                    fields=[
+                        ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='structure.Season')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'structure_season_players',
+                        'unique_together': {('season', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='season',
+                    name='players',
+                    field=models.ManyToManyField(related_name='seasons', through='structure.SeasonMembership', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='seasonmembership',
+            name='joined',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='seasonmembership',
+            name='role',
+            field=models.CharField(choices=[('player', 'Player'), ('spectator', 'Spectator')], default='player', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='seasonmembership',
+            index=models.Index(fields=['user', 'season'], name='membership_user_season_idx'),
+        ),
+    ]
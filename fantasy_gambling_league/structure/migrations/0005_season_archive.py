@@ -0,0 +1,18 @@
+# Generated by Django 2.0.10 on 2026-10-19 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('structure', '0004_seasonmembership'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='archive',
+            field=models.FileField(blank=True, upload_to='archives/'),
+        ),
+    ]
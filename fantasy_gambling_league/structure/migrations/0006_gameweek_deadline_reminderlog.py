@@ -0,0 +1,42 @@
+# Generated by Django 2.0.10 on 2026-10-19 02:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('structure', '0005_season_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sent', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='gameweek',
+            index=models.Index(fields=['deadline'], name='gameweek_deadline_idx'),
+        ),
+        migrations.AddField(
+            model_name='reminderlog',
+            name='gameweek',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='structure.Gameweek'),
+        ),
+        migrations.AddField(
+            model_name='reminderlog',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reminderlog',
+            unique_together={('gameweek', 'user')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.0.10 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('structure', '0006_gameweek_deadline_reminderlog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from fantasy_gambling_league.users.models import User
 
@@ -9,7 +10,11 @@ class Season(models.Model):
         null=True,
         on_delete=models.SET_NULL,
     )
-    players = models.ManyToManyField(User, related_name='seasons')
+    players = models.ManyToManyField(
+        User,
+        related_name='seasons',
+        through='SeasonMembership',
+    )
     name = models.CharField(max_length=255)
     slug = models.SlugField(unique=True)
     weekly_allowance = models.DecimalField(
@@ -17,6 +22,63 @@ class Season(models.Model):
         decimal_places=2,
         max_digits=99
     )
+    # Set once a finished season's rows have been moved to a columnar archive.
+    archive = models.FileField(upload_to='archives/', blank=True)
+    # Bumped with bump_version, once per write, when players, gameweeks or
+    # settled bets change, so anything derived from them, such as
+    # projections, can be cached per version. There are no signal receivers
+    # for it, as they would stop bulk deletes from being fast deletes.
+    version = models.PositiveIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        # Leave version to bump_version rather than write back a stale copy.
+        if not (self._state.adding or kwargs.get('force_insert') or kwargs.get('update_fields')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'version'
+            ]
+        super(Season, self).save(*args, **kwargs)
+
+    def has_player(self, user):
+        return SeasonMembership.objects.filter(season=self, user=user).exists()
+
+    @classmethod
+    def bump_version(cls, **lookup):
+        cls.objects.filter(**lookup).update(version=models.F('version') + 1)
+
+
+class SeasonMembership(models.Model):
+    PLAYER = 'player'
+    SPECTATOR = 'spectator'
+    ROLE_CHOICES = (
+        (PLAYER, 'Player'),
+        (SPECTATOR, 'Spectator'),
+    )
+
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+    joined = models.DateTimeField(default=timezone.now)
+    role = models.CharField(
+        max_length=16,
+        choices=ROLE_CHOICES,
+        default=PLAYER,
+    )
+
+    class Meta:
+        # Keeps the table of the auto-created through model it replaced.
+        db_table = 'structure_season_players'
+        # The unique constraint doubles as the (season, user) index.
+        unique_together = ('season', 'user')
+        indexes = [
+            models.Index(fields=['user', 'season'], name='membership_user_season_idx'),
+        ]
+
 
 class Gameweek(models.Model):
     season = models.ForeignKey(
@@ -27,3 +89,24 @@ class Gameweek(models.Model):
     deadline = models.DateTimeField()
     spiel = models.TextField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Finds the deadlines coming up for send_deadline_reminders.
+            models.Index(fields=['deadline'], name='gameweek_deadline_idx'),
+        ]
+
+
+class ReminderLog(models.Model):
+    """Records that a player was reminded of a gameweek's deadline, so it happens once."""
+    gameweek = models.ForeignKey(
+        Gameweek,
+        on_delete=models.CASCADE,
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+    sent = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('gameweek', 'user')
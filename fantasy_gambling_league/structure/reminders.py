@@ -0,0 +1,116 @@
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Gameweek, ReminderLog, SeasonMembership
+
+REMINDER_WINDOW = timedelta(hours=24)
+REMINDER_BATCH_SIZE = 500
+
+ReminderResult = namedtuple('ReminderResult', ['gameweek', 'sent'])
+
+
+def upcoming_gameweeks(now=None, window=REMINDER_WINDOW):
+    """Gameweeks of live seasons whose deadline falls within ``window`` from now."""
+    now = now or timezone.now()
+    return Gameweek.objects.filter(
+        deadline__gt=now,
+        deadline__lte=now + window,
+        season__archive='',
+    ).select_related('season').order_by('deadline')
+
+
+def render_reminder(gameweek):
+    """Render the subject and body once for every player in the season."""
+    context = {
+        'season': gameweek.season,
+        'gameweek': gameweek,
+        'url': 'https://{}{}'.format(
+            Site.objects.get_current().domain,
+            reverse('structure:detail-gameweek', kwargs={
+                'season_slug': gameweek.season.slug,
+                'number': gameweek.number,
+            }),
+        ),
+    }
+    subject = render_to_string('structure/email/deadline_reminder_subject.txt', context)
+    body = render_to_string('structure/email/deadline_reminder_message.txt', context)
+    # Email headers cannot contain newlines.
+    return ' '.join(subject.splitlines()).strip(), body
+
+
+def unreminded_players(gameweek, after, limit):
+    """The next ``limit`` players after user id ``after`` not yet reminded, as ``(id, email)``."""
+    reminded = ReminderLog.objects.filter(gameweek=gameweek, user=OuterRef('user'))
+    return list(
+        SeasonMembership.objects
+        .filter(season=gameweek.season_id, role=SeasonMembership.PLAYER, user_id__gt=after)
+        .exclude(user__email='')
+        .annotate(reminded=Exists(reminded))
+        .filter(reminded=False)
+        .order_by('user_id')
+        .values_list('user_id', 'user__email')[:limit]
+    )
+
+
+def send_batch(gameweek, players, subject, body):
+    """
+    Claim the players' reminder logs, then send their emails one at a time
+    over a single connection. The claims are made first so a concurrent run
+    fails on the unique constraint rather than sending twice, and skips the
+    batch. If sending fails, only the claims of players not yet emailed are
+    released for a later run to retry.
+    """
+    try:
+        with transaction.atomic():
+            ReminderLog.objects.bulk_create([
+                ReminderLog(gameweek=gameweek, user_id=user_id) for user_id, _ in players
+            ])
+    except IntegrityError:
+        return 0
+
+    connection = get_connection()
+    sent = 0
+    try:
+        connection.open()
+        for _, email in players:
+            EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [email], connection=connection).send()
+            sent += 1
+    except Exception:
+        ReminderLog.objects.filter(
+            gameweek=gameweek,
+            user_id__in=[user_id for user_id, _ in players[sent:]],
+        ).delete()
+        raise
+    finally:
+        connection.close()
+    return sent
+
+
+def send_deadline_reminders(now=None, window=REMINDER_WINDOW, batch_size=REMINDER_BATCH_SIZE):
+    """
+    Email every player of each gameweek with a deadline in ``window`` who
+    has not been reminded of it yet, ``batch_size`` messages per connection.
+    Returns a ``ReminderResult`` per gameweek.
+    """
+    results = []
+    for gameweek in upcoming_gameweeks(now, window):
+        subject, body = render_reminder(gameweek)
+        sent = 0
+        after = 0
+        while True:
+            players = unreminded_players(gameweek, after, batch_size)
+            if not players:
+                break
+            sent += send_batch(gameweek, players, subject, body)
+            after = players[-1][0]
+        results.append(ReminderResult(gameweek, sent))
+    return results
@@ -0,0 +1,5 @@
+from fantasy_gambling_league.core.search import ModelSearch
+
+from .models import Season
+
+season_search = ModelSearch(Season, ['name'])
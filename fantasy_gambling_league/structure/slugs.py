@@ -0,0 +1,84 @@
+import threading
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Season
+
+SLUG_CACHE_SIZE = 4096
+VERSION_KEY = 'structure:season-slugs:version'
+
+SeasonRef = namedtuple('SeasonRef', ['pk', 'commissioner_id', 'archived'])
+
+
+class SlugCache:
+    """
+    Bounded, process-local LRU of season slug to ``SeasonRef``.
+
+    Every worker keeps its own copy, so each lookup first compares a shared
+    version token in the cache with the one the entries were loaded under
+    and starts afresh when another process has changed a season since.
+    That is one cache ``GET`` per lookup in place of a database query.
+    """
+
+    def __init__(self, maxsize=SLUG_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def resolve(self, slug):
+        version = cache.get(VERSION_KEY)
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if slug in self._entries:
+                self._entries.move_to_end(slug)
+                return self._entries[slug]
+
+        row = Season.objects.filter(slug=slug).values_list('pk', 'commissioner_id', 'archive').first()
+        if row is None:
+            return None
+
+        pk, commissioner_id, archive = row
+        ref = SeasonRef(pk, commissioner_id, bool(archive))
+        with self._lock:
+            # Only keep it if no season changed while it was being read.
+            if version == self._version:
+                self._entries[slug] = ref
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return ref
+
+
+season_slugs = SlugCache()
+
+
+def resolve_season(slug):
+    """Return the ``SeasonRef`` for a slug, or ``None`` if there is no such season."""
+    return season_slugs.resolve(slug)
+
+
+def bump_version():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+def season_changed(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    # Bump straight away so other workers stop trusting their entries, and
+    # again on commit in case one re-read the old row before it committed.
+    bump_version()
+    transaction.on_commit(bump_version)
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from fantasy_gambling_league.users.models import User
+from .models import Gameweek, Season, SeasonMembership
+
+BATCH_SIZE = 5000
+# Larger skew puts more of the memberships on the first users, the way a few
+# keen players end up in many leagues and most players are in one.
+USER_SKEW = 3.0
+
+
+def _batches(objects, batch_size):
+    batch = []
+    for instance in objects:
+        batch.append(instance)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(model, objects, batch_size):
+    created = 0
+    for batch in _batches(objects, batch_size):
+        model.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def season_sizes(random, seasons, users, mean_size):
+    """Draw heavy-tailed season sizes: most leagues are small, a few are huge."""
+    sigma = 1.0
+    sizes = random.lognormal(np.log(mean_size) - sigma ** 2 / 2, sigma, seasons)
+    return np.clip(sizes.astype(np.int64), 2, users)
+
+
+def season_players(random, users, size):
+    """
+    Pick ``size`` distinct user positions, favouring low positions.
+
+    Raising a uniform draw to a power skews it towards zero in O(size),
+    where a weighted ``choice`` would cost O(users) per season.
+    """
+    chosen = np.unique((users * random.random_sample(size) ** USER_SKEW).astype(np.int64))
+    while len(chosen) < size:
+        extra = random.randint(0, users, size - len(chosen))
+        chosen = np.union1d(chosen, extra)
+    return chosen[:size]
+
+
+def generate_league(users, seasons, gameweeks, mean_season_size, seed=0, prefix='synthetic',
+                    batch_size=BATCH_SIZE, now=None):
+    """
+    Bulk insert ``users`` users and ``seasons`` seasons, each with
+    ``gameweeks`` weekly gameweeks and a skewed sample of the users as
+    players, and return the number of rows created per model.
+
+    The same seed always generates the same league.
+    """
+    random = np.random.RandomState(seed)
+    now = now or timezone.now()
+    # Hashing is deliberately slow, so every synthetic user shares one hash.
+    password = make_password('{}-password'.format(prefix), salt=prefix)
+
+    created = {}
+    created['users'] = _insert(User, (
+        User(username='{}-user-{}'.format(prefix, number), email='{}-user-{}@example.com'.format(prefix, number),
+             password=password, date_joined=now)
+        for number in range(users)
+    ), batch_size)
+    user_ids = np.fromiter(
+        User.objects.filter(username__startswith='{}-user-'.format(prefix))
+        .order_by('pk').values_list('pk', flat=True).iterator(),
+        dtype=np.int64,
+    )
+
+    commissioners = random.randint(0, len(user_ids), seasons)
+    created['seasons'] = _insert(Season, (
+        Season(
+            name='{} league {}'.format(prefix, number),
+            slug='{}-league-{}'.format(prefix, number),
+            commissioner_id=int(user_ids[commissioner]),
+        )
+        for number, commissioner in enumerate(commissioners)
+    ), batch_size)
+    season_ids = list(
+        Season.objects.filter(slug__startswith='{}-league-'.format(prefix)).order_by('pk').values_list('pk', flat=True)
+    )
+
+    # Seasons start up to a year ago, so some are finished and some are live.
+    starts = random.randint(0, 52, len(season_ids))
+    created['gameweeks'] = _insert(Gameweek, (
+        Gameweek(season_id=season_id, number=number, deadline=now + timedelta(weeks=number - int(start)))
+        for season_id, start in zip(season_ids, starts)
+        for number in range(1, gameweeks + 1)
+    ), batch_size)
+
+    sizes = season_sizes(random, len(season_ids), len(user_ids), mean_season_size)
+    created['memberships'] = _insert(SeasonMembership, (
+        SeasonMembership(season_id=season_id, user_id=int(user_ids[position]), joined=now)
+        for season_id, size in zip(season_ids, sizes)
+        for position in season_players(random, len(user_ids), size)
+    ), batch_size)
+
+    return created
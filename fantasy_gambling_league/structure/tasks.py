@@ -0,0 +1,18 @@
+from fantasy_gambling_league.core.tasks import task
+from .archive import archive_season, is_finished
+from .models import Season
+from .reminders import send_deadline_reminders
+
+
+@task(name='structure.archive_season')
+def archive_finished_season(season_id):
+    season = Season.objects.get(pk=season_id)
+    if not season.archive and is_finished(season):
+        archive_season(season)
+
+
+# Not atomic, so each batch's reminder claims are committed as it is sent
+# and a retry only emails the players that were missed.
+@task(name='structure.send_deadline_reminders', priority=10, atomic=False)
+def send_reminders():
+    send_deadline_reminders()
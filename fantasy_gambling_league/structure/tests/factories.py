@@ -1,10 +1,11 @@
 from datetime import datetime
 from pytz import utc
 
-from factory import DjangoModelFactory, Faker, LazyFunction
+from factory import DjangoModelFactory, Faker, LazyFunction, SubFactory
 from factory.fuzzy import FuzzyDateTime
 
-from ..models import Season, Gameweek
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from ..models import Season, SeasonMembership, Gameweek
 
 
 class SeasonFactory(DjangoModelFactory):
@@ -15,6 +16,14 @@ class SeasonFactory(DjangoModelFactory):
         model = Season
 
 
+class SeasonMembershipFactory(DjangoModelFactory):
+    season = SubFactory(SeasonFactory)
+    user = SubFactory(UserFactory)
+
+    class Meta:
+        model = SeasonMembership
+
+
 class GameweekFactory(DjangoModelFactory):
     deadline = FuzzyDateTime(
         start_dt=datetime.now(utc)
@@ -0,0 +1,28 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import GameweekFactory, SeasonFactory
+from ..models import Gameweek
+
+
+class TestSeasonContentsAdmin(TestCase):
+    def setUp(self):
+        self.season = SeasonFactory()
+        self.gameweek = GameweekFactory(season=self.season, number=1)
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+
+    def test_bulk_delete_bumps_version(self):
+        url = reverse('admin:structure_gameweek_changelist')
+        data = {'action': 'delete_selected', '_selected_action': [self.gameweek.pk]}
+
+        confirmation = self.client.post(url, data)
+        assert 'Are you sure' in confirmation.content.decode()
+        self.season.refresh_from_db()
+        assert self.season.version == 0
+
+        self.client.post(url, dict(data, post='yes'))
+
+        self.season.refresh_from_db()
+        assert self.season.version == 1
+        assert not Gameweek.objects.exists()
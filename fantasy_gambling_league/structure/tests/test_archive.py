@@ -0,0 +1,162 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from fantasy_gambling_league.betting.models import Balance, Bet, Market, Selection
+from fantasy_gambling_league.betting.tests.factories import BetFactory, MarketFactory, SelectionFactory
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import GameweekFactory, SeasonFactory, SeasonMembershipFactory
+from ..archive import ArchiveError, SeasonArchive, archive_season, is_finished
+from ..models import Gameweek, Season, SeasonMembership
+
+
+class TestArchiveSeason(TestCase):
+    def setUp(self):
+        self.season = SeasonFactory(commissioner=UserFactory())
+        self.player = UserFactory()
+        SeasonMembershipFactory(season=self.season, user=self.player)
+        self.gameweek = GameweekFactory(
+            season=self.season,
+            number=1,
+            deadline=timezone.now() - timedelta(days=1),
+            spiel='Opening weekend',
+        )
+        selection = SelectionFactory(
+            market=MarketFactory(gameweek=self.gameweek, name='Winner'),
+            name='Home',
+            price=Decimal('2.500'),
+        )
+        self.bet = BetFactory(user=self.player, selection=selection, stake=Decimal('10.00'), returns=Decimal('25.00'))
+        Balance.objects.create(user=self.player, gameweek=self.gameweek, remaining=Decimal('90.00'))
+
+    def test_open_season_not_finished(self):
+        GameweekFactory(season=self.season, number=2, deadline=timezone.now() + timedelta(days=1))
+
+        assert not is_finished(self.season)
+        with self.assertRaises(ArchiveError):
+            archive_season(self.season)
+
+    def test_unsettled_bets_not_finished(self):
+        Bet.objects.update(returns=None)
+
+        assert not is_finished(self.season)
+
+    def test_archive_removes_live_rows(self):
+        archive_season(self.season)
+
+        self.season.refresh_from_db()
+        assert self.season.archive.name.endswith('.npz')
+        for model in (Gameweek, SeasonMembership, Market, Selection, Bet, Balance):
+            assert not model.objects.exists()
+        assert self.season.version == 1
+
+    def test_archive_round_trips(self):
+        archive_season(self.season)
+
+        archive = SeasonArchive(self.season)
+        gameweek, = archive.gameweeks()
+        bet, = archive.bets(1, self.player.pk)
+
+        assert list(archive.column('player_username')) == [self.player.username]
+        assert list(archive.column('balance_remaining')) == [9000]
+
+        assert gameweek.number == 1
+        assert gameweek.spiel == 'Opening weekend'
+        assert gameweek.deadline == self.gameweek.deadline
+        assert bet['selection']['name'] == 'Home'
+        assert bet['market'] == 'Winner'
+        assert bet['stake'] == Decimal('10.00')
+        assert bet['price'] == Decimal('2.500')
+        assert bet['returns'] == Decimal('25.00')
+
+    def test_archive_loaded_once_per_process(self):
+        archive_season(self.season)
+        SeasonArchive(self.season).gameweeks()
+
+        with mock.patch('numpy.load') as load:
+            assert SeasonArchive(Season.objects.get(pk=self.season.pk)).gameweeks()[0].number == 1
+
+        load.assert_not_called()
+
+    def test_archive_columns_loaded_on_demand(self):
+        archive_season(self.season)
+        archive = SeasonArchive(self.season)
+        archive.gameweeks()
+
+        with mock.patch('numpy.load', wraps=np.load) as load:
+            archive.column('player_username')
+            archive.column('player_username')
+            archive.column('gameweek_number')
+
+        assert load.call_count == 1
+
+    def test_archive_twice_rejected(self):
+        archive_season(self.season)
+
+        with self.assertRaises(ArchiveError):
+            archive_season(self.season)
+
+    def test_command_archives_finished_seasons(self):
+        open_season = SeasonFactory(commissioner=UserFactory())
+        GameweekFactory(season=open_season, number=1, deadline=timezone.now() + timedelta(days=1))
+
+        call_command('archive_season')
+
+        self.season.refresh_from_db()
+        open_season.refresh_from_db()
+        assert self.season.archive
+        assert not open_season.archive
+
+    def test_command_unknown_season(self):
+        with self.assertRaises(CommandError):
+            call_command('archive_season', 'no-such-season')
+
+    def test_detail_pages_read_archive(self):
+        archive_season(self.season)
+        self.client.force_login(self.player)
+
+        response = self.client.get(reverse('structure:detail-season', kwargs={'slug': self.season.slug}))
+        assert response.status_code == 200
+        assert [gameweek.number for gameweek in response.context['gameweeks']] == [1]
+
+        response = self.client.get(reverse(
+            'structure:detail-gameweek',
+            kwargs={'season_slug': self.season.slug, 'number': 1},
+        ))
+        assert response.status_code == 200
+        assert response.context['object'].spiel == 'Opening weekend'
+        assert [bet['selection']['name'] for bet in response.context['bets']] == ['Home']
+        assert b'25.00' in response.content
+
+        response = self.client.get(reverse(
+            'structure:detail-gameweek',
+            kwargs={'season_slug': self.season.slug, 'number': 2},
+        ))
+        assert response.status_code == 404
+
+    def test_commissioner_views_reject_archived_season(self):
+        archive_season(self.season)
+        self.client.force_login(self.season.commissioner)
+        detail = reverse('structure:detail-season', kwargs={'slug': self.season.slug})
+
+        for url, data in [
+            (reverse('structure:update-season', kwargs={'slug': self.season.slug}), {'name': 'Renamed'}),
+            (reverse('structure:enrol-players', kwargs={'slug': self.season.slug}), {}),
+            (
+                reverse('structure:create-gameweek', kwargs={'season_slug': self.season.slug}),
+                {'deadline': timezone.now()},
+            ),
+        ]:
+            assert self.client.get(url).url == detail
+            assert self.client.post(url, data).url == detail
+
+        assert not Gameweek.objects.exists()
+        assert Season.objects.get(pk=self.season.pk).name == self.season.name
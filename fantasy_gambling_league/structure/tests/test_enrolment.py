@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import TestCase
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import SeasonFactory, SeasonMembershipFactory
+from ..enrolment import ENROLMENT_ATTEMPTS, _insert_memberships, enrol_players, read_identifiers
+from ..models import SeasonMembership
+
+
+class TestReadIdentifiers(TestCase):
+    def test_first_column_deduplicated_in_order(self):
+        csv_file = SimpleUploadedFile(
+            'players.csv',
+            '﻿popeye,extra\r\n\r\n olive@example.com \r\npopeye\r\nbluto\r\n'.encode('utf-8'),
+        )
+
+        assert read_identifiers(csv_file) == ['popeye', 'olive@example.com', 'bluto']
+
+
+class TestEnrolPlayers(TestCase):
+    def setUp(self):
+        self.season = SeasonFactory()
+        self.users = [
+            UserFactory(username='user{}'.format(number), email='user{}@example.com'.format(number))
+            for number in range(5)
+        ]
+
+    def test_enrols_by_username_and_email(self):
+        result = enrol_players(
+            self.season,
+            ['user0', 'user1@example.com', 'user2', 'nobody', 'nobody@example.com'],
+            chunk_size=2,
+        )
+
+        assert result.enrolled == 3
+        assert result.already_enrolled == 0
+        assert result.unknown == ['nobody', 'nobody@example.com']
+        assert set(self.season.players.all()) == set(self.users[:3])
+
+    def test_existing_members_are_skipped(self):
+        SeasonMembershipFactory(season=self.season, user=self.users[0])
+
+        result = enrol_players(self.season, ['user0', 'user0@example.com', 'user1'])
+
+        assert result.enrolled == 1
+        assert result.already_enrolled == 1
+        assert SeasonMembership.objects.filter(season=self.season).count() == 2
+
+    def test_query_count_independent_of_rows(self):
+        identifiers = ['user{}'.format(number) for number in range(5)] + ['user0@example.com']
+
+        # Three username chunks, one email chunk, the membership diff, three
+        # insert chunks, the version bump and the savepoint pair around the
+        # writes.
+        with self.assertNumQueries(11):
+            enrol_players(self.season, identifiers, chunk_size=2)
+
+    def test_retries_repeated_races(self):
+        races = [IntegrityError, IntegrityError]
+
+        def insert(*args):
+            # Concurrent enrolments win the first two inserts.
+            if races:
+                raise races.pop()
+            return _insert_memberships(*args)
+
+        with mock.patch('fantasy_gambling_league.structure.enrolment._insert_memberships', side_effect=insert):
+            result = enrol_players(self.season, ['user0', 'user1', 'user2'])
+
+        assert not races
+        assert result.enrolled == 3
+
+    def test_gives_up_after_bounded_attempts(self):
+        with mock.patch(
+            'fantasy_gambling_league.structure.enrolment._insert_memberships',
+            side_effect=IntegrityError,
+        ) as insert:
+            with self.assertRaises(IntegrityError):
+                enrol_players(self.season, ['user0'])
+
+        assert insert.call_count == ENROLMENT_ATTEMPTS
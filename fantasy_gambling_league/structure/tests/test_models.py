@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import SeasonFactory, SeasonMembershipFactory
+from ..models import SeasonMembership
+
+
+class TestSeasonMembership(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory()
+
+    def test_defaults(self):
+        membership = SeasonMembershipFactory(season=self.season, user=self.user)
+
+        assert membership.role == SeasonMembership.PLAYER
+        assert membership.joined is not None
+
+    def test_has_player(self):
+        assert not self.season.has_player(self.user)
+
+        SeasonMembershipFactory(season=self.season, user=self.user)
+
+        assert self.season.has_player(self.user)
+        assert not self.season.has_player(UserFactory())
+
+    def test_players_and_seasons_relations(self):
+        other_season = SeasonFactory()
+        SeasonMembershipFactory(season=self.season, user=self.user)
+        SeasonMembershipFactory(season=other_season, user=self.user)
+
+        assert list(self.season.players.all()) == [self.user]
+        assert set(self.user.seasons.all()) == {self.season, other_season}
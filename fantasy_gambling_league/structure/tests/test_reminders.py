@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import GameweekFactory, SeasonFactory, SeasonMembershipFactory
+from ..models import ReminderLog, SeasonMembership
+from ..reminders import send_deadline_reminders, upcoming_gameweeks
+
+
+class TestDeadlineReminders(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.season = SeasonFactory()
+        self.gameweek = GameweekFactory(season=self.season, number=3, deadline=self.now + timedelta(hours=2))
+        self.players = [SeasonMembershipFactory(season=self.season).user for _ in range(5)]
+        SeasonMembershipFactory(season=self.season, role=SeasonMembership.SPECTATOR)
+        SeasonMembershipFactory(season=self.season, user=UserFactory(email=''))
+
+    def test_upcoming_gameweeks(self):
+        GameweekFactory(season=self.season, number=4, deadline=self.now + timedelta(days=3))
+        GameweekFactory(season=self.season, number=2, deadline=self.now - timedelta(hours=1))
+        GameweekFactory(
+            season=SeasonFactory(archive='archives/old.npz'), number=1, deadline=self.now + timedelta(hours=1),
+        )
+
+        assert list(upcoming_gameweeks(self.now)) == [self.gameweek]
+
+    def test_sends_to_players_in_batches(self):
+        with mock.patch('fantasy_gambling_league.structure.reminders.get_connection', wraps=get_connection) as connect:
+            results = send_deadline_reminders(self.now, batch_size=2)
+
+        assert results == [(self.gameweek, 5)]
+        assert connect.call_count == 3
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(user.email for user in self.players)
+        assert 'gameweek 3' in mail.outbox[0].subject
+        assert '/season/{}/detail/3/'.format(self.season.slug) in mail.outbox[0].body
+        assert ReminderLog.objects.filter(gameweek=self.gameweek).count() == 5
+
+    def test_renders_once_per_gameweek(self):
+        with mock.patch('fantasy_gambling_league.structure.reminders.render_to_string', return_value='text') as render:
+            send_deadline_reminders(self.now, batch_size=2)
+
+        assert render.call_count == 2
+
+    def test_rerun_does_not_resend(self):
+        ReminderLog.objects.create(gameweek=self.gameweek, user=self.players[0])
+
+        send_deadline_reminders(self.now)
+        send_deadline_reminders(self.now)
+
+        assert len(mail.outbox) == 4
+
+    def test_failed_send_released_for_retry(self):
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError):
+            with self.assertRaises(OSError):
+                send_deadline_reminders(self.now)
+
+        assert not ReminderLog.objects.exists()
+        assert send_deadline_reminders(self.now) == [(self.gameweek, 5)]
+
+    def test_partly_failed_send_keeps_sent_claims(self):
+        send_messages = locmem.EmailBackend.send_messages
+
+        def fail_third(backend, messages):
+            if len(mail.outbox) == 2:
+                raise OSError
+            return send_messages(backend, messages)
+
+        with mock.patch.object(locmem.EmailBackend, 'send_messages', autospec=True, side_effect=fail_third):
+            with self.assertRaises(OSError):
+                send_deadline_reminders(self.now)
+
+        assert ReminderLog.objects.count() == 2
+        assert send_deadline_reminders(self.now) == [(self.gameweek, 3)]
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(user.email for user in self.players)
+
+    def test_batch_claimed_concurrently_skipped(self):
+        ReminderLog.objects.create(gameweek=self.gameweek, user=self.players[0])
+        stale = [(user.pk, user.email) for user in self.players]
+
+        with mock.patch('fantasy_gambling_league.structure.reminders.unreminded_players', side_effect=[stale, []]):
+            assert send_deadline_reminders(self.now) == [(self.gameweek, 0)]
+
+        assert not mail.outbox
+        assert ReminderLog.objects.count() == 1
+
+    def test_command(self):
+        out = StringIO()
+
+        call_command('send_deadline_reminders', '--hours', '3', stdout=out)
+
+        assert 'gameweek 3: sent 5 reminders' in out.getvalue()
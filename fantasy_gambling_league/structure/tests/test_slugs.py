@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from .factories import SeasonFactory
+from ..slugs import VERSION_KEY, SeasonRef, SlugCache
+
+
+class TestSlugCache(TestCase):
+    def setUp(self):
+        self.commissioner = UserFactory()
+        self.season = SeasonFactory(commissioner=self.commissioner)
+        self.slugs = SlugCache(maxsize=2)
+
+    def test_resolves_from_memory(self):
+        assert self.slugs.resolve(self.season.slug) == SeasonRef(self.season.pk, self.commissioner.pk, False)
+
+        with self.assertNumQueries(0):
+            assert self.slugs.resolve(self.season.slug) == SeasonRef(self.season.pk, self.commissioner.pk, False)
+
+    def test_unknown_slug(self):
+        assert self.slugs.resolve('no-such-season') is None
+
+    def test_least_recently_used_evicted(self):
+        others = SeasonFactory.create_batch(2)
+        self.slugs.resolve(self.season.slug)
+        self.slugs.resolve(others[0].slug)
+        self.slugs.resolve(self.season.slug)
+        self.slugs.resolve(others[1].slug)
+
+        with self.assertNumQueries(0):
+            self.slugs.resolve(self.season.slug)
+        with self.assertNumQueries(1):
+            self.slugs.resolve(others[0].slug)
+
+    def test_rename_invalidates(self):
+        old_slug = self.season.slug
+        self.slugs.resolve(old_slug)
+
+        self.season.slug = 'renamed'
+        self.season.save()
+
+        assert self.slugs.resolve(old_slug) is None
+        assert self.slugs.resolve('renamed').pk == self.season.pk
+
+    def test_delete_invalidates(self):
+        self.slugs.resolve(self.season.slug)
+
+        self.season.delete()
+
+        assert self.slugs.resolve(self.season.slug) is None
+
+    def test_other_worker_bump_invalidates(self):
+        self.slugs.resolve(self.season.slug)
+
+        cache.set(VERSION_KEY, 'from-another-worker')
+
+        with self.assertNumQueries(1):
+            self.slugs.resolve(self.season.slug)
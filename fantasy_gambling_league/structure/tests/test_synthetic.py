@@ -0,0 +1,48 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from fantasy_gambling_league.users.models import User
+from ..models import Gameweek, Season, SeasonMembership
+from ..synthetic import generate_league
+
+
+class TestGenerateLeague(TestCase):
+    def memberships(self, prefix):
+        return list(
+            SeasonMembership.objects.filter(season__slug__startswith=prefix)
+            .order_by('season__pk', 'user__pk')
+            .values_list('season__slug', 'user__username')
+        )
+
+    def test_counts(self):
+        created = generate_league(users=200, seasons=5, gameweeks=4, mean_season_size=20, batch_size=64)
+
+        assert created['users'] == User.objects.count() == 200
+        assert created['seasons'] == Season.objects.count() == 5
+        assert created['gameweeks'] == Gameweek.objects.count() == 20
+        assert created['memberships'] == SeasonMembership.objects.count()
+
+    def test_deterministic_by_seed(self):
+        generate_league(users=200, seasons=5, gameweeks=1, mean_season_size=20, seed=3, prefix='one')
+        generate_league(users=200, seasons=5, gameweeks=1, mean_season_size=20, seed=3, prefix='two')
+
+        one = [(slug[4:], username[4:]) for slug, username in self.memberships('one')]
+        two = [(slug[4:], username[4:]) for slug, username in self.memberships('two')]
+        assert one == two
+
+    def test_memberships_skewed(self):
+        generate_league(users=1000, seasons=50, gameweeks=1, mean_season_size=40)
+
+        seasons_per_user = sorted(
+            User.objects.annotate(seasons_count=Count('seasonmembership')).values_list('seasons_count', flat=True),
+            reverse=True,
+        )
+        assert seasons_per_user[0] > 5 * max(seasons_per_user[500], 1)
+
+    def test_command_rejects_used_prefix(self):
+        call_command('generate_league_data', users=10, seasons=1, gameweeks=1, season_size=5)
+
+        with self.assertRaises(CommandError):
+            call_command('generate_league_data', users=10, seasons=1, gameweeks=1, season_size=5)
@@ -1,12 +1,17 @@
+import gzip
+import json
 from datetime import datetime
 from pytz import utc
 
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils.text import slugify
 
 from fantasy_gambling_league.users.tests.factories import UserFactory
-from .factories import SeasonFactory, GameweekFactory
+from fantasy_gambling_league.betting.projections import project_season
+from fantasy_gambling_league.betting.tests.factories import BetFactory, MarketFactory, SelectionFactory
+from .factories import SeasonFactory, SeasonMembershipFactory, GameweekFactory
 from ..models import Season, Gameweek
 
 
@@ -205,6 +210,16 @@ class TestSeasonListView(TestCase):
         for season in self.seasons:
             assert season in response.context['object_list']
 
+    def test_search_seasons_by_name(self):
+        match = SeasonFactory(name='Premier League Punters')
+        SeasonFactory(name='Championship Chancers')
+
+        response = self.client.get(self.url, data={'q': 'punter'})
+
+        assert response.status_code == 200
+        assert list(response.context['object_list']) == [match]
+        assert response.context['query'] == 'punter'
+
 
 class TestSeasonDetailView(TestCase):
     def setUp(self):
@@ -230,6 +245,14 @@ class TestSeasonDetailView(TestCase):
 
         assert response.status_code == 200
 
+    def test_cached_projection_shown(self):
+        player = SeasonMembershipFactory(season=self.season).user
+        project_season(self.season, simulations=100, workers=1)
+
+        response = self.client.get(self.get_url())
+
+        assert response.context['projections'] == [(player, 1.0)]
+
 
 class TestCreateGameweekView(TestCase):
     test_data = {
@@ -272,6 +295,8 @@ class TestCreateGameweekView(TestCase):
         assert gameweek.number == 1
         assert gameweek.spiel == self.test_data['spiel']
         assert gameweek.deadline == self.test_data['deadline'].replace(tzinfo=utc)
+        self.season.refresh_from_db()
+        assert self.season.version == 1
 
     def test_number_incremented(self):
         self.client.force_login(self.user)
@@ -359,6 +384,8 @@ class TestUpdateGameweekView(TestCase):
         assert gameweek.number == 1
         assert gameweek.spiel == self.test_data['spiel']
         assert gameweek.deadline == self.test_data['deadline'].replace(tzinfo=utc)
+        self.season.refresh_from_db()
+        assert self.season.version == 1
 
     def test_non_commissioner_redirected_on_get(self):
         user = UserFactory()
@@ -440,6 +467,8 @@ class TestDeleteGameweekView(TestCase):
 
         assert response.status_code == 302
         assert Gameweek.objects.count() == 0
+        self.season.refresh_from_db()
+        assert self.season.version == 1
 
     def test_non_commissioner_redirected_on_get(self):
         user = UserFactory()
@@ -502,4 +531,136 @@ class TestGameweekDetailView(TestCase):
         response = self.client.get(self.get_url())
 
         assert response.status_code == 200
+        assert response.context['markets'] == []
+        assert response.context['bets'] == []
+
+
+class TestSeasonEnrolView(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory(commissioner=self.user)
+
+    def get_url(self):
+        return reverse(
+            'structure:enrol-players',
+            kwargs={'slug': self.season.slug},
+        )
+
+    def get_upload(self, content):
+        return SimpleUploadedFile('players.csv', content.encode('utf-8'))
+
+    def test_anonymous_user_redirected_on_post(self):
+        response = self.client.post(self.get_url(), data={
+            'players': self.get_upload(self.user.username),
+        })
+
+        assert response.status_code == 302
+        assert 'login' in response.url
+        assert self.season.players.count() == 0
+
+    def test_successful_enrol(self):
+        players = UserFactory.create_batch(3)
+        upload = self.get_upload('\n'.join(
+            [player.username for player in players] + ['nobody']
+        ))
+
+        self.client.force_login(self.user)
+        response = self.client.post(self.get_url(), data={'players': upload})
+
+        assert response.status_code == 302
+        assert set(self.season.players.all()) == set(players)
+
+    def test_empty_file_rejected(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.get_url(), data={
+            'players': self.get_upload('\n\n'),
+        })
 
+        assert response.status_code == 200
+        assert 'File does not list any players' in response.context['form'].errors['players']
+
+
+class TestSeasonExportView(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory(commissioner=self.user)
+        self.gameweek = GameweekFactory(season=self.season, number=1)
+        self.player = UserFactory()
+        SeasonMembershipFactory(season=self.season, user=self.player)
+        market = MarketFactory(gameweek=self.gameweek)
+        BetFactory.create_batch(3, user=self.player, selection=SelectionFactory(market=market))
+
+    def get_url(self, table):
+        return reverse(
+            'structure:export-season',
+            kwargs={'slug': self.season.slug, 'table': table},
+        )
+
+    def test_anonymous_user_redirected(self):
+        response = self.client.get(self.get_url('bets'))
+
+        assert response.status_code == 302
+        assert 'login' in response.url
+
+    def test_csv_streamed_gzipped(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.get_url('bets'), HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        assert response.streaming
+        assert response['Content-Encoding'] == 'gzip'
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8').splitlines()
+        assert lines[0] == 'gameweek,username,market,selection,stake,price,placed,returns'
+        assert len(lines) == 4
+        assert lines[1].startswith('1,{},'.format(self.player.username))
+
+    def test_jsonl_uncompressed_without_accept_encoding(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.get_url('players'), {'format': 'jsonl'})
+
+        assert not response.has_header('Content-Encoding')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        assert [row['username'] for row in rows] == [self.player.username]
+
+    def test_unknown_table_not_found(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.get_url('balances'))
+
+        assert response.status_code == 404
+
+
+@override_settings(STRUCTURE_TEMPLATE_ENGINE='jinja2')
+class TestJinja2StructurePages(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.season = SeasonFactory(commissioner=self.user)
+        self.gameweeks = [GameweekFactory(season=self.season, number=number) for number in (1, 2)]
+
+    def test_season_list(self):
+        response = self.client.get(reverse('structure:list-seasons'))
+
+        # Only the Django engine sends template_rendered.
+        assert response.templates == []
+        self.assertContains(response, reverse('structure:detail-season', kwargs={'slug': self.season.slug}))
+
+    def test_season_detail(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('structure:detail-season', kwargs={'slug': self.season.slug}))
+
+        for gameweek in self.gameweeks:
+            self.assertContains(response, reverse('structure:detail-gameweek', kwargs={
+                'season_slug': self.season.slug,
+                'number': gameweek.number,
+            }))
+        self.assertContains(response, reverse('structure:enrol-players', kwargs={'slug': self.season.slug}))
+
+    def test_gameweek_detail(self):
+        selection = SelectionFactory(market=MarketFactory(gameweek=self.gameweeks[0], name='Winner'), name='Home')
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('structure:detail-gameweek', kwargs={
+            'season_slug': self.season.slug,
+            'number': 1,
+        }))
+
+        self.assertContains(response, 'Winner')
+        self.assertContains(response, '<td>{}</td>'.format(selection.name))
+        self.assertContains(response, '<td>2.00</td>')
@@ -15,6 +15,16 @@ urlpatterns = [
         views.SeasonDeleteView.as_view(),
         name='delete-season'
     ),
+    path(
+        'season/enrol/<slug:slug>/',
+        views.SeasonEnrolView.as_view(),
+        name='enrol-players'
+    ),
+    path(
+        'season/export/<slug:slug>/<str:table>/',
+        views.SeasonExportView.as_view(),
+        name='export-season'
+    ),
     path('seasons/', views.SeasonListView.as_view(), name='list-seasons'),
     path('season/detail/<slug:slug>/',
         views.SeasonDetailView.as_view(),
@@ -1,36 +1,77 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.http.response import HttpResponseRedirect
+from django.db import transaction
+from django.http import Http404
+from django.http.response import HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
 from django.utils.text import slugify
-from django.views.generic.detail import DetailView
+from django.views.generic.base import View
+from django.views.generic.detail import DetailView, SingleObjectMixin
 from django.views.generic.edit import (
     CreateView,
     DeleteView,
+    FormView,
     UpdateView,
 )
 from django.views.generic.list import ListView
 
-from .forms import SeasonForm
+from fantasy_gambling_league.betting.prices import bets_with_returns, gameweek_price_table
+from fantasy_gambling_league.betting.projections import cached_projection
+from .archive import SeasonArchive
+from .enrolment import enrol_players
+from .export import ENCODERS, EXPORTS, FORMATS, export_rows, gzip_stream
+from .forms import SeasonEnrolmentForm, SeasonForm
 from .models import Season, Gameweek
+from .search import season_search
+from .slugs import resolve_season
+
+
+class StructureTemplateEngineMixin:
+    """Render with the engine named by ``STRUCTURE_TEMPLATE_ENGINE``."""
+
+    @property
+    def template_engine(self):
+        return settings.STRUCTURE_TEMPLATE_ENGINE
+
+
+def get_season_ref_or_404(slug):
+    season = resolve_season(slug)
+
+    if season is None:
+        raise Http404('No season found matching the query')
+    return season
 
 
 class CommissionerRequiredMixin:
-    def get_commissioner(self):
-        raise NotImplementedError()
+    season_slug_kwarg = None
+    # Archived seasons are read-only, so most commissioner views turn them away.
+    allow_archived = False
 
     def dispatch(self, request, *args, **kwargs):
-        commissioner = self.get_commissioner()
+        season_slug = self.kwargs[self.season_slug_kwarg]
+        season = get_season_ref_or_404(season_slug)
 
-        if request.user == commissioner:
-            return super().dispatch(request, *args, **kwargs)
+        if not (request.user.is_authenticated and request.user.pk == season.commissioner_id):
+            return self.handle_no_permission()
+
+        if season.archived and not self.allow_archived:
+            messages.error(request, 'Cannot change an archived season')
 
-        return self.handle_no_permission()
+            return HttpResponseRedirect(
+                redirect_to=reverse(
+                    'structure:detail-season',
+                    kwargs={'slug': season_slug}
+                ),
+            )
+
+        return super().dispatch(request, *args, **kwargs)
 
 
 class SeasonCommissionerRequiredMixin(CommissionerRequiredMixin):
-    def get_commissioner(self):
-        return self.get_object().commissioner
+    season_slug_kwarg = 'slug'
 
 
 class SeasonCreateView(LoginRequiredMixin, CreateView):
@@ -64,21 +105,128 @@ class SeasonDeleteView(LoginRequiredMixin, SeasonCommissionerRequiredMixin, Dele
     login_url = '/accounts/login'
     success_url = '/'
     model = Season
+    allow_archived = True
+
 
-class SeasonListView(ListView):
+class SeasonEnrolView(LoginRequiredMixin, SeasonCommissionerRequiredMixin, SingleObjectMixin, FormView):
+    login_url = '/accounts/login'
     model = Season
+    form_class = SeasonEnrolmentForm
+    template_name = 'structure/season_enrol.html'
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return super(SeasonEnrolView, self).get(request, *args, **kwargs)
 
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return super(SeasonEnrolView, self).post(request, *args, **kwargs)
+
+    def get_success_url(self):
+        return reverse('structure:detail-season', kwargs={'slug': self.object.slug})
+
+    def form_valid(self, form):
+        result = enrol_players(self.object, form.cleaned_data['players'])
 
-class SeasonDetailView(DetailView):
+        messages.success(
+            self.request,
+            'Enrolled {} players, {} were already enrolled'.format(
+                result.enrolled,
+                result.already_enrolled,
+            ),
+        )
+        if result.unknown:
+            messages.warning(
+                self.request,
+                '{} unknown players: {}'.format(
+                    len(result.unknown),
+                    ', '.join(result.unknown[:20]),
+                ),
+            )
+        return super(SeasonEnrolView, self).form_valid(form)
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class SeasonExportView(LoginRequiredMixin, SeasonCommissionerRequiredMixin, SingleObjectMixin, View):
+    """
+    Stream one of a season's tables as CSV or JSON lines, gzipped on the
+    fly when the client accepts it.
+
+    The body is generated after the view returns, so keep it out of
+    ``ATOMIC_REQUESTS``.
+    """
+    login_url = '/accounts/login'
     model = Season
 
+    def get(self, request, *args, **kwargs):
+        season = self.get_object()
+        table = kwargs['table']
+        export_format = request.GET.get('format', 'csv')
+
+        if table not in EXPORTS or export_format not in FORMATS or season.archive:
+            raise Http404('No such export')
+
+        body = ENCODERS[export_format](export_rows(season, table))
+        gzipped = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if gzipped:
+            body = gzip_stream(body)
+
+        response = StreamingHttpResponse(body, content_type=FORMATS[export_format])
+        response['Content-Disposition'] = 'attachment; filename="{}-{}.{}"'.format(season.slug, table, export_format)
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        return response
+
+
+class SeasonListView(StructureTemplateEngineMixin, ListView):
+    model = Season
+
+    def get_queryset(self):
+        queryset = super(SeasonListView, self).get_queryset()
+        query = self.request.GET.get('q', '')
+
+        if query.strip():
+            return season_search.search(query, queryset)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context_data = super(SeasonListView, self).get_context_data(**kwargs)
+        context_data.update({'query': self.request.GET.get('q', '')})
+
+        return context_data
 
-class GameweekCommissionerRequiredMixin(CommissionerRequiredMixin):
-    def get_commissioner(self):
-        season_slug = self.kwargs['season_slug']
-        season = get_object_or_404(Season, slug=season_slug)
 
-        return season.commissioner
+class SeasonDetailView(StructureTemplateEngineMixin, DetailView):
+    model = Season
+
+    def get_context_data(self, **kwargs):
+        context_data = super(SeasonDetailView, self).get_context_data(**kwargs)
+
+        if self.object.archive:
+            context_data.update({'gameweeks': SeasonArchive(self.object).gameweeks()})
+            return context_data
+
+        context_data.update({'gameweeks': self.object.gameweek_set.all()})
+        projection = cached_projection(self.object)
+
+        if projection:
+            players = self.object.players.in_bulk(list(projection))
+            context_data.update({'projections': sorted(
+                (
+                    (players[user_id], probability)
+                    for user_id, probability in projection.items()
+                    if user_id in players
+                ),
+                key=lambda item: -item[1],
+            )})
+
+        return context_data
+
+
+class GameweekCommissionerRequiredMixin(CommissionerRequiredMixin):
+    season_slug_kwarg = 'season_slug'
 
 
 class GameweekCreateView(LoginRequiredMixin, GameweekCommissionerRequiredMixin, CreateView):
@@ -96,12 +244,13 @@ class GameweekCreateView(LoginRequiredMixin, GameweekCommissionerRequiredMixin,
         return context_data
 
     def form_valid(self, form):
-        season_slug = self.kwargs['season_slug']
-        season = get_object_or_404(Season, slug=season_slug)
+        season = get_season_ref_or_404(self.kwargs['season_slug'])
 
-        form.instance.season = season
-        form.instance.number = season.gameweek_set.count() + 1
-        return super(GameweekCreateView, self).form_valid(form)
+        form.instance.season_id = season.pk
+        form.instance.number = Gameweek.objects.filter(season_id=season.pk).count() + 1
+        response = super(GameweekCreateView, self).form_valid(form)
+        Season.bump_version(pk=season.pk)
+        return response
 
 
 class GameweekUpdateView(LoginRequiredMixin, GameweekCommissionerRequiredMixin, UpdateView):
@@ -110,15 +259,19 @@ class GameweekUpdateView(LoginRequiredMixin, GameweekCommissionerRequiredMixin,
     model = Gameweek
     fields = ['deadline', 'spiel', ]
 
+    def form_valid(self, form):
+        response = super(GameweekUpdateView, self).form_valid(form)
+        Season.bump_version(pk=self.object.season_id)
+        return response
+
     def get_object(self, queryset=None):
-        season_slug = self.kwargs['season_slug']
-        season = get_object_or_404(Season, slug=season_slug)
+        season = get_season_ref_or_404(self.kwargs['season_slug'])
 
         if not queryset:
             queryset = self.get_queryset()
         
-        return queryset.get(
-            season=season,
+        return queryset.select_related('season').get(
+            season_id=season.pk,
             number=self.kwargs['number'],
         )
 
@@ -142,15 +295,19 @@ class GameweekDeleteView(LoginRequiredMixin, GameweekCommissionerRequiredMixin,
     success_url = '/'
     model = Gameweek
 
+    def delete(self, request, *args, **kwargs):
+        response = super(GameweekDeleteView, self).delete(request, *args, **kwargs)
+        Season.bump_version(pk=self.object.season_id)
+        return response
+
     def get_object(self, queryset=None):
-        season_slug = self.kwargs['season_slug']
-        season = get_object_or_404(Season, slug=season_slug)
+        season = get_season_ref_or_404(self.kwargs['season_slug'])
 
         if not queryset:
             queryset = self.get_queryset()
         
-        return queryset.get(
-            season=season,
+        return queryset.select_related('season').get(
+            season_id=season.pk,
             number=self.kwargs['number'],
         )
 
@@ -168,17 +325,44 @@ class GameweekDeleteView(LoginRequiredMixin, GameweekCommissionerRequiredMixin,
             ),
         )
 
-class GameweekDetailView(DetailView):
+class GameweekDetailView(StructureTemplateEngineMixin, DetailView):
     model = Gameweek
+    archive = None
+
+    def get_context_data(self, **kwargs):
+        context_data = super(GameweekDetailView, self).get_context_data(**kwargs)
+
+        if self.object.season.archive:
+            if self.request.user.is_authenticated:
+                context_data.update({'bets': self.archive.bets(self.object.number, self.request.user.pk)})
+            return context_data
+
+        context_data.update({'markets': gameweek_price_table(self.object)})
+
+        if self.request.user.is_authenticated:
+            context_data.update({'bets': bets_with_returns(self.request.user, self.object)})
+
+        return context_data
 
     def get_object(self, queryset=None):
-        season_slug = self.kwargs['season_slug']
-        season = get_object_or_404(Season, slug=season_slug)
+        season = get_season_ref_or_404(self.kwargs['season_slug'])
 
         if not queryset:
             queryset = self.get_queryset()
-        
-        return queryset.get(
-            season=season,
+
+        gameweek = queryset.select_related('season').filter(
+            season_id=season.pk,
             number=self.kwargs['number'],
-        )
+        ).first()
+        if gameweek is not None:
+            return gameweek
+
+        # Archived seasons have no live gameweeks left.
+        season = get_object_or_404(Season, pk=season.pk)
+        if season.archive:
+            # Kept for get_context_data, to read the archive once per request.
+            self.archive = SeasonArchive(season)
+            gameweek = self.archive.gameweek(self.kwargs['number'])
+        if gameweek is None:
+            raise Http404('No such gameweek')
+        return gameweek
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS users_user_username_trgm "
+        "ON users_user USING gin (username gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS users_user_name_trgm "
+        "ON users_user USING gin (name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS users_user_username_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS users_user_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0001_initial")]
+
+    operations = [migrations.RunPython(create_trigram_indexes, drop_trigram_indexes)]
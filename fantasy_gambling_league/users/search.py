@@ -0,0 +1,7 @@
+from django.contrib.auth import get_user_model
+
+from fantasy_gambling_league.core.search import ModelSearch
+
+User = get_user_model()
+
+user_search = ModelSearch(User, ["username", "name"])
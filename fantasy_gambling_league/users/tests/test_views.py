@@ -2,7 +2,12 @@ import pytest
 from django.conf import settings
 from django.test import RequestFactory
 
-from fantasy_gambling_league.users.views import UserRedirectView, UserUpdateView
+from fantasy_gambling_league.users.tests.factories import UserFactory
+from fantasy_gambling_league.users.views import (
+    UserListView,
+    UserRedirectView,
+    UserUpdateView,
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -51,3 +56,27 @@ class TestUserRedirectView:
         view.request = request
 
         assert view.get_redirect_url() == f"/users/{user.username}/"
+
+
+class TestUserListView:
+
+    def test_search(
+        self, user: settings.AUTH_USER_MODEL, request_factory: RequestFactory
+    ):
+        match = UserFactory(username="popeye_sailor", name="Popeye")
+        UserFactory(username="bluto", name="Brutus")
+
+        view = UserListView()
+        view.request = request_factory.get("/fake-url/", {"q": "popeye"})
+        view.request.user = user
+
+        assert list(view.get_queryset()) == [match]
+
+    def test_blank_search_lists_everyone(
+        self, user: settings.AUTH_USER_MODEL, request_factory: RequestFactory
+    ):
+        view = UserListView()
+        view.request = request_factory.get("/fake-url/", {"q": " "})
+        view.request.user = user
+
+        assert list(view.get_queryset()) == [user]
@@ -3,6 +3,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
 from django.views.generic import DetailView, ListView, RedirectView, UpdateView
 
+from fantasy_gambling_league.users.search import user_search
+
 User = get_user_model()
 
 
@@ -22,6 +24,20 @@ class UserListView(LoginRequiredMixin, ListView):
     slug_field = "username"
     slug_url_kwarg = "username"
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        query = self.request.GET.get("q", "")
+
+        if query.strip():
+            return user_search.search(query, queryset)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context_data = super().get_context_data(**kwargs)
+        context_data["query"] = self.request.GET.get("q", "")
+
+        return context_data
+
 
 user_list_view = UserListView.as_view()
 